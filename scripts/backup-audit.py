@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Degen Dudes Backup Audit
+Recomputes ch_strokes, ph_strokes, net_score and ph_score for every score
+in every backup from the holes, tee assignments, group playing handicaps
+and the net_max_over_par setting, and reports rows whose stored values
+disagree (see scripts/backup/audit.py). Exits 1 if any do, or if no score
+could be checked at all, so it can run right after a backup.
+
+Every backup state is audited: each snapshot and the state after each of
+its deltas. Older snapshots may lack the reference tables; those come from
+the newest earlier snapshot that has them, or from --reference, and holes
+and tee assignments still missing from the built-in trip (with a warning).
+Scores that still can't be checked (no hole or tee assignment) are
+reported.
+
+Needs NumPy (pip install -r scripts/requirements.txt).
+
+  backup-audit.py                          every backup in the backup dir
+  backup-audit.py --latest                 the current state, deltas applied
+  backup-audit.py backups/scores-2026-02-28-1418.json --json
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+from backup import load_snapshot
+from backup.config import BACKUP_DIR
+from backup.delta import backup_states, load_backup, materialize
+
+BUILTIN_TABLES = ("holes", "player_tee_assignments")   # the audit reads no tees
+
+try:
+    from backup.audit import audit_history
+    from scoring.reference import fill_builtin
+except ImportError as e:   # NumPy missing
+    audit_history, AUDIT_IMPORT_ERROR = None, e
+
+
+def label(row: dict, names: dict) -> str:
+    return (f"{names.get(row.get('player_id'), row.get('player_id'))} "
+            f"{names.get(row.get('course_id'), row.get('course_id'))} hole {row.get('hole_number')}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Check derived score columns in Degen Dudes backups.")
+    parser.add_argument("snapshots", nargs="*", type=Path, help="backup files (default: all, oldest first)")
+    parser.add_argument("--backup-dir", type=Path, default=BACKUP_DIR)
+    parser.add_argument("--latest", action="store_true", help="audit the latest state including deltas")
+    parser.add_argument("--reference", type=Path, help="snapshot to take missing reference tables from")
+    parser.add_argument("--json", action="store_true", help="one JSON object per backup")
+    args = parser.parse_args(argv)
+    if audit_history is None:
+        print(f"ERROR: backup-audit.py needs NumPy ({AUDIT_IMPORT_ERROR})", file=sys.stderr)
+        return 2
+
+    started = time.perf_counter()
+    try:
+        if args.latest:
+            states = [("latest", materialize(None, args.backup_dir))]
+        elif args.snapshots:
+            states = ((p.name, load_backup(p)) for p in args.snapshots)
+        else:
+            states = ((p.name, bundle) for p, bundle in backup_states(args.backup_dir))
+        reference = load_snapshot(args.reference) if args.reference else {}
+        labels, found, warned = [], set(), set()
+
+        def bundles():
+            for name, bundle in states:
+                labels.append(name)
+                # Only tables no backup so far had, nor --reference
+                found.update(table for table in BUILTIN_TABLES if bundle.get(table))
+                missing = [table for table in BUILTIN_TABLES if table not in found and not reference.get(table)]
+                bundle = dict(bundle)   # backup_states shares it with the next state
+                for table in fill_builtin(bundle, missing):
+                    if table not in warned:
+                        print(f"WARNING: no {table} in the backup; using the built-in trip's", file=sys.stderr)
+                        warned.add(table)
+                yield bundle
+
+        names, seen, checked, bad, unverifiable = {}, set(), 0, 0, 0
+        for bundle, result in audit_history(bundles(), reference):
+            name = labels[-1]
+            names.update({p["id"]: p["name"] for p in bundle.get("players", [])})
+            names.update({c["id"]: f"day {c['day_number']}" for c in bundle.get("courses", [])})
+            checked += result["checked"]
+            bad += len(result["mismatches"])
+            unverifiable += len(result["unverifiable"])
+            if args.json:
+                print(json.dumps({
+                    "backup": name, "checked": result["checked"],
+                    "unverifiable": len(result["unverifiable"]), "ph_unchecked": result["ph_unchecked"],
+                    "mismatches": [{"row": row, "columns": cols} for row, cols in result["mismatches"]],
+                }, default=str))
+                continue
+            print(f"── {name}: {result['checked']} checked, {len(result['mismatches'])} wrong, "
+                  f"{len(result['unverifiable'])} unverifiable, {result['ph_unchecked']} without a group")
+            # A bad row repeats in every later snapshot; list it once
+            for row, columns in result["mismatches"]:
+                if (row["id"], row.get("updated_at")) in seen:
+                    continue
+                seen.add((row["id"], row.get("updated_at")))
+                detail = ", ".join(f"{col} {stored!r}, expected {expected}"
+                                   for col, (stored, expected) in columns.items())
+                print(f"   ! {label(row, names)} (gross {row.get('gross_score')}): {detail}")
+    except (OSError, ValueError) as e:
+        print(f"ERROR reading backup: {e}", file=sys.stderr)
+        return 1
+    if not args.json:
+        print(f"Audited {checked:,} scores in {len(labels)} backups in "
+              f"{time.perf_counter() - started:.2f}s: {bad:,} mismatches")
+    if not labels:
+        print(f"ERROR: no backups in {args.backup_dir}", file=sys.stderr)
+        return 1
+    if not checked:
+        print(f"ERROR: no score could be checked in {len(labels)} backups; they lack holes or tee "
+              f"assignments (pass --reference)", file=sys.stderr)
+        return 1
+    if unverifiable:
+        print(f"WARNING: {unverifiable:,} scores could not be checked (no hole or tee assignment)",
+              file=sys.stderr)
+    return 1 if bad else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
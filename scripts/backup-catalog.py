@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Degen Dudes Backup Catalog
+Loads every backup in the backup dir into an indexed SQLite catalog of row
+versions, for point-in-time and history queries. Ingest is incremental:
+only backups not already in the catalog are read.
+
+  backup-catalog.py ingest
+  backup-catalog.py score Eric 2 5 --at 2026-02-28T14:18
+  backup-catalog.py history Eric 2 5
+"""
+
+import argparse
+import json
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from backup.catalog import Catalog
+from backup.config import BACKUP_DIR
+
+# ── Config ────────────────────────────────────────────────────────────────────
+CATALOG_FILE = BACKUP_DIR / "catalog.sqlite"
+TRIP_TZ      = timezone(timedelta(hours=-7))
+
+
+def parse_time(text: str) -> datetime:
+    """ISO timestamp; trip-local (MST) when no offset is given."""
+    at = datetime.fromisoformat(text)
+    return at if at.tzinfo else at.replace(tzinfo=TRIP_TZ)
+
+
+def local(ts) -> str:
+    if ts is None:
+        return "now"
+    return datetime.fromisoformat(ts).astimezone(TRIP_TZ).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Point-in-time catalog of Degen Dudes backups.")
+    parser.add_argument("--backup-dir", type=Path, default=BACKUP_DIR)
+    parser.add_argument("--catalog", type=Path, default=None,
+                        help="SQLite file (default: catalog.sqlite in the backup dir)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("ingest", help="add backups not yet in the catalog")
+    score = sub.add_parser("score", help="one hole's score at a point in time")
+    history = sub.add_parser("history", help="every version of one hole's score")
+    for p in (score, history):
+        p.add_argument("player")
+        p.add_argument("day", type=int)
+        p.add_argument("hole", type=int)
+    score.add_argument("--at", type=parse_time, default=None, help="default: latest backup")
+    args = parser.parse_args(argv)
+
+    catalog_path = args.catalog or args.backup_dir / CATALOG_FILE.name
+    with Catalog(catalog_path) as catalog:
+        if args.command == "ingest":
+            started = time.perf_counter()
+            ingested, skipped, changed = catalog.ingest_dir(args.backup_dir)
+            elapsed = time.perf_counter() - started
+            print(f"Ingested {ingested} backups ({changed} row versions changed) in {elapsed:.2f}s")
+            if skipped:
+                print(f"WARNING: skipped {skipped} backups older than the catalog's latest", file=sys.stderr)
+            return 0
+
+        try:
+            if args.command == "score":
+                at = args.at or catalog.latest()
+                row = catalog.score_at(args.player, args.day, args.hole, at)
+                if row is None:
+                    print(f"No score for {args.player} day {args.day} hole {args.hole} at {at}")
+                    return 1
+                print(json.dumps(row, indent=2))
+            else:
+                versions = catalog.score_history(args.player, args.day, args.hole)
+                for valid_from, valid_to, row in versions:
+                    print(f"{local(valid_from)} → {local(valid_to)}: gross {row['gross_score']}, "
+                          f"net {row['net_score']}, entered by {row.get('entered_by')}")
+        except KeyError as e:
+            print(f"ERROR: {e.args[0]}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Degen Dudes Backup Diff
+Shows which rows changed between backups: rows added, rows removed, and
+the columns that changed on each changed row. With more than two files, or
+--chain, every consecutive pair is diffed in one pass. A delta file stands
+for the state it leaves its chain in, and --chain walks every snapshot and
+delta in the backup dir.
+
+  backup-diff.py backups/scores-2026-02-22-1418.json backups/scores-2026-02-22-1718.json
+  backup-diff.py --chain --table scores
+  backup-diff.py --chain --json > changes.jsonl
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+from backup.config import BACKUP_DIR
+from backup.delta import backup_states, load_backup, materialize
+from backup.diff import diff_chain, diff_states
+
+
+def row_names(bundle: dict) -> dict:
+    """Display names for the ids scores rows point at (players, courses)."""
+    names = {p["id"]: p["name"] for p in bundle.get("players", [])}
+    names.update({c["id"]: f"day {c['day_number']}" for c in bundle.get("courses", [])})
+    return names
+
+
+def label(table: str, row: dict, names: dict) -> str:
+    if table == "scores":
+        return (f"{names.get(row.get('player_id'), row.get('player_id'))} "
+                f"{names.get(row.get('course_id'), row.get('course_id'))} hole {row.get('hole_number')}")
+    return str(row.get("name") or row.get("key") or row.get("id"))
+
+
+def print_diff(older: Path, newer: Path, diff: dict, names: dict) -> None:
+    print(f"── {older.name} → {newer.name}")
+    if not diff:
+        print("   no changes")
+    for table, changes in diff.items():
+        for row in changes["added"]:
+            print(f"   + {table}: {label(table, row, names)}")
+        for row in changes["removed"]:
+            print(f"   - {table}: {label(table, row, names)}")
+        for row, columns in changes["changed"]:
+            detail = ", ".join(f"{col} {old!r} → {new!r}" for col, (old, new) in sorted(columns.items()))
+            print(f"   ~ {table}: {label(table, row, names)}: {detail}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Row-level diff of Degen Dudes backups.")
+    parser.add_argument("snapshots", nargs="*", type=Path, help="two or more backup files, oldest first")
+    parser.add_argument("--chain", action="store_true", help="diff every backup state in the backup dir")
+    parser.add_argument("--backup-dir", type=Path, default=BACKUP_DIR)
+    parser.add_argument("--table", action="append", dest="tables", help="only this table (repeatable)")
+    parser.add_argument("--json", action="store_true", help="one JSON object per snapshot pair")
+    args = parser.parse_args(argv)
+
+    if not args.chain and len(args.snapshots) < 2:
+        parser.error("need two or more snapshots (or --chain)")
+
+    started = time.perf_counter()
+    pairs = 0
+    try:
+        if args.chain:
+            names = {} if args.json else row_names(materialize(None, args.backup_dir))
+            chain = diff_states(backup_states(args.backup_dir), args.tables)
+        else:
+            names = {} if args.json else row_names(load_backup(args.snapshots[-1]))
+            chain = diff_chain(args.snapshots, args.tables)
+        for older, newer, diff in chain:
+            pairs += 1
+            if args.json:
+                print(json.dumps({"from": older.name, "to": newer.name, "tables": diff}, default=str))
+                continue
+            print_diff(older, newer, diff, names)
+    except (OSError, ValueError) as e:
+        print(f"ERROR reading backup: {e}", file=sys.stderr)
+        return 1
+    if not args.json:
+        print(f"Diffed {pairs} backup pairs in {time.perf_counter() - started:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
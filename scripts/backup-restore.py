@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Degen Dudes Restore Script
+Replays a backup into Supabase: tables parents-first, batched upserts with
+Prefer: resolution=merge-duplicates, only rows that are missing or differ.
+Never deletes rows.
+
+  backup-restore.py backups/scores-2026-02-28-1418.json --dry-run
+  backup-restore.py --at 2026-02-28T14:18 --yes
+"""
+
+import argparse
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from backup import RestClient, load_snapshot
+from backup.config import BACKUP_DIR, SUPABASE_URL, read_service_key
+from backup.delta import materialize
+from backup.restore import DEFAULT_BATCH_SIZE, restore_bundle
+
+# ── Config ────────────────────────────────────────────────────────────────────
+WORKERS = 4   # batches in flight per table
+TRIP_TZ = timezone(timedelta(hours=-7))
+
+
+def parse_time(text: str) -> datetime:
+    """ISO timestamp; trip-local (MST) when no offset is given."""
+    at = datetime.fromisoformat(text)
+    return at if at.tzinfo else at.replace(tzinfo=TRIP_TZ)
+
+
+def report(table: str, diff: dict) -> None:
+    line = (f"  {table:15s} insert {len(diff['insert']):4d}  update {len(diff['update']):4d}  "
+            f"unchanged {diff['unchanged']:4d}")
+    if diff["extra"]:
+        line += f"  not in backup {len(diff['extra'])} (left alone)"
+    if "batches" in diff:
+        line += f"  [{diff['batches']} batches]"
+    print(line)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Restore a Degen Dudes backup into Supabase.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("snapshot", nargs="?", type=Path, help="snapshot file (.json or .ddz)")
+    source.add_argument("--at", type=parse_time,
+                        help="materialize the backup dir (snapshot + deltas) as of this time")
+    parser.add_argument("--backup-dir", type=Path, default=BACKUP_DIR)
+    parser.add_argument("--dry-run", action="store_true", help="show the diff, write nothing")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--workers", type=int, default=WORKERS, help="parallel batches per table")
+    parser.add_argument("--all", action="store_true",
+                        help="skip the diff and upsert every row")
+    parser.add_argument("--yes", action="store_true", help="do not ask for confirmation")
+    args = parser.parse_args(argv)
+
+    try:
+        bundle = load_snapshot(args.snapshot) if args.snapshot else materialize(args.at, args.backup_dir)
+    except (OSError, ValueError) as e:
+        print(f"ERROR loading backup: {e}", file=sys.stderr)
+        return 1
+    print(f"Backup from {bundle.get('backup_timestamp')}")
+
+    if not args.dry_run and not args.yes:
+        answer = input(f"Write this backup into {SUPABASE_URL}? [y/N] ")
+        if answer.strip().lower() != "y":
+            print("Aborted")
+            return 1
+
+    key = read_service_key()
+    started = time.perf_counter()
+    try:
+        with RestClient(SUPABASE_URL, key, pool_size=args.workers) as client:
+            results = restore_bundle(
+                client, bundle, dry_run=args.dry_run, batch_size=args.batch_size,
+                workers=args.workers, only_changed=not args.all, report=report,
+            )
+    except Exception as e:
+        print(f"ERROR restoring: {e}", file=sys.stderr)
+        return 1
+
+    sent = sum(len(d["insert"]) + len(d["update"]) for d in results.values())
+    verb = "Would upsert" if args.dry_run else "Upserted"
+    print(f"{verb} {sent} rows across {len(results)} tables in {time.perf_counter() - started:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,70 +3,95 @@
 Degen Dudes Score Backup Script
 Pulls all game data from Supabase and saves to disk.
 Run via launchd every 3 hours during the golf trip (Feb 26 - Mar 2).
+
+With --incremental, runs between full snapshots only write a small delta
+of what changed since the previous run (see scripts/backup/delta.py).
+With --store cas, each table payload is kept once by content hash and a
+run only writes a small manifest (see scripts/backup/store.py).
+With --compact, full snapshots are written as compressed, column-wise
+.ddz files; backup.load_snapshot() reads either format.
+Old full snapshots are thinned grandfather-father-son style: all from the
+last 6 hours, hourly for 2 days, daily after that, with each dropped one
+folded into a delta so every point in time can still be restored (see
+scripts/backup/retention.py).
+With --day N, writes a small day-scoped backup (day<N>-*.json) holding only
+that day's course, groups, matches and scores, plus settings and players.
+With --daemon, stays running instead: cheap change probes every cycle,
+a backup only when something changed, every couple of minutes during
+play and backing off to half-hourly probes when idle (see
+scripts/backup/daemon.py). Implies --incremental with --store files.
+Every run appends timing spans (rows, bytes and time per table, writing
+and pruning; with --metrics-detail or on failure also connect,
+time-to-first-byte, download and decode per request) to metrics.jsonl in
+the backup dir, rotated at a few MB, and rewrites backup.prom, a Prometheus
+textfile, next to it (see scripts/backup/metrics.py).
 """
 
-import json
-import os
+import argparse
+import signal
 import sys
-import urllib.request
-import urllib.error
+import tempfile
+import threading
+import time
 from pathlib import Path
 from datetime import datetime, timezone, timedelta
 
-# ── Config ────────────────────────────────────────────────────────────────────
-SUPABASE_URL = "https://lnnlabbdffowjpaxvnsp.supabase.co"
-KEY_FILE     = Path.home() / ".config" / "supabase" / "degen-dudes-service-role"
-BACKUP_DIR   = Path.home() / "code" / "degen-dudes" / "backups"
-MAX_BACKUPS  = 30
-
-TABLES = [
-    "players",
-    "courses",
-    "scores",
-    "groups",
-    "group_players",
-    "matches",
-    "match_players",
-]
+from backup import DEFAULT_PAGE_SIZE, RestClient, SnapshotWriter, spool_tables
+from backup.checkpoint import checkpointed_tables, clear_staging, open_staging
+from backup.compact import COMPACT_SUFFIX, dump_snapshot
+from backup.config import BACKUP_DIR, SUPABASE_URL, read_service_key
+from backup.daemon import Schedule, run_daemon
+from backup.metrics import RunMetrics
+from backup.delta import (
+    DEFAULT_REBASE_EVERY,
+    fetch_delta,
+    load_state,
+    needs_full,
+    file_time,
+    prune_orphan_deltas,
+    save_state,
+    state_from_full,
+    write_delta,
+)
+from backup.retention import RetentionPolicy, apply_retention
+from backup.snapshot import snapshot_files
+from backup.store import STORE_DIR, BlobStore
+from backup.tables import REGISTRY, day_filters, day_tables, resolve_day
 
-# ── Helpers ───────────────────────────────────────────────────────────────────
+# ── Config ────────────────────────────────────────────────────────────────────
+# Supabase URL, service key and backup dir live in scripts/backup/config.py
+MAX_BACKUPS  = 30   # --store cas manifests and --day files
+RETENTION    = RetentionPolicy(keep_all=timedelta(hours=6), hourly=timedelta(days=2))
+STORE_BACKEND = "files"   # "cas": content-addressed store, see scripts/backup/store.py
+FETCH_WORKERS = 8   # parallel table fetches, one keep-alive connection each
+PAGE_SIZE    = DEFAULT_PAGE_SIZE   # rows per REST request; must not exceed PostgREST max-rows
+STAGING_DIR  = ".staging"   # in BACKUP_DIR; checkpointed pages of an unfinished full backup
+STAGING_MAX_AGE = timedelta(hours=6)   # older checkpoints are discarded, not resumed
+DAEMON_MIN_INTERVAL = 2 * 60    # --daemon: seconds between probes while scores change
+DAEMON_MAX_INTERVAL = 30 * 60   # --daemon: idle ceiling, reached by doubling
+DAEMON_MAX_QUIET    = 3 * 60 * 60   # --daemon: back up at least this often anyway
 
-def read_service_key() -> str:
-    """Read the Supabase service role key from disk (never log it)."""
-    try:
-        return KEY_FILE.read_text().strip()
-    except FileNotFoundError:
-        print(f"ERROR: Service role key not found at {KEY_FILE}", file=sys.stderr)
-        sys.exit(1)
-    except Exception as e:
-        print(f"ERROR reading service key: {e}", file=sys.stderr)
-        sys.exit(1)
+# Every table in the schema, parents first; projections, keys and day
+# filters are declared in scripts/backup/tables.py
+TABLES = [spec.name for spec in REGISTRY]
 
+# Tables fetched incrementally by high-water mark on this column
+WATERMARK_COLUMNS = {spec.name: spec.watermark for spec in REGISTRY if spec.watermark}
 
-def fetch_table(table: str, key: str) -> list:
-    """Fetch all rows from a Supabase REST table."""
-    url = f"{SUPABASE_URL}/rest/v1/{table}?select=*"
-    req = urllib.request.Request(url)
-    req.add_header("apikey", key)
-    req.add_header("Authorization", f"Bearer {key}")
-    req.add_header("Accept", "application/json")
+DAY_GLOB = "day?-*.json"   # --day backups, pruned separately from full snapshots
 
-    try:
-        with urllib.request.urlopen(req, timeout=30) as resp:
-            body = resp.read().decode("utf-8")
-            return json.loads(body)
-    except urllib.error.HTTPError as e:
-        body = e.read().decode("utf-8", errors="replace")
-        print(f"ERROR fetching {table}: HTTP {e.code} — {body[:200]}", file=sys.stderr)
-        raise
-    except Exception as e:
-        print(f"ERROR fetching {table}: {e}", file=sys.stderr)
-        raise
+METRICS_LOG      = "metrics.jsonl"   # in BACKUP_DIR; one JSON line per span, appended every run, rotated to .1
+METRICS_TEXTFILE = "backup.prom"     # in BACKUP_DIR; the last run, for node_exporter's textfile collector
 
+# ── Helpers ───────────────────────────────────────────────────────────────────
 
-def prune_backups(backup_dir: Path, keep: int) -> None:
-    """Delete oldest backup files, keeping the most recent `keep` files."""
-    files = sorted(backup_dir.glob("scores-*.json"), key=lambda f: f.stat().st_mtime)
+def prune_backups(backup_dir: Path, keep: int, pattern: str = None) -> None:
+    """
+    Delete oldest backup files, keeping the most recent `keep` files:
+    full snapshots, or the files matching `pattern`.
+    """
+    files = list(backup_dir.glob(pattern)) if pattern else snapshot_files(backup_dir)
+    files = sorted(files, key=file_time)
     to_delete = files[:-keep] if len(files) > keep else []
     for f in to_delete:
         try:
@@ -75,53 +100,303 @@ def prune_backups(backup_dir: Path, keep: int) -> None:
             print(f"WARNING: could not delete old backup {f.name}: {e}", file=sys.stderr)
 
 
-# ── Main ──────────────────────────────────────────────────────────────────────
-
-def main() -> int:
-    # 1. Read key
-    key = read_service_key()
+# ── Backup runs ───────────────────────────────────────────────────────────────
 
-    # 2. Ensure backup dir exists
-    BACKUP_DIR.mkdir(parents=True, exist_ok=True)
+def print_timings(elapsed: float, timings: dict) -> None:
+    print(f"Fetched {len(timings)} tables in {elapsed:.2f}s: " + ", ".join(
+        f"{table} {seconds:.2f}s" for table, seconds in timings.items()
+    ))
 
-    # 3. Fetch all tables
-    data = {}
-    for table in TABLES:
-        try:
-            rows = fetch_table(table, key)
-            data[table] = rows
-        except Exception:
-            # Error already printed; fail gracefully
-            return 1
 
-    # 4. Build backup bundle
-    tz_mst = timezone(timedelta(hours=-7))
-    now = datetime.now(tz=tz_mst)
+def backup_full(client: RestClient, now: datetime, page_size: int, store: BlobStore = None,
+                compact: bool = False, metrics: RunMetrics = None) -> int:
+    """
+    Stream every table into a new full snapshot and start a new delta chain,
+    or, with a BlobStore, into deduplicated blobs plus a run manifest.
+    `compact` writes the snapshot as a compressed `.ddz` instead of JSON.
+    """
+    metrics = metrics or RunMetrics("full")
     timestamp = now.isoformat(timespec="seconds")
+    # Staging survives a failed run: the next run resumes from its checkpoints
+    staging = open_staging(BACKUP_DIR / STAGING_DIR, now, STAGING_MAX_AGE)
+    resumed = checkpointed_tables(staging)
+    if resumed:
+        done = sum(c["done"] for c in resumed.values())
+        print(f"Resuming: {done} tables complete, {len(resumed) - done} partly fetched")
 
-    bundle = {"backup_timestamp": timestamp}
-    bundle.update(data)  # players, courses, scores, …
+    # Stream all tables in parallel, page by page, into staging spools
+    started = time.perf_counter()
+    try:
+        with metrics.span("fetch"):
+            spools, timings = spool_tables(
+                client, TABLES, staging, workers=FETCH_WORKERS,
+                page_size=page_size, watermarks=WATERMARK_COLUMNS, resume=True,
+            )
+    except Exception:
+        # Error already printed; keep the checkpoints and fail gracefully
+        print(f"Fetched pages kept in {staging} for the next run", file=sys.stderr)
+        return 1
+    elapsed = time.perf_counter() - started
+    metrics.tables_fetched(timings)
 
-    # 5. Write to disk
+    # Write to disk: spools copied in table order, then atomically renamed
     filename = now.strftime("scores-%Y-%m-%d-%H%M.json")
-    backup_path = BACKUP_DIR / filename
     try:
-        backup_path.write_text(json.dumps(bundle, indent=2, default=str))
+        with metrics.span("write") as span:
+            if store is not None:
+                entries = [(t, store.put_spool(spools[t]), spools[t].count) for t in TABLES]
+                backup_path = store.write_manifest(filename, timestamp, entries)
+            elif compact:
+                bundle = {"backup_timestamp": timestamp}
+                bundle.update((table, spools[table].load_rows()) for table in TABLES)
+                backup_path = dump_snapshot(bundle, BACKUP_DIR / Path(filename).with_suffix(COMPACT_SUFFIX))
+                save_state(BACKUP_DIR, state_from_full(backup_path, timestamp, spools))
+            else:
+                backup_path = BACKUP_DIR / filename
+                with SnapshotWriter(backup_path, timestamp) as writer:
+                    for table in TABLES:
+                        writer.add_table(spools[table])  # players, courses, scores, …
+                save_state(BACKUP_DIR, state_from_full(backup_path, timestamp, spools))
+            span["bytes"] = backup_path.stat().st_size
     except Exception as e:
         print(f"ERROR writing backup file: {e}", file=sys.stderr)
         return 1
+    clear_staging(staging)
 
-    # 6. Prune old backups
-    prune_backups(BACKUP_DIR, MAX_BACKUPS)
-
-    # 7. Summary (no key in output)
-    n_scores  = len(data.get("scores", []))
-    n_players = len(data.get("players", []))
-    n_matches = len(data.get("matches", []))
+    # Summary (no key in output)
+    n_scores  = spools["scores"].count
+    n_players = spools["players"].count
+    n_matches = spools["matches"].count
     print(
         f"Backup complete: {n_scores} scores, {n_players} players, "
         f"{n_matches} matches saved to {backup_path}"
     )
+    print_timings(elapsed, timings)
+    return 0
+
+
+def backup_day(client: RestClient, now: datetime, day: int, page_size: int, compact: bool = False,
+               metrics: RunMetrics = None) -> int:
+    """
+    Back up one trip day: its course, tees, holes, groups, matches and
+    scores (plus settings and players) into day<N>-YYYY-MM-DD-HHMM.json.
+    Day files are not full snapshots: they never start or extend a chain.
+    """
+    metrics = metrics or RunMetrics("day")
+    timestamp = now.isoformat(timespec="seconds")
+    tables = day_tables(TABLES)
+    with tempfile.TemporaryDirectory(prefix=".staging-", dir=BACKUP_DIR) as staging:
+        started = time.perf_counter()
+        try:
+            with metrics.span("fetch"):
+                ids = resolve_day(client, day)
+        except Exception as e:
+            # The id lookups print nothing themselves
+            print(f"ERROR looking up day {day}: {e}", file=sys.stderr)
+            return 1
+        try:
+            with metrics.span("fetch"):
+                spools, timings = spool_tables(
+                    client, tables, Path(staging), workers=FETCH_WORKERS,
+                    page_size=page_size, filters=day_filters(tables, ids),
+                )
+        except Exception:
+            # Error already printed; fail gracefully
+            return 1
+        elapsed = time.perf_counter() - started
+        metrics.tables_fetched(timings)
+
+        filename = now.strftime(f"day{day}-%Y-%m-%d-%H%M.json")
+        try:
+            with metrics.span("write") as span:
+                if compact:
+                    bundle = {"backup_timestamp": timestamp}
+                    bundle.update((table, spools[table].load_rows()) for table in tables)
+                    backup_path = dump_snapshot(bundle, BACKUP_DIR / Path(filename).with_suffix(COMPACT_SUFFIX))
+                else:
+                    backup_path = BACKUP_DIR / filename
+                    with SnapshotWriter(backup_path, timestamp) as writer:
+                        for table in tables:
+                            writer.add_table(spools[table])
+                span["bytes"] = backup_path.stat().st_size
+        except Exception as e:
+            print(f"ERROR writing backup file: {e}", file=sys.stderr)
+            return 1
+
+    print(f"Day {day} backup complete: {spools['scores'].count} scores, "
+          f"{spools['matches'].count} matches saved to {backup_path}")
+    print_timings(elapsed, timings)
+    return 0
+
+
+def backup_incremental(client: RestClient, now: datetime, state: dict, page_size: int,
+                       metrics: RunMetrics = None) -> int:
+    """Write a delta with the rows changed since the last run, if any."""
+    metrics = metrics or RunMetrics("incremental")
+    started = time.perf_counter()
+    try:
+        with metrics.span("fetch"):
+            changes, tables, timings = fetch_delta(
+                client, TABLES, state, BACKUP_DIR, workers=FETCH_WORKERS, page_size=page_size
+            )
+    except Exception:
+        # Error already printed; fail gracefully
+        return 1
+    elapsed = time.perf_counter() - started
+    metrics.tables_fetched(timings)
+
+    state = dict(state, tables=tables, last_timestamp=now.isoformat(timespec="seconds"))
+    delta_path = None
+    try:
+        with metrics.span("write") as span:
+            if changes:
+                delta_path = write_delta(BACKUP_DIR, now, state, changes)
+                state["deltas"] += 1
+                span["bytes"] = delta_path.stat().st_size
+            save_state(BACKUP_DIR, state)
+    except Exception as e:
+        print(f"ERROR writing delta file: {e}", file=sys.stderr)
+        return 1
+
+    if delta_path is None:
+        print(f"Incremental backup: no changes since {state['base']}")
+    else:
+        summary = ", ".join(
+            f"{table} {len(change.get('upsert', change.get('replace', [])))}"
+            + (f" (-{len(change['delete'])})" if change.get("delete") else "")
+            for table, change in changes.items()
+        )
+        print(f"Incremental backup: {summary} saved to {delta_path}")
+    print_timings(elapsed, timings)
+    return 0
+
+
+# ── Main ──────────────────────────────────────────────────────────────────────
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Back up Degen Dudes game data from Supabase.")
+    parser.add_argument("--page-size", type=int, default=PAGE_SIZE,
+                        help=f"rows per REST request (default {PAGE_SIZE})")
+    parser.add_argument("--incremental", action="store_true",
+                        help="write a delta against the last full snapshot when possible")
+    parser.add_argument("--rebase-every", type=int, default=DEFAULT_REBASE_EVERY,
+                        help=f"take a full snapshot after this many deltas (default {DEFAULT_REBASE_EVERY})")
+    parser.add_argument("--store", choices=["files", "cas"], default=STORE_BACKEND,
+                        help="files: one JSON snapshot per run; cas: deduplicated blobs + manifests "
+                             f"under {BACKUP_DIR.name}/{STORE_DIR}/ (default {STORE_BACKEND})")
+    parser.add_argument("--compact", action="store_true",
+                        help="write full snapshots as compressed column-wise .ddz files")
+    parser.add_argument("--daemon", action="store_true",
+                        help="keep running; back up whenever the change probes see new data")
+    parser.add_argument("--min-interval", type=float, default=DAEMON_MIN_INTERVAL,
+                        help=f"--daemon: seconds between probes during play (default {DAEMON_MIN_INTERVAL})")
+    parser.add_argument("--max-interval", type=float, default=DAEMON_MAX_INTERVAL,
+                        help=f"--daemon: idle probe interval ceiling (default {DAEMON_MAX_INTERVAL})")
+    parser.add_argument("--day", type=int, choices=[1, 2, 3],
+                        help="back up only this trip day's course, groups, matches and scores")
+    parser.add_argument("--metrics-textfile", type=Path,
+                        help=f"Prometheus textfile to rewrite after each run (default {METRICS_TEXTFILE} "
+                             "in the backup dir), e.g. in node_exporter's textfile directory")
+    parser.add_argument("--metrics-detail", action="store_true",
+                        help=f"also log every request's and page's timings to {METRICS_LOG} "
+                             "(always done for a failed run)")
+    args = parser.parse_args(argv)
+    if args.incremental and args.store != "files":
+        parser.error("--incremental needs --store files (deltas chain to a snapshot file)")
+    if args.day and (args.incremental or args.daemon or args.store != "files"):
+        parser.error("--day writes a standalone file; it cannot be combined with "
+                     "--incremental, --daemon or --store cas")
+    if args.daemon and args.store == "files":
+        # A full snapshot per change would prune the trip's history within an hour
+        args.incremental = True
+    return args
+
+
+def write_metrics(metrics: RunMetrics, result: int, textfile: Path = None, detail: bool = False) -> None:
+    """Append the run's spans to the metrics log and rewrite the textfile; never fails the run."""
+    try:
+        metrics.write_jsonl(BACKUP_DIR / METRICS_LOG, result, detail)
+        metrics.write_textfile(textfile or BACKUP_DIR / METRICS_TEXTFILE, result)
+    except OSError as e:
+        print(f"WARNING: could not write backup metrics: {e}", file=sys.stderr)
+
+
+def run_once(client: RestClient, args: argparse.Namespace, store: BlobStore = None) -> int:
+    """One backup run, full, delta or day-scoped, followed by pruning; its timings go to the metrics files."""
+    metrics = RunMetrics()
+    client.metrics = metrics   # every request and page decode of this run is timed
+    try:
+        result = backup_and_prune(client, args, store, metrics)
+    finally:
+        client.metrics = None
+    write_metrics(metrics, result, args.metrics_textfile, args.metrics_detail)
+    return result
+
+
+def backup_and_prune(client: RestClient, args: argparse.Namespace, store: BlobStore, metrics: RunMetrics) -> int:
+    """The backup itself, then pruning, each step timed into `metrics`."""
+    if args.day:
+        metrics.kind = "day"
+        result = backup_day(client, datetime.now(tz=timezone(timedelta(hours=-7))), args.day,
+                            args.page_size, args.compact, metrics)
+        if not result:
+            with metrics.span("prune"):
+                prune_backups(BACKUP_DIR, MAX_BACKUPS, DAY_GLOB)
+        return result
+
+    # Full snapshot, or a delta when the chain can be extended
+    tz_mst = timezone(timedelta(hours=-7))
+    now = datetime.now(tz=tz_mst)
+    state = load_state(BACKUP_DIR) if args.incremental else None
+    if state is not None and not needs_full(state, TABLES, args.rebase_every):
+        metrics.kind = "incremental"
+        result = backup_incremental(client, now, state, args.page_size, metrics)
+    else:
+        result = backup_full(client, now, args.page_size, store, args.compact, metrics)
+    if result:
+        return result
+
+    # Prune old backups: unreferenced blobs in the store, or thin old
+    # snapshot files into deltas (and drop deltas whose base is gone)
+    with metrics.span("prune") as span:
+        if store is not None:
+            n_manifests, n_blobs, freed = store.gc(MAX_BACKUPS)
+            if n_blobs:
+                print(f"Store GC: dropped {n_manifests} manifests, {n_blobs} blobs ({freed:,} bytes)")
+        else:
+            folded, freed = apply_retention(BACKUP_DIR, now, RETENTION)
+            if folded:
+                print(f"Retention: folded {folded} old snapshots into deltas ({freed:,} bytes freed)")
+            prune_orphan_deltas(BACKUP_DIR)
+        span["bytes_freed"] = freed
+    return 0
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+
+    # 1. Read key
+    key = read_service_key()
+
+    # 2. Ensure backup dir exists
+    BACKUP_DIR.mkdir(parents=True, exist_ok=True)
+
+    # 3. Back up once, or keep backing up on one warm client
+    store = BlobStore(BACKUP_DIR / STORE_DIR) if args.store == "cas" else None
+    with RestClient(SUPABASE_URL, key, pool_size=FETCH_WORKERS) as client:
+        if not args.daemon:
+            return run_once(client, args, store)
+
+        sys.stdout.reconfigure(line_buffering=True)   # log lines reach launchd's log as they happen
+        stop = threading.Event()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(sig, lambda *_: stop.set())
+        print(f"Backup daemon started: probing every {args.min_interval:g}-{args.max_interval:g}s")
+        taken = run_daemon(
+            client, lambda: run_once(client, args, store), TABLES, WATERMARK_COLUMNS,
+            Schedule(args.min_interval, args.max_interval), DAEMON_MAX_QUIET, stop,
+        )
+        print(f"Backup daemon stopped after {taken} backups")
     return 0
 
 
@@ -0,0 +1,35 @@
+"""
+Backup pipeline for the Degen Dudes Supabase project.
+Used by scripts/backup-*.py; stdlib only so launchd can run it anywhere.
+"""
+
+from .compact import dump_snapshot, load_snapshot
+from .fetch import (
+    DEFAULT_PAGE_SIZE,
+    RestClient,
+    RestError,
+    fetch_table,
+    fetch_tables,
+    iter_table_pages,
+    spool_tables,
+)
+from .restore import restore_bundle
+from .snapshot import SnapshotWriter, TableSpool, encode_row
+from .store import BlobStore
+
+__all__ = [
+    "BlobStore",
+    "DEFAULT_PAGE_SIZE",
+    "RestClient",
+    "RestError",
+    "SnapshotWriter",
+    "TableSpool",
+    "dump_snapshot",
+    "encode_row",
+    "fetch_table",
+    "fetch_tables",
+    "iter_table_pages",
+    "load_snapshot",
+    "restore_bundle",
+    "spool_tables",
+]
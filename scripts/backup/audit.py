@@ -0,0 +1,167 @@
+"""
+Integrity audit of the derived columns on `scores` rows.
+
+Every score stores ch_strokes, ph_strokes, net_score and ph_score next to
+gross_score. The audit recomputes them the way saveScore does
+(src/app/actions/scores.ts, formulas in src/lib/scoring/handicap.ts):
+
+  * CH  – player_tee_assignments.course_handicap for (player, course)
+  * PH  – group_players.playing_handicap in the player's group that day
+  * strokes on a hole of rank r: handicap // 18 + (r <= handicap % 18),
+          read from the scoring.handicap tables with the handicap capped
+          at 54, where calcStrokesOnHole's three tiers end
+  * net = min(gross - strokes, par + strokes + net_max_over_par)
+
+The reference tables are turned into small lookup arrays, and each
+snapshot's scores are checked as whole columns, so auditing the full
+history takes a fraction of a second. Rows whose hole or tee assignment
+is missing are counted as unverifiable rather than guessed at. saveScore
+falls back to PH 0 for a player with no group that day, but groups get
+rebuilt between rounds, so there only the CH columns are checked.
+
+Unlike the rest of the package this module needs NumPy; the backup
+scripts never import it.
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+
+from scoring.handicap import APP_MAX_HANDICAP, calc_strokes_array
+from scoring.matches import calc_net_array
+from scoring.reference import REFERENCE_TABLES, net_max_over_par
+
+DERIVED = ("ch_strokes", "ph_strokes", "net_score", "ph_score")
+
+
+class Reference(NamedTuple):
+    """Lookup arrays built from one bundle's reference tables."""
+    players: dict       # player id → index
+    courses: dict       # course id → index
+    course_day: np.ndarray    # [course] → day_number
+    par: np.ndarray           # [course, hole_number] → par, -1 if unknown
+    rank: np.ndarray          # [course, hole_number] → handicap_rank
+    ch: np.ndarray            # [player, course] → course handicap
+    has_ch: np.ndarray        # [player, course] → tee assignment exists
+    ph: np.ndarray            # [player, day] → playing handicap
+    has_ph: np.ndarray        # [player, day] → player is in a group that day
+    net_max_over_par: int
+
+
+def build_reference(bundle: dict) -> Reference:
+    courses = {c["id"]: i for i, c in enumerate(bundle.get("courses", []))}
+    players = {}
+    for player_id in [p["id"] for p in bundle.get("players", [])] + [
+            r["player_id"] for r in bundle.get("player_tee_assignments", []) + bundle.get("group_players", [])]:
+        players.setdefault(player_id, len(players))
+
+    n_courses, n_players = max(len(courses), 1), max(len(players), 1)
+    course_day = np.zeros(n_courses, dtype=np.int64)
+    for course in bundle.get("courses", []):
+        course_day[courses[course["id"]]] = course["day_number"] or 0
+
+    holes = [h for h in bundle.get("holes", []) if h["course_id"] in courses]
+    n_holes = max((h["hole_number"] for h in holes), default=18) + 1
+    par = np.full((n_courses, n_holes), -1, dtype=np.int64)
+    rank = np.zeros((n_courses, n_holes), dtype=np.int64)
+    for h in holes:
+        par[courses[h["course_id"]], h["hole_number"]] = h["par"]
+        rank[courses[h["course_id"]], h["hole_number"]] = h["handicap_rank"]
+
+    ch = np.zeros((n_players, n_courses), dtype=np.int64)
+    has_ch = np.zeros((n_players, n_courses), dtype=bool)
+    for a in bundle.get("player_tee_assignments", []):
+        if a["course_id"] in courses and a.get("course_handicap") is not None:
+            ch[players[a["player_id"]], courses[a["course_id"]]] = a["course_handicap"]
+            has_ch[players[a["player_id"]], courses[a["course_id"]]] = True
+
+    group_day = {g["id"]: g["day_number"] or 0 for g in bundle.get("groups", [])}
+    n_days = max(list(group_day.values()) + course_day.tolist() + [0]) + 1
+    ph = np.zeros((n_players, n_days), dtype=np.int64)
+    has_ph = np.zeros((n_players, n_days), dtype=bool)
+    # The app takes the first matching row; keep the first per (player, day) likewise
+    seen = set()
+    for gp in bundle.get("group_players", []):
+        day = group_day.get(gp["group_id"])
+        key = (gp["player_id"], day)
+        if day is None or key in seen:
+            continue
+        seen.add(key)
+        ph[players[gp["player_id"]], day] = gp.get("playing_handicap") or 0
+        has_ph[players[gp["player_id"]], day] = True
+
+    return Reference(players, courses, course_day, par, rank, ch, has_ch, ph, has_ph,
+                     net_max_over_par(bundle))
+
+
+def _app_strokes(handicap, rank) -> np.ndarray:
+    """calcStrokesOnHole as the app has it: no fourth stroke past CH 54."""
+    return calc_strokes_array(np.minimum(handicap, APP_MAX_HANDICAP), rank)
+
+
+def _column(rows: list, name: str, default: int = 0) -> np.ndarray:
+    return np.fromiter((default if r.get(name) is None else r[name] for r in rows),
+                       dtype=np.int64, count=len(rows))
+
+
+def audit_scores(scores: list, ref: Reference) -> dict:
+    """
+    Check every row of `scores` against `ref`. Returns
+    {"checked": n, "unverifiable": [rows], "ph_unchecked": n,
+     "mismatches": [(row, {col: (stored, expected)})]}.
+    """
+    n = len(scores)
+    player = np.fromiter((ref.players.get(r["player_id"], -1) for r in scores), np.int64, n)
+    course = np.fromiter((ref.courses.get(r["course_id"], -1) for r in scores), np.int64, n)
+    hole = _column(scores, "hole_number", -1)
+    gross = _column(scores, "gross_score")
+
+    known = (player >= 0) & (course >= 0) & (hole >= 0) & (hole < ref.par.shape[1])
+    p, c, h = np.where(known, player, 0), np.where(known, course, 0), np.where(known, hole, 0)
+    par, rank = ref.par[c, h], ref.rank[c, h]
+    known &= (par >= 0) & ref.has_ch[p, c]
+
+    ch_strokes = _app_strokes(ref.ch[p, c], rank)
+    day = ref.course_day[c]
+    ph_strokes = _app_strokes(ref.ph[p, day], rank)
+    grouped = known & ref.has_ph[p, day]
+    expected = {
+        "ch_strokes": ch_strokes,
+        "ph_strokes": ph_strokes,
+        "net_score": calc_net_array(gross, ch_strokes, par, ref.net_max_over_par),
+        "ph_score": calc_net_array(gross, ph_strokes, par, ref.net_max_over_par),
+    }
+    wrong = {}
+    for column, values in expected.items():
+        stored = np.fromiter((r.get(column) for r in scores), dtype=float, count=n)
+        checked = grouped if column.startswith("ph_") else known
+        wrong[column] = checked & (stored != values)   # a NULL (nan) never matches
+
+    mismatches = []
+    for i in np.flatnonzero(np.logical_or.reduce(list(wrong.values()))):
+        row = scores[i]
+        mismatches.append((row, {
+            column: (row.get(column), int(expected[column][i])) for column in DERIVED if wrong[column][i]
+        }))
+    unverifiable = [scores[i] for i in np.flatnonzero(~known)]
+    return {"checked": int(known.sum()), "unverifiable": unverifiable,
+            "ph_unchecked": int((known & ~grouped).sum()), "mismatches": mismatches}
+
+
+def audit_history(bundles, reference: dict = None):
+    """
+    Yield (bundle, result) for each bundle in `bundles`, oldest first.
+    Reference tables a bundle lacks come from the newest earlier bundle
+    that had them, then from `reference`; lookups are rebuilt only when
+    those tables change.
+    """
+    tables = {t: reference[t] for t in REFERENCE_TABLES if t in (reference or {})}
+    ref = None
+    for bundle in bundles:
+        changed = False
+        for table in REFERENCE_TABLES:
+            if table in bundle and bundle[table] != tables.get(table):
+                tables[table], changed = bundle[table], True
+        if ref is None or changed:
+            ref = build_reference(tables)
+        yield bundle, audit_scores(bundle.get("scores", []), ref)
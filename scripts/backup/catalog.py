@@ -0,0 +1,247 @@
+"""
+SQLite point-in-time catalog over every backup the backup script produces.
+
+Each distinct version of a row is stored once, with the interval during
+which the backups saw it:
+
+    versions(tbl, id, valid_from, valid_to, data, player_id, course_id, hole_number)
+
+`valid_to` is NULL while the version is still current. Timestamps are UTC
+ISO-8601 strings, so they order correctly as text. Full snapshots (.json,
+.ddz), deltas and content-addressed store manifests are all ingested. A
+snapshot is read once: its name goes into `sources`, and later ingests
+only open files whose names are not there yet.
+
+    catalog = Catalog(BACKUP_DIR / "catalog.sqlite")
+    catalog.ingest_dir(BACKUP_DIR)
+    catalog.score_at("Eric", day=2, hole=5, at="2026-02-28T14:18:00-07:00")
+    catalog.score_history("Eric", day=2, hole=5)
+"""
+
+import json
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+
+from .compact import load_snapshot
+from .delta import DELTA_GLOB, file_time
+from .snapshot import snapshot_files
+from .store import STORE_DIR, BlobStore
+from .tables import primary_key
+
+SCHEMA = """
+create table if not exists sources (
+  name        text primary key,
+  kind        text not null,
+  taken_at    text not null,
+  ingested_at text not null
+);
+create table if not exists versions (
+  tbl         text not null,
+  id          text not null,
+  valid_from  text not null,
+  valid_to    text,
+  data        text not null,
+  player_id   text,
+  course_id   text,
+  hole_number int,
+  primary key (tbl, id, valid_from)
+);
+create index if not exists idx_versions_open on versions(tbl, valid_to, id);
+create index if not exists idx_versions_player on versions(player_id, course_id, hole_number, valid_from);
+create index if not exists idx_versions_course on versions(course_id, hole_number, valid_from);
+create index if not exists idx_versions_hole on versions(hole_number);
+"""
+
+
+def utc(timestamp) -> str:
+    """Normalize a datetime or ISO string to sortable UTC ISO text."""
+    if isinstance(timestamp, str):
+        timestamp = datetime.fromisoformat(timestamp)
+    return timestamp.astimezone(timezone.utc).isoformat()
+
+
+def canonical(row: dict) -> str:
+    return json.dumps(row, sort_keys=True, separators=(",", ":"), default=str)
+
+
+class Catalog:
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.db = sqlite3.connect(self.path)
+        self.db.executescript(SCHEMA)
+        self._open = None  # {tbl: {id: data}} for current versions, loaded lazily
+
+    def close(self) -> None:
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ── Ingest ────────────────────────────────────────────────────────────────
+
+    def ingested(self) -> set:
+        return {name for (name,) in self.db.execute("select name from sources")}
+
+    def latest(self):
+        (taken_at,) = self.db.execute("select max(taken_at) from sources").fetchone()
+        return taken_at
+
+    def _open_versions(self, tbl: str) -> dict:
+        if self._open is None:
+            self._open = {}
+            for t, row_id, data in self.db.execute(
+                "select tbl, id, data from versions where valid_to is null"
+            ):
+                self._open.setdefault(t, {})[row_id] = data
+        return self._open.setdefault(tbl, {})
+
+    def _put(self, tbl: str, row: dict, at: str) -> int:
+        """Record `row` as seen at `at`; returns 1 if it is a new version."""
+        key = row[primary_key(tbl)]
+        data = canonical(row)
+        current = self._open_versions(tbl)
+        if current.get(key) == data:
+            return 0
+        if key in current:
+            self._close(tbl, key, at)
+        self.db.execute(
+            "insert or replace into versions values (?, ?, ?, null, ?, ?, ?, ?)",
+            (tbl, key, at, data, row.get("player_id"), row.get("course_id"), row.get("hole_number")),
+        )
+        current[key] = data
+        return 1
+
+    def _close(self, tbl: str, row_id: str, at: str) -> None:
+        self.db.execute(
+            "update versions set valid_to = ? where tbl = ? and id = ? and valid_to is null",
+            (at, tbl, row_id),
+        )
+        self._open_versions(tbl).pop(row_id, None)
+
+    def _replace_table(self, tbl: str, rows: list, at: str) -> int:
+        changed = sum(self._put(tbl, row, at) for row in rows)
+        key = primary_key(tbl)
+        seen = {row[key] for row in rows}
+        gone = [rid for rid in self._open_versions(tbl) if rid not in seen]
+        for rid in gone:
+            self._close(tbl, rid, at)
+        return changed + len(gone)
+
+    def ingest_bundle(self, name: str, kind: str, bundle: dict) -> int:
+        """Ingest a full backup bundle; every table is replaced wholesale."""
+        at = utc(bundle["backup_timestamp"])
+        changed = sum(
+            self._replace_table(tbl, rows, at)
+            for tbl, rows in bundle.items() if tbl != "backup_timestamp"
+        )
+        self._record(name, kind, at)
+        return changed
+
+    def ingest_delta(self, name: str, delta: dict) -> int:
+        at = utc(delta["backup_timestamp"])
+        changed = 0
+        for tbl, change in delta["tables"].items():
+            if "replace" in change:
+                changed += self._replace_table(tbl, change["replace"], at)
+                continue
+            for rid in change.get("delete", []):
+                self._close(tbl, rid, at)
+                changed += 1
+            changed += sum(self._put(tbl, row, at) for row in change.get("upsert", []))
+        self._record(name, "delta", at)
+        return changed
+
+    def _record(self, name: str, kind: str, at: str) -> None:
+        self.db.execute(
+            "insert into sources values (?, ?, ?, ?)",
+            (name, kind, at, datetime.now(timezone.utc).isoformat()),
+        )
+
+    def ingest_dir(self, backup_dir: Path):
+        """
+        Ingest every backup in `backup_dir` not seen before, oldest first.
+        Returns (ingested, skipped, versions_changed); a backup older than
+        the catalog's latest one cannot be spliced into history and is skipped.
+        """
+        backup_dir = Path(backup_dir)
+        known = self.ingested()
+        pending = []
+        for path in snapshot_files(backup_dir):
+            if path.name not in known:
+                pending.append((file_time(path), path.name, "snapshot", path))
+        for path in backup_dir.glob(DELTA_GLOB):
+            if path.name not in known:
+                pending.append((file_time(path), path.name, "delta", path))
+        store = None
+        if (backup_dir / STORE_DIR).is_dir():
+            store = BlobStore(backup_dir / STORE_DIR)
+            for path in store.manifests():
+                name = f"{STORE_DIR}/{path.name}"
+                if name not in known:
+                    pending.append((file_time(path), name, "manifest", path))
+
+        latest = self.latest()
+        ingested = skipped = changed = 0
+        with self.db:
+            for taken, name, kind, path in sorted(pending, key=lambda p: p[:2]):
+                # Filenames carry minute precision only; compare at that resolution.
+                if latest is not None and utc(taken)[:16] < latest[:16]:
+                    skipped += 1
+                    continue
+                if kind == "delta":
+                    changed += self.ingest_delta(name, json.loads(path.read_text()))
+                elif kind == "manifest":
+                    changed += self.ingest_bundle(name, kind, store.load(path.name))
+                else:
+                    changed += self.ingest_bundle(name, kind, load_snapshot(path))
+                ingested += 1
+        return ingested, skipped, changed
+
+    # ── Queries ───────────────────────────────────────────────────────────────
+
+    def rows_at(self, tbl: str, at, **where) -> list:
+        """Rows of `tbl` as of `at`, optionally filtered on indexed columns."""
+        at = utc(at)
+        sql = "select data from versions where tbl = ? and valid_from <= ? and (valid_to is null or valid_to > ?)"
+        params = [tbl, at, at]
+        for column in ("id", "player_id", "course_id", "hole_number"):
+            if column in where:
+                sql += f" and {column} = ?"
+                params.append(where[column])
+        return [json.loads(data) for (data,) in self.db.execute(sql, params)]
+
+    def history(self, tbl: str, **where) -> list:
+        """Every version matching `where`: [(valid_from, valid_to, row)], oldest first."""
+        sql = "select valid_from, valid_to, data from versions where tbl = ?"
+        params = [tbl]
+        for column in ("id", "player_id", "course_id", "hole_number"):
+            if column in where:
+                sql += f" and {column} = ?"
+                params.append(where[column])
+        sql += " order by valid_from"
+        return [(vf, vt, json.loads(data)) for vf, vt, data in self.db.execute(sql, params)]
+
+    def _ids(self, player: str, day: int, at=None):
+        at = at or self.latest()
+        if at is None:
+            raise KeyError(f"catalog {self.path} is empty; run ingest first")
+        players = [p for p in self.rows_at("players", at) if p["name"] == player]
+        courses = [c for c in self.rows_at("courses", at) if c["day_number"] == day]
+        if not players or not courses:
+            raise KeyError(f"no player {player!r} or course for day {day} at {at}")
+        return players[0]["id"], courses[0]["id"]
+
+    def score_at(self, player: str, day: int, hole: int, at):
+        """The `scores` row for player/day/hole as of `at`, or None."""
+        player_id, course_id = self._ids(player, day, at)
+        rows = self.rows_at("scores", at, player_id=player_id, course_id=course_id, hole_number=hole)
+        return rows[0] if rows else None
+
+    def score_history(self, player: str, day: int, hole: int) -> list:
+        """Every version of one hole's score: [(valid_from, valid_to, row)]."""
+        player_id, course_id = self._ids(player, day)
+        return self.history("scores", player_id=player_id, course_id=course_id, hole_number=hole)
@@ -0,0 +1,80 @@
+"""
+Checkpoints for resumable table fetches.
+
+A full backup spools each table into `<table>.part` in a staging dir that
+outlives a failed run. After every page the fetcher records how far the
+table got in `<table>.ckpt`:
+
+    {"bytes": 412345, "last": "<id of the page's last row>", "done": false}
+
+`bytes` is the spool size at that point, so a page half-written when the
+run died is cut off again on resume, and `last` is where keyset paging
+(id > last) picks up. Staging older than `max_age` is thrown away rather
+than resumed, so a snapshot is never stitched together from pages fetched
+hours apart.
+"""
+
+import json
+import shutil
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from .snapshot import atomic_write_text
+
+CHECKPOINT_SUFFIX = ".ckpt"
+STAGING_MARKER = "staging.json"
+DEFAULT_MAX_AGE = timedelta(hours=6)
+
+
+def read_checkpoint(staging_dir: Path, table: str):
+    """The table's checkpoint, or None if there is none usable."""
+    path = Path(staging_dir) / f"{table}{CHECKPOINT_SUFFIX}"
+    spool = Path(staging_dir) / f"{table}.part"
+    try:
+        checkpoint = json.loads(path.read_text())
+    except (FileNotFoundError, ValueError):
+        return None
+    if not spool.exists() or spool.stat().st_size < checkpoint["bytes"]:
+        return None
+    return checkpoint
+
+
+def write_checkpoint(staging_dir: Path, table: str, size: int, last=None, done: bool = False) -> None:
+    atomic_write_text(
+        Path(staging_dir) / f"{table}{CHECKPOINT_SUFFIX}",
+        json.dumps({"bytes": size, "last": last, "done": done}),
+    )
+
+
+def checkpointed_tables(staging_dir: Path) -> dict:
+    """{table: checkpoint} for every table with progress in `staging_dir`."""
+    staging_dir = Path(staging_dir)
+    found = {}
+    for path in sorted(staging_dir.glob(f"*{CHECKPOINT_SUFFIX}")):
+        checkpoint = read_checkpoint(staging_dir, path.stem)
+        if checkpoint is not None:
+            found[path.stem] = checkpoint
+    return found
+
+
+def open_staging(staging_dir: Path, now: datetime, max_age: timedelta = DEFAULT_MAX_AGE) -> Path:
+    """
+    Return `staging_dir`, keeping a previous run's checkpoints if that run
+    started less than `max_age` before `now`, otherwise starting empty.
+    """
+    staging_dir = Path(staging_dir)
+    marker = staging_dir / STAGING_MARKER
+    try:
+        started = datetime.fromisoformat(json.loads(marker.read_text())["started"])
+        if now - started <= max_age:
+            return staging_dir
+    except (FileNotFoundError, ValueError, KeyError):
+        pass
+    clear_staging(staging_dir)
+    staging_dir.mkdir(parents=True)
+    atomic_write_text(marker, json.dumps({"started": now.isoformat(timespec="seconds")}))
+    return staging_dir
+
+
+def clear_staging(staging_dir: Path) -> None:
+    shutil.rmtree(staging_dir, ignore_errors=True)
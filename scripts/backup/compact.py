@@ -0,0 +1,109 @@
+"""
+Compact on-disk format for backup bundles (`scores-*.ddz`).
+
+The plain snapshot repeats every column name and UUID on every row and is
+indented for humans. The compact form stores each table column-wise, swaps
+every UUID for an index into one shared dictionary, and compresses the
+result:
+
+    b"DDZ1" + codec byte (b"x" lzma, b"z" zlib) + compressed JSON document
+
+    {"backup_timestamp": …,
+     "uuids": ["06559478-…", …],
+     "tables": [{"name": "scores",
+                 "columns": ["id", "player_id", …],
+                 "uuid_columns": [0, 1, 2],
+                 "data": [[col0 values…], [col1 values…], …]}, …]}
+
+A table whose rows do not share one column list is stored row-wise
+("rows" instead of "columns"/"data"), so any bundle round-trips.
+`load_snapshot()` reads either format and returns exactly the dicts
+`json.load` returns for the plain file.
+"""
+
+import json
+import lzma
+import re
+import zlib
+from pathlib import Path
+
+from .snapshot import atomic_write_bytes
+
+MAGIC = b"DDZ1"
+CODECS = {
+    "lzma": (b"x", lambda data: lzma.compress(data, preset=6), lzma.decompress),
+    "zlib": (b"z", lambda data: zlib.compress(data, 9), zlib.decompress),
+}
+COMPACT_SUFFIX = ".ddz"
+
+UUID_RE = re.compile(r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$")
+
+
+def _is_uuid_column(values: list) -> bool:
+    present = [v for v in values if v is not None]
+    return bool(present) and all(isinstance(v, str) and UUID_RE.match(v) for v in present)
+
+
+def encode_compact(bundle: dict, codec: str = "lzma") -> bytes:
+    uuids = {}
+
+    def intern(value):
+        if value is None:
+            return None
+        if value not in uuids:
+            uuids[value] = len(uuids)
+        return uuids[value]
+
+    tables = []
+    for name, rows in bundle.items():
+        if name == "backup_timestamp":
+            continue
+        columns = list(rows[0]) if rows else []
+        if not columns or any(list(row) != columns for row in rows):
+            tables.append({"name": name, "rows": rows})
+            continue
+        data = [[row[c] for row in rows] for c in columns]
+        uuid_columns = [i for i, values in enumerate(data) if _is_uuid_column(values)]
+        for i in uuid_columns:
+            data[i] = [intern(v) for v in data[i]]
+        tables.append({"name": name, "columns": columns, "uuid_columns": uuid_columns, "data": data})
+
+    doc = {"backup_timestamp": bundle.get("backup_timestamp"), "uuids": list(uuids), "tables": tables}
+    tag, compress, _ = CODECS[codec]
+    raw = json.dumps(doc, separators=(",", ":"), ensure_ascii=False, default=str).encode("utf-8")
+    return MAGIC + tag + compress(raw)
+
+
+def decode_compact(blob: bytes) -> dict:
+    if blob[:4] != MAGIC:
+        raise ValueError("not a compact backup snapshot")
+    decompress = next((d for tag, _, d in CODECS.values() if tag == blob[4:5]), None)
+    if decompress is None:
+        raise ValueError(f"unknown .ddz codec {blob[4:5]!r}")
+    doc = json.loads(decompress(blob[5:]).decode("utf-8"))
+
+    uuids = doc["uuids"]
+    bundle = {"backup_timestamp": doc["backup_timestamp"]}
+    for table in doc["tables"]:
+        if "rows" in table:
+            bundle[table["name"]] = table["rows"]
+            continue
+        data = table["data"]
+        for i in table["uuid_columns"]:
+            data[i] = [None if v is None else uuids[v] for v in data[i]]
+        columns = table["columns"]
+        bundle[table["name"]] = [dict(zip(columns, values)) for values in zip(*data)]
+    return bundle
+
+
+def dump_snapshot(bundle: dict, path: Path, codec: str = "lzma") -> Path:
+    """Write `bundle` in the compact format, atomically."""
+    return atomic_write_bytes(Path(path), encode_compact(bundle, codec))
+
+
+def load_snapshot(path: Path) -> dict:
+    """Read a plain (`.json`) or compact (`.ddz`) snapshot into plain dicts."""
+    data = Path(path).read_bytes()
+    if data[:4] == MAGIC:
+        return decode_compact(data)
+    return json.loads(data)
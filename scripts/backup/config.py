@@ -0,0 +1,26 @@
+"""
+Supabase project and on-disk locations shared by the backup scripts.
+Each can be overridden from the environment (DEGEN_SUPABASE_URL,
+DEGEN_KEY_FILE, DEGEN_BACKUP_DIR), e.g. to point a run at a local stand-in.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+SUPABASE_URL = os.environ.get("DEGEN_SUPABASE_URL", "https://lnnlabbdffowjpaxvnsp.supabase.co")
+KEY_FILE     = Path(os.environ.get(
+    "DEGEN_KEY_FILE", Path.home() / ".config" / "supabase" / "degen-dudes-service-role"))
+BACKUP_DIR   = Path(os.environ.get("DEGEN_BACKUP_DIR", Path.home() / "code" / "degen-dudes" / "backups"))
+
+
+def read_service_key() -> str:
+    """Read the Supabase service role key from disk (never log it)."""
+    try:
+        return KEY_FILE.read_text().strip()
+    except FileNotFoundError:
+        print(f"ERROR: Service role key not found at {KEY_FILE}", file=sys.stderr)
+        sys.exit(1)
+    except Exception as e:
+        print(f"ERROR reading service key: {e}", file=sys.stderr)
+        sys.exit(1)
@@ -0,0 +1,319 @@
+"""
+Incremental (delta) backups chained to the last full snapshot.
+
+A full snapshot (`scores-*.json` or `.ddz`) is the base of a chain. Each
+incremental run writes a small `delta-*.json` holding only what changed
+since the previous run:
+
+  * tables with an `updated_at`-style watermark column (scores) are queried
+    for rows changed since the stored high-water mark and recorded as
+    upserts, plus the ids of any deleted rows;
+  * the small tables without one (players, groups, …) are re-read in full
+    but only recorded when their content digest changed.
+
+Row deletions are detected from the table's current ids, read every run
+(one small page per few hundred rows): the ids minus the rows created since
+the last run must be exactly the ids of that run, which the state keeps as
+a count and an order-independent digest. Only when they are not is the
+previous state materialized to name the deleted rows, so a delete is never
+missed, even alongside an insert or when a new row's created_at lags the
+watermark.
+
+`backup-state.json` in the backup directory carries the chain head: the
+base snapshot, how many deltas follow it, and per-table watermarks,
+counts and digests (of content, or of the ids). Rows are re-read a minute
+behind the watermark; the versions already captured in that window are
+kept in the state so they are not recorded twice. After `rebase_every`
+deltas the next run takes a full snapshot and starts a new chain.
+"""
+
+import json
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from .fetch import (
+    DEFAULT_PAGE_SIZE,
+    DEFAULT_WORKERS,
+    RestClient,
+    fetch_table,
+    filter_param,
+    run_per_table,
+)
+from .compact import load_snapshot
+from .tables import primary_key, table_spec
+from .snapshot import (
+    WATERMARK_OVERLAP,
+    atomic_write_text,
+    keys_digest,
+    max_timestamp,
+    rows_digest,
+    snapshot_files,
+)
+
+STATE_FILE = "backup-state.json"
+DELTA_GLOB = "delta-*.json"
+DEFAULT_REBASE_EVERY = 16
+
+# Filenames carry trip-local wall time (MST, no DST in the Coachella Valley).
+FILE_TZ = timezone(timedelta(hours=-7))
+
+
+# ── State ─────────────────────────────────────────────────────────────────────
+
+def load_state(backup_dir: Path):
+    """Chain state, or None if there is no usable chain to extend."""
+    path = Path(backup_dir) / STATE_FILE
+    try:
+        state = json.loads(path.read_text())
+    except (FileNotFoundError, ValueError):
+        return None
+    if not (Path(backup_dir) / state.get("base", "")).is_file():
+        return None
+    return state
+
+
+def save_state(backup_dir: Path, state: dict) -> None:
+    atomic_write_text(Path(backup_dir) / STATE_FILE, json.dumps(state, indent=2))
+
+
+def state_from_full(snapshot_path: Path, timestamp: str, spools: dict) -> dict:
+    """Start a new chain from a freshly written full snapshot."""
+    tables = {}
+    for table, spool in spools.items():
+        entry = {"count": spool.count}
+        if spool.watermark_column:
+            entry["watermark_column"] = spool.watermark_column
+            entry["watermark"] = spool.watermark
+            entry["recent"] = spool.recent
+            entry["keys"] = spool.keys
+        else:
+            entry["digest"] = spool.digest
+        tables[table] = entry
+    return {
+        "base": Path(snapshot_path).name,
+        "base_timestamp": timestamp,
+        "last_timestamp": timestamp,
+        "deltas": 0,
+        "tables": tables,
+    }
+
+
+def needs_full(state, tables: list, rebase_every: int = DEFAULT_REBASE_EVERY) -> bool:
+    """True when the next run must be a full snapshot (no chain, rebase due, new tables)."""
+    if state is None or state["deltas"] >= rebase_every:
+        return True
+    return any(table not in state["tables"] for table in tables)
+
+
+# ── Fetching a delta ──────────────────────────────────────────────────────────
+
+def _since(watermark: str) -> str:
+    return (datetime.fromisoformat(watermark) - WATERMARK_OVERLAP).isoformat()
+
+
+def recent_versions(rows, column: str, watermark: str) -> dict:
+    """{id: version} for rows inside the overlap window below `watermark`."""
+    if watermark is None:
+        return {}
+    since = datetime.fromisoformat(_since(watermark))
+    return {
+        row["id"]: row[column] for row in rows
+        if row.get(column) and datetime.fromisoformat(row[column]) >= since
+    }
+
+
+def fetch_delta(client: RestClient, tables: list, state: dict, backup_dir: Path,
+                workers: int = DEFAULT_WORKERS, page_size: int = DEFAULT_PAGE_SIZE):
+    """
+    Fetch what changed in `tables` since the run recorded in `state`.
+
+    Returns (changes, new_table_state, timings). `changes` only has entries
+    for tables that changed: {"upsert": rows, "delete": ids} for watermarked
+    tables, {"replace": rows} for the rest.
+    """
+    previous = {}  # materialized on demand, shared by tables that need ids
+
+    def previous_ids(table, key):
+        if "bundle" not in previous:
+            previous["bundle"] = materialize(None, backup_dir)
+        return {row[key] for row in previous["bundle"].get(table, [])}
+
+    def fetch(table):
+        entry = dict(state["tables"][table])
+        column = entry.get("watermark_column")
+        spec = table_spec(table)
+        if not column:
+            rows = fetch_table(client, table, page_size, select=spec.select, order=spec.key)
+            digest = rows_digest(rows)
+            changed = digest != entry["digest"]
+            entry.update(count=len(rows), digest=digest)
+            return ({"replace": rows} if changed else None), entry
+
+        watermark = entry.get("watermark")
+        filters = (filter_param(column, "gte", _since(watermark)),) if watermark else ()
+        fetched = fetch_table(client, table, page_size, select=spec.select, filters=filters, order=spec.key)
+        current = {row[spec.key] for row in fetch_table(client, table, page_size, select=spec.key,
+                                                          order=spec.key)}
+
+        # Rows re-read inside the overlap window that were already captured
+        # (same id and version) are not changes.
+        seen = entry.get("recent", {})
+        rows = [row for row in fetched if seen.get(row["id"]) != row.get(column)]
+
+        # Without deletes, today's ids less the rows created since are the
+        # last run's ids. created_at only guesses which rows are new; a
+        # wrong guess fails the check and costs a diff, never a missed delete.
+        created = {
+            row[spec.key] for row in rows
+            if watermark is None or max_timestamp(watermark, row.get("created_at")) != watermark
+        }
+        before = current - created
+        deleted = []
+        if len(before) != entry["count"] or keys_digest(before) != entry.get("keys"):
+            deleted = sorted(previous_ids(table, spec.key) - current)
+
+        for row in rows:
+            watermark = max_timestamp(watermark, row.get(column))
+        entry.update(count=len(current), keys=keys_digest(current), watermark=watermark,
+                     recent=recent_versions(fetched, column, watermark))
+        change = {"upsert": rows, "delete": deleted} if rows or deleted else None
+        return change, entry
+
+    results, timings = run_per_table(tables, fetch, workers)
+    changes = {table: change for table, (change, _) in results.items() if change}
+    new_tables = {table: entry for table, (_, entry) in results.items()}
+    return changes, new_tables, timings
+
+
+def write_delta(backup_dir: Path, now: datetime, state: dict, changes: dict) -> Path:
+    """Write the next delta in the chain and return its path."""
+    seq = state["deltas"] + 1
+    delta = {
+        "backup_timestamp": now.isoformat(timespec="seconds"),
+        "base": state["base"],
+        "seq": seq,
+        "tables": changes,
+    }
+    path = Path(backup_dir) / now.strftime("delta-%Y-%m-%d-%H%M%S.json")
+    return atomic_write_text(path, json.dumps(delta, indent=2, default=str))
+
+
+# ── Materializing ─────────────────────────────────────────────────────────────
+
+def file_time(path: Path) -> datetime:
+    """
+    Backup time encoded in a `scores-YYYY-MM-DD-HHMM.json` or
+    `delta-YYYY-MM-DD-HHMMSS.json` filename.
+    """
+    stamp = Path(path).stem.split("-", 1)[1]
+    fmt = "%Y-%m-%d-%H%M%S" if len(stamp) == 17 else "%Y-%m-%d-%H%M"
+    return datetime.strptime(stamp, fmt).replace(tzinfo=FILE_TZ)
+
+
+def apply_delta(bundle: dict, delta: dict) -> dict:
+    """Apply one delta to a bundle in place (and return it)."""
+    for table, change in delta["tables"].items():
+        if "replace" in change:
+            bundle[table] = change["replace"]
+            continue
+        key = primary_key(table)
+        rows = {row[key]: row for row in bundle.get(table, [])}
+        for row_id in change.get("delete", []):
+            rows.pop(row_id, None)
+        for row in change.get("upsert", []):
+            rows[row[key]] = row
+        bundle[table] = list(rows.values())
+    bundle["backup_timestamp"] = delta["backup_timestamp"]
+    return bundle
+
+
+def _as_datetime(timestamp):
+    if timestamp is None or isinstance(timestamp, datetime):
+        return timestamp
+    return datetime.fromisoformat(timestamp)
+
+
+def delta_chain(timestamp, backup_dir: Path):
+    """
+    (base snapshot path, [deltas in order]) for the state as of `timestamp`
+    (datetime or ISO string; None means latest): the newest full snapshot
+    at or before it and that snapshot's deltas up to the same time.
+    """
+    backup_dir = Path(backup_dir)
+    at = _as_datetime(timestamp)
+
+    def not_after(path):
+        return at is None or file_time(path) <= at
+
+    bases = sorted((p for p in snapshot_files(backup_dir) if not_after(p)), key=file_time)
+    if not bases:
+        raise FileNotFoundError(f"no full snapshot at or before {timestamp} in {backup_dir}")
+    base = bases[-1]
+
+    chain = []
+    for path in backup_dir.glob(DELTA_GLOB):
+        if not not_after(path):
+            continue
+        delta = json.loads(path.read_text())
+        if delta["base"] == base.name and (at is None or _as_datetime(delta["backup_timestamp"]) <= at):
+            chain.append(delta)
+    return base, sorted(chain, key=lambda d: d["seq"])
+
+
+def materialize(timestamp, backup_dir: Path) -> dict:
+    """Rebuild the full bundle as of `timestamp` from its delta chain."""
+    base, chain = delta_chain(timestamp, backup_dir)
+    bundle = load_snapshot(base)
+    for delta in chain:
+        apply_delta(bundle, delta)
+    return bundle
+
+
+def _base_deltas(backup_dir: Path) -> dict:
+    """{base snapshot name: [(seq, path, delta), …] in seq order}."""
+    chains = {}
+    for path in Path(backup_dir).glob(DELTA_GLOB):
+        delta = json.loads(path.read_text())
+        chains.setdefault(delta["base"], []).append((delta["seq"], path, delta))
+    return {base: sorted(chain, key=lambda item: item[0]) for base, chain in chains.items()}
+
+
+def load_backup(path: Path) -> dict:
+    """The bundle a backup file stands for: a snapshot as is, a delta applied to its chain."""
+    path = Path(path)
+    if not path.match(DELTA_GLOB):
+        return load_snapshot(path)
+    head = json.loads(path.read_text())
+    bundle = load_snapshot(path.parent / head["base"])
+    for seq, _, delta in _base_deltas(path.parent).get(head["base"], []):
+        if seq <= head["seq"]:
+            apply_delta(bundle, delta)
+    return bundle
+
+
+def backup_states(backup_dir: Path):
+    """
+    Yield (path, bundle) for every backup state in `backup_dir`, oldest
+    first: each full snapshot, then the state after each of its deltas.
+    Consecutive bundles share the rows of tables a delta did not touch, so
+    only one snapshot's rows are held at a time; don't modify them.
+    """
+    chains = _base_deltas(backup_dir)
+    for base in sorted(snapshot_files(backup_dir), key=lambda p: (file_time(p), p.name)):
+        bundle = load_snapshot(base)
+        yield base, bundle
+        for _, path, delta in chains.get(base.name, []):
+            bundle = apply_delta(dict(bundle), delta)
+            yield path, bundle
+
+
+def prune_orphan_deltas(backup_dir: Path) -> None:
+    """Delete deltas whose base snapshot has been pruned."""
+    backup_dir = Path(backup_dir)
+    for path in backup_dir.glob(DELTA_GLOB):
+        try:
+            base = json.loads(path.read_text())["base"]
+        except (ValueError, KeyError):
+            continue
+        if not (backup_dir / base).is_file():
+            path.unlink(missing_ok=True)
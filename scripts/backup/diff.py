@@ -0,0 +1,95 @@
+"""
+Row-level diffs between backup bundles.
+
+Each table is indexed by primary key ({id: row}), so two snapshots are
+compared in one pass over each, and every difference comes out as a row
+added, a row removed, or a row changed (its newer version) with the
+columns that changed:
+
+    {"scores": {"added": [row, …],
+                "removed": [row, …],
+                "changed": [(row, {"gross_score": (6, 4), …}), …]}, …}
+
+`diff_states` walks a sequence of backup states oldest first and diffs each
+one against the one before it: every snapshot and delta in a backup dir
+(delta.backup_states), or given files (`diff_chain`). Only the previous
+state's index and the current bundle are held at once, so memory stays at
+two snapshots however long the chain is.
+"""
+
+from pathlib import Path
+
+from .delta import load_backup
+from .tables import primary_key
+
+
+def index_rows(table: str, rows: list) -> dict:
+    key = primary_key(table)
+    return {row[key]: row for row in rows}
+
+
+def column_changes(old: dict, new: dict) -> dict:
+    """{column: (old, new)} for every column whose value differs."""
+    return {
+        col: (old.get(col), new.get(col))
+        for col in old.keys() | new.keys()
+        if old.get(col) != new.get(col)
+    }
+
+
+def diff_index(old: dict, new: dict) -> dict:
+    """Diff two {id: row} indexes; empty lists when nothing changed."""
+    result = {"added": [], "removed": [], "changed": []}
+    for key, row in new.items():
+        before = old.get(key)
+        if before is None:
+            result["added"].append(row)
+        elif before != row:
+            result["changed"].append((row, column_changes(before, row)))
+    result["removed"] = [row for key, row in old.items() if key not in new]
+    return result
+
+
+def is_empty(table_diff: dict) -> bool:
+    return not (table_diff["added"] or table_diff["removed"] or table_diff["changed"])
+
+
+def index_bundle(bundle: dict, tables=None) -> dict:
+    return {
+        table: index_rows(table, rows)
+        for table, rows in bundle.items()
+        if table != "backup_timestamp" and (tables is None or table in tables)
+    }
+
+
+def _diff_indexes(old: dict, new: dict) -> dict:
+    result = {}
+    for table in [*old, *(t for t in new if t not in old)]:
+        table_diff = diff_index(old.get(table, {}), new.get(table, {}))
+        if not is_empty(table_diff):
+            result[table] = table_diff
+    return result
+
+
+def diff_bundles(old: dict, new: dict, tables=None) -> dict:
+    """{table: diff} for tables that differ between two bundles."""
+    return _diff_indexes(index_bundle(old, tables), index_bundle(new, tables))
+
+
+def diff_states(states, tables=None):
+    """Yield (older, newer, {table: diff}) for each consecutive pair of (label, bundle) in `states`."""
+    previous = previous_index = None
+    for label, bundle in states:
+        index = index_bundle(bundle, tables)
+        if previous is not None:
+            yield previous, label, _diff_indexes(previous_index, index)
+        previous, previous_index = label, index
+
+
+def diff_chain(paths, tables=None):
+    """
+    Yield (older, newer, {table: diff}) for each consecutive pair in `paths`
+    (snapshots, or deltas standing for their materialized state). Each file
+    is loaded once.
+    """
+    return diff_states(((Path(path), load_backup(path)) for path in paths), tables)
@@ -0,0 +1,281 @@
+"""
+In-process fake of the slice of PostgREST the backup scripts talk to:
+select/order/limit/offset, eq/gt/gte/lt/lte/in filters, `Prefer: count=exact`
+with Content-Range, HEAD counts, a max-rows cap, and bulk upserts
+(POST of a JSON array with `on_conflict`). Like PostgREST, a query naming a
+column the table does not have (its first row's keys) is answered 400.
+
+Used by the tests under tests/scripts/ and, as a local stand-in, by
+scripts/bench-backup.py: per-table latency, a bandwidth cap, a random
+error rate, and fixture tables with synthetic extra scores
+(`fixture_tables(path, scale=10)`). Run it standalone with
+
+    python3 scripts/backup/fake_postgrest.py --fixture backups/scores-2026-02-22-1718.json \
+        --scale 10 --latency 0.05 --bandwidth 2e6 --port 54321
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+import uuid
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qsl, urlsplit
+
+API_KEY = "test-key"
+CHUNK = 16 * 1024   # bytes written between bandwidth sleeps
+
+OPS = {
+    "eq": lambda a, b: a == b,
+    "gt": lambda a, b: a > b,
+    "gte": lambda a, b: a >= b,
+    "lt": lambda a, b: a < b,
+    "lte": lambda a, b: a <= b,
+}
+
+
+def _coerce(value, literal: str):
+    """Compare like Postgres would: timestamps as instants, numbers as numbers."""
+    if isinstance(value, bool) or value is None:
+        return value, literal
+    if isinstance(value, (int, float)):
+        return value, type(value)(literal)
+    try:
+        return datetime.fromisoformat(value), datetime.fromisoformat(literal)
+    except (TypeError, ValueError):
+        return value, literal
+
+
+def fixture_tables(path: Path, tables: list = None, scale: int = 1) -> dict:
+    """
+    {table: rows} from a backup snapshot. With scale > 1, `scores` gets
+    scale - 1 extra copies of every row under new (deterministic) ids.
+    """
+    bundle = json.loads(Path(path).read_text())
+    tables = tables or [t for t in bundle if t != "backup_timestamp"]
+    result = {t: bundle.get(t, []) for t in tables}
+    if scale > 1 and "scores" in result:
+        base = result["scores"]
+        result["scores"] = base + [
+            dict(row, id=str(uuid.uuid5(uuid.NAMESPACE_URL, f"{row['id']}/{copy}")))
+            for copy in range(1, scale)
+            for row in base
+        ]
+    return result
+
+
+class UnknownColumn(Exception):
+    """A query named a column the table does not have (PostgREST: 400, code 42703)."""
+
+
+class FakePostgrest:
+    """
+    Serve `tables` ({name: [rows]}) on 127.0.0.1; mutate `.tables` freely.
+    `latency` is seconds per request by table, `bandwidth` caps response
+    bytes/second, and `error_rate` answers that fraction of requests 503.
+    """
+
+    def __init__(self, tables: dict, latency: dict = None, max_rows: int = 1000,
+                 bandwidth: float = None, error_rate: float = 0.0, seed: int = 0, port: int = 0):
+        self.tables = tables
+        self.latency = latency or {}
+        self.max_rows = max_rows
+        self.bandwidth = bandwidth
+        self.error_rate = error_rate
+        self.fail_at = {}    # {table: n}: the n-th request for that table from now gets a 503
+        self.errors = 0
+        self._random = random.Random(seed)
+        self.requests = []   # (method, path) in arrival order
+        self.posts = []      # (table, row count) per POST
+        self.peers = set()   # client (host, port) pairs seen
+        self.bytes_sent = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _fail(self, table: str) -> bool:
+        with self._lock:
+            failed = self._random.random() < self.error_rate
+            if table in self.fail_at:
+                self.fail_at[table] -= 1
+                if self.fail_at[table] == 0:
+                    failed = True
+                    del self.fail_at[table]
+            self.errors += failed
+        return failed
+
+    # ── Query evaluation ──────────────────────────────────────────────────────
+
+    def query(self, table: str, params: list):
+        """Return (page, offset, total) for a parsed query string."""
+        rows = self.tables[table]
+        known = set(rows[0]) if rows else None   # an empty table can't tell
+
+        def check(column):
+            if known is not None and column not in known:
+                raise UnknownColumn(f"column {table}.{column} does not exist")
+            return column
+
+        select, order, limit, offset = "*", None, None, 0
+        for key, value in params:
+            if key not in ("select", "order", "limit", "offset"):
+                check(key)
+            if key == "select":
+                select = value
+            elif key == "order":
+                order = value
+            elif key == "limit":
+                limit = int(value)
+            elif key == "offset":
+                offset = int(value)
+            elif value.startswith("in."):
+                members = set(filter(None, value[3:].strip("()").split(",")))
+                rows = [r for r in rows if str(r.get(key)) in members]
+            else:
+                op, _, literal = value.partition(".")
+                rows = [
+                    r for r in rows
+                    if r.get(key) is not None and OPS[op](*_coerce(r.get(key), literal))
+                ]
+        if order:
+            column, _, direction = order.partition(".")   # e.g. "updated_at.desc.nullslast"
+            check(column)
+            rows = sorted(rows, key=lambda r: r[column], reverse=direction.startswith("desc"))
+        total = len(rows)
+        limit = min(limit if limit is not None else self.max_rows, self.max_rows)
+        page = rows[offset:offset + limit]
+        if select != "*":
+            columns = [check(c) for c in select.split(",")]
+            page = [{c: r.get(c) for c in columns} for r in page]
+        return page, offset, total
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive
+
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status: int, body: bytes, headers: dict = None, head: bool = False):
+                self.send_response(status)
+                for k, v in (headers or {}).items():
+                    self.send_header(k, v)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if head:
+                    return
+                if fake.bandwidth:
+                    for i in range(0, len(body), CHUNK):
+                        chunk = body[i:i + CHUNK]
+                        time.sleep(len(chunk) / fake.bandwidth)
+                        self.wfile.write(chunk)
+                else:
+                    self.wfile.write(body)
+                with fake._lock:
+                    fake.bytes_sent += len(body)
+
+            def _read(self, head: bool = False):
+                url = urlsplit(self.path)
+                table = url.path.rsplit("/", 1)[-1]
+                with fake._lock:
+                    fake.requests.append((self.command, self.path))
+                    fake.peers.add(self.client_address)
+                if self.headers.get("apikey") != API_KEY:
+                    return self._reply(401, b'{"message":"invalid api key"}', head=head)
+                if table not in fake.tables:
+                    return self._reply(404, b'{"message":"relation does not exist"}', head=head)
+                time.sleep(fake.latency.get(table, 0))
+                if fake._fail(table):
+                    return self._reply(503, b'{"message":"service unavailable"}', head=head)
+                try:
+                    page, offset, total = fake.query(table, parse_qsl(url.query))
+                except UnknownColumn as e:
+                    body = json.dumps({"code": "42703", "message": str(e)}).encode()
+                    return self._reply(400, body, head=head)
+                shown = total if "count=exact" in self.headers.get("Prefer", "") else "*"
+                span = f"{offset}-{offset + len(page) - 1}" if page else "*"
+                body = json.dumps(page).encode()
+                self._reply(200, body, {"Content-Range": f"{span}/{shown}"}, head=head)
+
+            def do_GET(self):
+                self._read()
+
+            def do_HEAD(self):
+                self._read(head=True)
+
+            def do_POST(self):
+                url = urlsplit(self.path)
+                table = url.path.rsplit("/", 1)[-1]
+                key = dict(parse_qsl(url.query)).get("on_conflict", "id")
+                rows = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                with fake._lock:
+                    fake.requests.append(("POST", self.path))
+                    fake.peers.add(self.client_address)
+                if self.headers.get("apikey") != API_KEY:
+                    return self._reply(401, b'{"message":"invalid api key"}')
+                if table not in fake.tables:
+                    return self._reply(404, b'{"message":"relation does not exist"}')
+                time.sleep(fake.latency.get(table, 0))
+                if fake._fail(table):
+                    return self._reply(503, b'{"message":"service unavailable"}')
+                with fake._lock:
+                    fake.posts.append((table, len(rows)))
+                    existing = {r[key]: i for i, r in enumerate(fake.tables[table])}
+                    for row in rows:
+                        if row[key] in existing:
+                            fake.tables[table][existing[row[key]]].update(row)
+                        else:
+                            fake.tables[table].append(dict(row))
+                self._reply(201, b"")
+
+        return Handler
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Serve a backup snapshot as a local PostgREST stand-in.")
+    parser.add_argument("--fixture", type=Path, required=True, help="backup snapshot to serve")
+    parser.add_argument("--scale", type=int, default=1, help="multiply the scores table (e.g. 10, 100)")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every request")
+    parser.add_argument("--bandwidth", type=float, default=None, help="response bytes per second")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered 503")
+    parser.add_argument("--max-rows", type=int, default=1000)
+    parser.add_argument("--port", type=int, default=54321)
+    args = parser.parse_args(argv)
+
+    tables = fixture_tables(args.fixture, scale=args.scale)
+    server = FakePostgrest(
+        tables, latency={t: args.latency for t in tables}, max_rows=args.max_rows,
+        bandwidth=args.bandwidth, error_rate=args.error_rate, port=args.port,
+    )
+    print(f"Serving {', '.join(f'{t} {len(r)}' for t, r in tables.items())} "
+          f"at {server.url} (apikey {API_KEY})")
+    server._server.serve_forever()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,362 @@
+"""
+Concurrent fetch engine for the Supabase REST (PostgREST) API.
+
+Tables are fetched in parallel on a bounded worker pool, and every worker
+borrows a keep-alive HTTP connection from a shared pool, so a backup pays
+for one TLS handshake per connection instead of one per table. Rows are
+read in keyset pages (ordered by the primary key, each starting past the
+last key read) so PostgREST's max-rows cap cannot silently truncate a
+table and concurrent writes cannot shift rows between pages, and a caller
+can stream pages to disk one at a time.
+
+Failed requests (network errors, 429 and 5xx) are retried with exponential
+backoff. With `spool_tables(..., resume=True)` every page is checkpointed
+in the staging dir, so a failed run leaves the tables and pages it already
+has behind and the next run fetches only what is missing.
+
+With a RunMetrics on `client.metrics` (backup/metrics.py), every request
+records its connect, time-to-first-byte and download time, and every page
+its JSON decode time.
+"""
+
+import http.client
+import json
+import queue
+import random
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from pathlib import Path
+from urllib.parse import quote, urlsplit
+
+from .checkpoint import read_checkpoint, write_checkpoint
+from .snapshot import TableSpool
+from .tables import table_spec
+
+DEFAULT_WORKERS = 8
+DEFAULT_TIMEOUT = 30
+DEFAULT_PAGE_SIZE = 500   # keep at or below the project's PostgREST max-rows (1000)
+DEFAULT_RETRIES = 4       # per request, after the first attempt
+DEFAULT_BACKOFF = 0.5     # seconds before the first retry; doubles each time
+MAX_BACKOFF = 30.0
+
+# Statuses worth retrying: rate limiting and transient server/gateway errors.
+RETRY_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+
+# Errors that mean a pooled keep-alive connection went stale between requests.
+STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.CannotSendRequest,
+    ConnectionResetError,
+    BrokenPipeError,
+)
+
+
+class RestError(Exception):
+    """Non-2xx response from the REST API."""
+
+    def __init__(self, status: int, body: str):
+        super().__init__(f"HTTP {status} — {body[:200]}")
+        self.status = status
+        self.body = body
+
+
+class ConnectionPool:
+    """Fixed-size pool of keep-alive connections to a single host."""
+
+    def __init__(self, base_url: str, size: int = DEFAULT_WORKERS, timeout: float = DEFAULT_TIMEOUT):
+        parts = urlsplit(base_url)
+        self.scheme = parts.scheme
+        self.host = parts.hostname
+        self.port = parts.port
+        self.base_path = parts.path.rstrip("/")
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._slots = queue.Queue()
+        for _ in range(size):
+            self._slots.put(None)
+
+    def _connect(self) -> http.client.HTTPConnection:
+        cls = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+        return cls(self.host, self.port, timeout=self.timeout)
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection; it goes back to the pool unless it failed."""
+        self._slots.get()
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+        healthy = False
+        try:
+            yield conn
+            healthy = True
+        finally:
+            if healthy:
+                self._idle.put(conn)
+            else:
+                conn.close()
+            self._slots.put(None)
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class RestClient:
+    """Minimal PostgREST client authenticating with the service role key."""
+
+    def __init__(self, base_url: str, key: str, pool_size: int = DEFAULT_WORKERS,
+                 timeout: float = DEFAULT_TIMEOUT, retries: int = DEFAULT_RETRIES,
+                 backoff: float = DEFAULT_BACKOFF):
+        self.pool = ConnectionPool(base_url, size=pool_size, timeout=timeout)
+        self.retries = retries
+        self.backoff = backoff
+        self.metrics = None   # a backup.metrics.RunMetrics while a run is being measured
+        self._headers = {
+            "apikey": key,
+            "Authorization": f"Bearer {key}",
+            "Accept": "application/json",
+        }
+
+    def request(self, method: str, path: str, body: bytes = None, headers: dict = None):
+        """
+        Send one request and return (status, headers, body bytes). Network
+        errors and RETRY_STATUSES are retried up to `retries` times, waiting
+        backoff, 2×backoff, 4×backoff… (with jitter) in between.
+        """
+        all_headers = dict(self._headers)
+        all_headers.update(headers or {})
+        url = f"{self.pool.base_path}{path}"
+        attempt = 0
+        while True:
+            try:
+                return self._send(method, url, body, all_headers)
+            except (RestError, OSError, http.client.HTTPException) as e:
+                if attempt >= self.retries or (isinstance(e, RestError) and e.status not in RETRY_STATUSES):
+                    raise
+            delay = min(self.backoff * 2 ** attempt, MAX_BACKOFF)
+            time.sleep(delay * random.uniform(0.5, 1.0))
+            attempt += 1
+
+    def _send(self, method: str, url: str, body: bytes, headers: dict):
+        for attempt in (1, 2):
+            with self.pool.connection() as conn:
+                connect = 0.0
+                if conn.sock is None:
+                    started = time.perf_counter()
+                    conn.connect()   # DNS, TCP and TLS; skipped on a reused keep-alive connection
+                    connect = time.perf_counter() - started
+                connected = time.perf_counter()
+                try:
+                    conn.request(method, url, body=body, headers=headers)
+                    resp = conn.getresponse()
+                except STALE_CONNECTION_ERRORS:
+                    # The server closed an idle keep-alive socket; retry once on a fresh one.
+                    if attempt == 2:
+                        raise
+                    conn.close()
+                    continue
+                first_byte = time.perf_counter()
+                data = resp.read()
+                resp_headers = {k.lower(): v for k, v in resp.getheaders()}
+                if resp.will_close:
+                    conn.close()
+            if self.metrics is not None:
+                self.metrics.request(method, url, resp.status, connect, first_byte - connected,
+                                     time.perf_counter() - first_byte, len(data))
+            if resp.status >= 300:
+                raise RestError(resp.status, data.decode("utf-8", errors="replace"))
+            return resp.status, resp_headers, data
+
+    def get(self, path: str, headers: dict = None):
+        return self.request("GET", path, headers=headers)
+
+    def close(self) -> None:
+        self.pool.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _report(table: str, e: Exception) -> None:
+    if isinstance(e, RestError):
+        print(f"ERROR fetching {table}: HTTP {e.status} — {e.body[:200]}", file=sys.stderr)
+    else:
+        print(f"ERROR fetching {table}: {e}", file=sys.stderr)
+
+
+def _content_total(headers: dict):
+    """Total row count from a `Content-Range: 0-499/1234` header, if present."""
+    match = re.search(r"/(\d+)$", headers.get("content-range", ""))
+    return int(match.group(1)) if match else None
+
+
+def filter_param(column: str, op: str, value) -> str:
+    """One PostgREST filter, e.g. filter_param("updated_at", "gte", ts)."""
+    return f"{column}={op}.{quote(str(value), safe='')}"
+
+
+def iter_table_pages(client: RestClient, table: str, page_size: int = DEFAULT_PAGE_SIZE,
+                     order: str = "id", select: str = "*", filters: tuple = (), after=None):
+    """
+    Yield a table's rows one page at a time in `order` (a unique column),
+    each page starting past the last `order` value of the one before, so
+    rows inserted or deleted during a long read are neither skipped nor
+    read twice. `filters` are extra query parameters built with
+    filter_param(); `after` starts past that value (resuming a
+    checkpointed table).
+
+    The first page asks for an exact count, which tells a short page at
+    the end of the table from one cut short by PostgREST's max-rows cap.
+    """
+    total = None
+    read = 0
+    try:
+        while True:
+            keyset = (filter_param(order, "gt", after),) if after is not None else ()
+            query = "&".join([f"select={select}", *filters, *keyset, f"order={order}.asc"])
+            _, resp_headers, body = client.get(
+                f"/rest/v1/{table}?{query}&limit={page_size}",
+                headers={"Prefer": "count=exact"} if read == 0 else None,
+            )
+            if read == 0:
+                total = _content_total(resp_headers)
+            started = time.perf_counter()
+            page = json.loads(body.decode("utf-8"))
+            if client.metrics is not None:
+                client.metrics.decode(table, time.perf_counter() - started, len(page))
+            if not page:
+                return
+            yield page
+            read += len(page)
+            after = page[-1][order]
+            if len(page) < page_size and (total is None or read >= total):
+                return
+    except Exception as e:
+        _report(table, e)
+        raise
+
+
+def fetch_table(client: RestClient, table: str, page_size: int = DEFAULT_PAGE_SIZE,
+                select: str = "*", filters: tuple = (), order: str = "id") -> list:
+    """Fetch all rows from a Supabase REST table."""
+    rows = []
+    for page in iter_table_pages(client, table, page_size, order=order, select=select, filters=filters):
+        rows.extend(page)
+    return rows
+
+
+def count_rows(client: RestClient, table: str, filters: tuple = ()) -> int:
+    """Exact row count via a HEAD request; no rows cross the wire."""
+    query = "&".join([f"select={table_spec(table).key}", *filters])
+    try:
+        _, headers, _ = client.request("HEAD", f"/rest/v1/{table}?{query}",
+                                       headers={"Prefer": "count=exact"})
+    except Exception as e:
+        _report(table, e)
+        raise
+    total = _content_total(headers)
+    if total is None:
+        raise RestError(200, f"no row count in Content-Range for {table}")
+    return total
+
+
+def run_per_table(tables: list, fn, workers: int = DEFAULT_WORKERS, fail_fast: bool = True):
+    """
+    Call `fn(table)` for every table on a bounded worker pool.
+
+    Returns (results, timings) keyed by table in `tables` order, timings
+    being the wall time in seconds each call took. The first failure
+    cancels any table that has not started yet and is re-raised; with
+    fail_fast=False the other tables still run before it is raised.
+    """
+    def timed(table):
+        start = time.perf_counter()
+        result = fn(table)
+        return result, time.perf_counter() - start
+
+    done = {}
+    failure = None
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(tables)))) as pool:
+        futures = {pool.submit(timed, table): table for table in tables}
+        try:
+            for fut in as_completed(futures):
+                try:
+                    done[futures[fut]] = fut.result()
+                except Exception as e:
+                    if fail_fast:
+                        raise
+                    failure = failure or e
+        except BaseException:
+            for fut in futures:
+                fut.cancel()
+            raise
+    if failure is not None:
+        raise failure
+
+    results = {table: done[table][0] for table in tables}
+    timings = {table: done[table][1] for table in tables}
+    return results, timings
+
+
+def fetch_tables(client: RestClient, tables: list, workers: int = DEFAULT_WORKERS,
+                 page_size: int = DEFAULT_PAGE_SIZE):
+    """Fetch `tables` in parallel into memory. Returns (data, timings)."""
+    return run_per_table(tables, lambda table: fetch_table(client, table, page_size, order=table_spec(table).key),
+                         workers)
+
+
+def spool_tables(client: RestClient, tables: list, staging_dir: Path,
+                 workers: int = DEFAULT_WORKERS, page_size: int = DEFAULT_PAGE_SIZE,
+                 watermarks: dict = None, resume: bool = False, filters: dict = None):
+    """
+    Stream `tables` in parallel, page by page, into TableSpools under
+    `staging_dir` without holding whole tables in memory. Each table is
+    read with its registry projection and keyed on its primary key (see
+    tables.py). `watermarks` maps a table to the column whose max value its
+    spool should track; `filters` maps a table to extra filter params.
+    Returns (spools, timings).
+
+    With `resume`, each page is checkpointed as it lands, tables already
+    complete in `staging_dir` are not fetched again, a partly fetched table
+    continues after its last checkpointed id, and one table failing does
+    not stop the others.
+    """
+    watermarks = watermarks or {}
+    filters = filters or {}
+
+    def spool(table):
+        spec = table_spec(table)
+        checkpoint = read_checkpoint(staging_dir, table) if resume else None
+        if checkpoint is None:
+            out, after = TableSpool(staging_dir, table, watermark=watermarks.get(table)), None
+        else:
+            out = TableSpool(staging_dir, table, watermark=watermarks.get(table),
+                             resume_bytes=checkpoint["bytes"])
+            if checkpoint["done"]:
+                out.close()
+                return out
+            after = checkpoint["last"]
+        try:
+            for page in iter_table_pages(client, table, page_size, order=spec.key, select=spec.select,
+                                         filters=filters.get(table, ()), after=after):
+                out.add(page)
+                if resume:
+                    write_checkpoint(staging_dir, table, out.checkpoint(), page[-1][spec.key])
+            if resume:
+                write_checkpoint(staging_dir, table, out.checkpoint(), done=True)
+        finally:
+            out.close()
+        return out
+
+    return run_per_table(tables, spool, workers, fail_fast=not resume)
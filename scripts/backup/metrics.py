@@ -0,0 +1,155 @@
+"""
+Timing spans for one backup run, written out for run-over-run graphs.
+
+A RunMetrics is attached to the RestClient for the length of a run
+(client.metrics), so every request records its connect, time-to-first-byte
+and download time and every page its JSON decode time; the backup script
+adds spans for writing the backup and pruning. At the end of the run:
+
+  write_jsonl()     appends the run's per-table and per-step spans to the
+                    metrics log, one JSON line each; per-request and
+                    per-page spans too when asked for or when the run
+                    failed. The log is rotated to `<name>.1` once it
+                    reaches max_bytes, so a daemon never grows it forever.
+  write_textfile()  replaces a Prometheus textfile (node_exporter's textfile
+                    collector) with the run's per-table and per-step totals
+
+Connect time covers DNS, TCP and TLS; it is zero for a request that reused
+a pooled keep-alive connection.
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from .snapshot import atomic_write_text
+
+PHASES = ("connect", "ttfb", "download", "decode")
+DETAIL_SPANS = ("request", "decode")   # one per request / page: only logged on request or failure
+DEFAULT_LOG_BYTES = 4 * 1024 * 1024
+
+
+def table_of(path: str) -> str:
+    """The table a /rest/v1/<table>?… request path reads."""
+    return path.rsplit("/rest/v1/", 1)[-1].split("?", 1)[0]
+
+
+class RunMetrics:
+    """Spans and per-table totals for one run; safe to record from fetch threads."""
+
+    def __init__(self, kind: str = "full", clock=time.time):
+        self.kind = kind
+        self.started = clock()
+        self.spans = []
+        self.tables = {}
+        self.steps = {}
+        self._lock = threading.Lock()
+        self._t0 = time.perf_counter()
+
+    def _add(self, span: dict) -> None:
+        span["at"] = round(time.perf_counter() - self._t0, 6)
+        with self._lock:
+            self.spans.append(span)
+
+    def _table(self, table: str) -> dict:
+        return self.tables.setdefault(table, dict.fromkeys(("requests", "rows", "bytes", *PHASES), 0))
+
+    def request(self, method: str, path: str, status: int, connect: float, ttfb: float,
+                download: float, nbytes: int) -> None:
+        """One HTTP request (each retry attempt counts as its own)."""
+        table = table_of(path)
+        self._add({"span": "request", "method": method, "table": table, "status": status,
+                   "connect_s": round(connect, 6), "ttfb_s": round(ttfb, 6),
+                   "download_s": round(download, 6), "bytes": nbytes})
+        with self._lock:
+            totals = self._table(table)
+            totals["requests"] += 1
+            totals["bytes"] += nbytes
+            totals["connect"] += connect
+            totals["ttfb"] += ttfb
+            totals["download"] += download
+
+    def decode(self, table: str, seconds: float, rows: int) -> None:
+        """One page parsed from JSON."""
+        self._add({"span": "decode", "table": table, "seconds": round(seconds, 6), "rows": rows})
+        with self._lock:
+            totals = self._table(table)
+            totals["decode"] += seconds
+            totals["rows"] += rows
+
+    def tables_fetched(self, timings: dict) -> None:
+        """Wall time per table, as run_per_table reports it."""
+        for table, seconds in timings.items():
+            self._add({"span": "table", "table": table, "seconds": round(seconds, 6),
+                       **{k: v for k, v in self._table(table).items() if k in ("requests", "rows", "bytes")}})
+            self._table(table)["seconds"] = seconds
+
+    @contextmanager
+    def span(self, step: str, **fields):
+        """Time a step of the run (fetch, write, prune…); repeated steps add up."""
+        start = time.perf_counter()
+        try:
+            yield fields
+        finally:
+            seconds = time.perf_counter() - start
+            self._add({"span": step, "seconds": round(seconds, 6), **fields})
+            with self._lock:
+                self.steps[step] = self.steps.get(step, 0.0) + seconds
+
+    def write_jsonl(self, path: Path, result: int, detail: bool = False,
+                    max_bytes: int = DEFAULT_LOG_BYTES) -> None:
+        """
+        Append this run's spans, then a `run` line, to a JSON-lines log.
+        Request and page spans are left out unless `detail` or the run
+        failed. A log already `max_bytes` long is first moved to `<name>.1`.
+        """
+        path = Path(path)
+        run = time.strftime("%Y-%m-%dT%H:%M:%S%z", time.localtime(self.started))
+        detail = detail or result != 0
+        lines = [json.dumps({"run": run, **span}) for span in self.spans
+                 if detail or span["span"] not in DETAIL_SPANS]
+        lines.append(json.dumps({"run": run, "span": "run", "kind": self.kind, "result": result,
+                                 "seconds": round(time.perf_counter() - self._t0, 6)}))
+        try:
+            if path.stat().st_size >= max_bytes:
+                os.replace(path, path.with_name(path.name + ".1"))
+        except FileNotFoundError:
+            pass
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+
+    def textfile(self, result: int) -> str:
+        """The run in Prometheus text exposition format."""
+        out = []
+
+        def metric(name: str, help_text: str, samples: list) -> None:
+            out.append(f"# HELP degen_backup_{name} {help_text}")
+            out.append(f"# TYPE degen_backup_{name} gauge")
+            for labels, value in samples:
+                label_text = ",".join(f'{k}="{v}"' for k, v in labels.items())
+                out.append(f"degen_backup_{name}{{{label_text}}} {value:g}" if labels
+                           else f"degen_backup_{name} {value:g}")
+
+        tables = sorted(self.tables.items())
+        metric("last_run_timestamp_seconds", "Start of the last backup run.", [({}, self.started)])
+        metric("last_run_success", "1 if the last backup run succeeded.", [({"kind": self.kind}, result == 0)])
+        metric("run_seconds", "Wall time of the last backup run.",
+               [({"kind": self.kind}, time.perf_counter() - self._t0)])
+        metric("step_seconds", "Wall time per step of the last run.",
+               [({"step": step}, seconds) for step, seconds in sorted(self.steps.items())])
+        metric("table_seconds", "Wall time fetching each table.",
+               [({"table": t}, v.get("seconds", 0.0)) for t, v in tables])
+        metric("table_phase_seconds", "Request time per table, summed over its requests, by phase.",
+               [({"table": t, "phase": phase}, v[phase]) for t, v in tables for phase in PHASES])
+        metric("table_requests", "HTTP requests per table, retries included.",
+               [({"table": t}, v["requests"]) for t, v in tables])
+        metric("table_rows", "Rows fetched per table.", [({"table": t}, v["rows"]) for t, v in tables])
+        metric("table_bytes", "Response body bytes per table.", [({"table": t}, v["bytes"]) for t, v in tables])
+        return "\n".join(out) + "\n"
+
+    def write_textfile(self, path: Path, result: int) -> None:
+        """Replace `path` atomically, so the collector never reads half a file."""
+        atomic_write_text(path, self.textfile(result))
@@ -0,0 +1,107 @@
+"""
+Replay a backup bundle into PostgREST with batched upserts.
+
+Tables are restored parents first (players/courses → groups →
+group_players → matches → match_players → scores), so every foreign key
+already exists when its child rows arrive. Within a table, rows are sent
+as JSON-array POSTs with `Prefer: resolution=merge-duplicates` in batches
+of `batch_size`, several batches in flight at once.
+
+Before writing, each table is read back and diffed against the snapshot,
+so only missing or changed rows are sent. A dry run stops after the diff.
+Rows that exist on the server but not in the snapshot are reported and
+left alone: a restore never deletes.
+"""
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from .fetch import DEFAULT_PAGE_SIZE, DEFAULT_WORKERS, RestClient, fetch_table
+from .tables import primary_key, table_spec
+
+DEFAULT_BATCH_SIZE = 200
+
+
+def restore_order(tables: list) -> list:
+    """`tables` sorted so parents come before children, otherwise stable."""
+    ordered, placed = [], set()
+    pending = list(tables)
+    while pending:
+        for table in pending:
+            parents = [p for p in table_spec(table).parents if p in tables]
+            if all(p in placed for p in parents):
+                break
+        else:
+            raise ValueError(f"foreign-key cycle among {pending}")
+        ordered.append(table)
+        placed.add(table)
+        pending.remove(table)
+    return ordered
+
+
+def diff_table(table: str, current: list, wanted: list) -> dict:
+    """
+    Compare server rows with snapshot rows by primary key.
+    Returns {"insert": rows, "update": rows, "unchanged": n, "extra": keys}.
+    """
+    key = primary_key(table)
+    on_server = {row[key]: row for row in current}
+    diff = {"insert": [], "update": [], "unchanged": 0, "extra": []}
+    for row in wanted:
+        existing = on_server.pop(row[key], None)
+        if existing is None:
+            diff["insert"].append(row)
+        elif any(existing.get(col) != value for col, value in row.items()):
+            diff["update"].append(row)
+        else:
+            diff["unchanged"] += 1
+    diff["extra"] = sorted(on_server)
+    return diff
+
+
+def upsert_rows(client: RestClient, table: str, rows: list,
+                batch_size: int = DEFAULT_BATCH_SIZE, workers: int = DEFAULT_WORKERS) -> int:
+    """Upsert `rows` in parallel batches; returns the number of batches sent."""
+    batches = [rows[i:i + batch_size] for i in range(0, len(rows), batch_size)]
+    headers = {
+        "Content-Type": "application/json",
+        "Prefer": "resolution=merge-duplicates,return=minimal",
+    }
+    path = f"/rest/v1/{table}?on_conflict={primary_key(table)}"
+
+    def send(batch):
+        body = json.dumps(batch, default=str).encode("utf-8")
+        client.request("POST", path, body=body, headers=headers)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(batches) or 1))) as pool:
+        list(pool.map(send, batches))
+    return len(batches)
+
+
+def restore_bundle(client: RestClient, bundle: dict, dry_run: bool = False,
+                   batch_size: int = DEFAULT_BATCH_SIZE, workers: int = DEFAULT_WORKERS,
+                   only_changed: bool = True, page_size: int = DEFAULT_PAGE_SIZE,
+                   report=None) -> dict:
+    """
+    Restore every table in `bundle`, parents first.
+    Returns {table: diff} (see diff_table); `report(table, diff)` is called
+    as each table finishes. With only_changed=False the diff is skipped and
+    every row is sent.
+    """
+    tables = restore_order([t for t in bundle if t != "backup_timestamp"])
+    results = {}
+    for table in tables:
+        rows = bundle[table]
+        if only_changed or dry_run:
+            spec = table_spec(table)
+            current = fetch_table(client, table, page_size, select=spec.select, order=spec.key)
+            diff = diff_table(table, current, rows)
+        else:
+            diff = {"insert": [], "update": list(rows), "unchanged": 0, "extra": []}
+        if not dry_run:
+            diff["batches"] = upsert_rows(client, table, diff["insert"] + diff["update"],
+                                          batch_size, workers)
+        results[table] = diff
+        if report:
+            report(table, diff)
+    return results
@@ -0,0 +1,148 @@
+"""
+Grandfather-father-son retention for full snapshots.
+
+Snapshots younger than `keep_all` are all kept; up to `hourly` old, the
+first snapshot of each hour is kept; older than that, the first of each
+day. The newest snapshot and the current chain base are always kept, and
+so is the oldest, so history always has a full state to start from.
+
+A snapshot that loses its slot is not simply deleted. It is folded into a
+delta against the state just before it, in the chain of the nearest kept
+snapshot before it, and any deltas chained to it move to that survivor:
+
+    scores-0800  delta(0900 ← folded scores-0900)  delta-0930  scores-1200
+       kept         upserts/deletes vs. 08:00      rebased      kept
+
+so `materialize()` still rebuilds every point in time (rows keyed the same,
+order not guaranteed) at the cost of the rows that changed. A snapshot
+identical to the state before it folds into nothing and is just removed.
+Ages come from the timestamps in file names; no file is stat'ed.
+"""
+
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import NamedTuple
+
+from .compact import load_snapshot
+from .delta import DELTA_GLOB, STATE_FILE, apply_delta, file_time
+from .diff import diff_bundles
+from .snapshot import atomic_write_text, snapshot_files
+from .tables import primary_key
+
+
+class RetentionPolicy(NamedTuple):
+    keep_all: timedelta = timedelta(hours=6)
+    hourly: timedelta = timedelta(days=2)
+
+
+def choose_survivors(times: dict, now, policy: RetentionPolicy, pinned=()) -> set:
+    """
+    Names to keep from `times` ({name: datetime}): everything inside
+    keep_all, then the first per hour, then the first per day, plus the
+    oldest, the newest and anything in `pinned`.
+    """
+    ordered = sorted(times, key=lambda name: (times[name], name))
+    keep = set(pinned) & set(times)
+    if ordered:
+        keep.update((ordered[0], ordered[-1]))
+    buckets = set()
+    for name in ordered:
+        age = now - times[name]
+        if age <= policy.keep_all:
+            keep.add(name)
+            continue
+        at = times[name]
+        bucket = (at.date(), at.hour) if age <= policy.hourly else (at.date(),)
+        if bucket not in buckets:
+            buckets.add(bucket)
+            keep.add(name)
+    return keep
+
+
+def fold_delta(before: dict, after: dict) -> dict:
+    """Per-table {"upsert", "delete"} changes turning `before` into `after`."""
+    tables = {}
+    for table, diff in diff_bundles(before, after).items():
+        if table not in after:
+            continue
+        key = primary_key(table)
+        tables[table] = {
+            "upsert": diff["added"] + [row for row, _ in diff["changed"]],
+            "delete": [row[key] for row in diff["removed"]],
+        }
+    return tables
+
+
+def _delta_name(at, taken: set) -> str:
+    while True:
+        name = at.strftime("delta-%Y-%m-%d-%H%M%S.json")
+        if name not in taken:
+            return name
+        at += timedelta(seconds=1)
+
+
+def apply_retention(backup_dir: Path, now, policy: RetentionPolicy = RetentionPolicy()):
+    """
+    Thin the snapshots in `backup_dir` to `policy`, folding the dropped ones
+    into deltas. Returns (snapshots_folded, bytes_freed).
+    """
+    backup_dir = Path(backup_dir)
+    snapshots = {p.name: p for p in snapshot_files(backup_dir)}
+    times = {name: file_time(path) for name, path in snapshots.items()}
+    pinned = ()
+    try:
+        pinned = (json.loads((backup_dir / STATE_FILE).read_text())["base"],)
+    except (FileNotFoundError, ValueError, KeyError):
+        pass
+    keep = choose_survivors(times, now, policy, pinned)
+    if len(keep) == len(snapshots):
+        return 0, 0
+
+    deltas = {}   # base name → [(time, path, delta)]
+    for path in backup_dir.glob(DELTA_GLOB):
+        delta = json.loads(path.read_text())
+        when = datetime.fromisoformat(delta["backup_timestamp"])
+        deltas.setdefault(delta["base"], []).append((when, path, delta))
+    taken = {path.name for chain in deltas.values() for _, path, _ in chain}
+
+    def in_order(chain):
+        return sorted(chain, key=lambda entry: (entry[0], entry[2]["seq"]))
+
+    # Walk history oldest first, carrying the full state at each point.
+    state, anchor, dirty = None, None, set()
+    for name in sorted(snapshots, key=lambda n: (times[n], n)):
+        bundle = load_snapshot(snapshots[name])
+        own = deltas.pop(name, [])
+        if name in keep:
+            anchor = name
+            deltas[name] = own
+        else:
+            changes = fold_delta(state, bundle)
+            if changes:
+                out = backup_dir / _delta_name(times[name], taken)
+                taken.add(out.name)
+                dirty.add(out)
+                delta = {"backup_timestamp": bundle["backup_timestamp"], "base": anchor,
+                         "seq": 0, "folded": name, "tables": changes}
+                deltas[anchor].append((times[name], out, delta))
+            for _, path, delta in own:
+                delta["base"] = anchor
+                dirty.add(path)
+            deltas[anchor].extend(own)
+        state = bundle
+        for _, _, delta in in_order(own):
+            apply_delta(state, delta)
+
+    # Rewrite the chains that changed (seq in time order), then drop the snapshots.
+    for base in keep:
+        for seq, (_, path, delta) in enumerate(in_order(deltas.get(base, [])), start=1):
+            if delta["seq"] != seq or path in dirty:
+                delta["seq"] = seq
+                atomic_write_text(path, json.dumps(delta, indent=2, default=str))
+    folded = freed = 0
+    for name in set(snapshots) - keep:
+        freed += snapshots[name].stat().st_size
+        snapshots[name].unlink()
+        folded += 1
+    return folded, freed
@@ -0,0 +1,242 @@
+"""
+Streaming writer for backup snapshot files.
+
+A snapshot is the same document the backup script has always written,
+`json.dumps(bundle, indent=2, default=str)`, but produced incrementally:
+each table's pages are serialized into a spool file as they arrive, the
+spools are copied into a temp file in table order, and the temp file is
+renamed over the final name. Peak memory is about one page per table being
+fetched, regardless of table size, and a crashed run never leaves a
+half-written snapshot behind.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+ROW_INDENT = "    "   # rows sit two levels deep: bundle → table list → row
+SNAPSHOT_PATTERNS = ("scores-*.json", "scores-*.ddz")
+
+# Incremental runs re-read rows this far behind the watermark: updated_at is
+# set at transaction start, so a slow transaction can commit an older value.
+WATERMARK_OVERLAP = timedelta(seconds=60)
+
+
+def snapshot_files(backup_dir: Path) -> list:
+    """Full snapshot files (plain `.json` and compact `.ddz`) in `backup_dir`."""
+    backup_dir = Path(backup_dir)
+    return [p for pattern in SNAPSHOT_PATTERNS for p in backup_dir.glob(pattern)]
+
+
+def encode_row(row: dict) -> str:
+    """One row exactly as `json.dumps(bundle, indent=2, default=str)` lays it out."""
+    return ROW_INDENT + json.dumps(row, indent=2, default=str).replace("\n", "\n" + ROW_INDENT)
+
+
+def encode_table(rows: list) -> str:
+    """A table's JSON array as it appears in a snapshot."""
+    if not rows:
+        return "[]"
+    return "[\n" + ",\n".join(encode_row(row) for row in rows) + "\n  ]"
+
+
+def rows_digest(rows) -> str:
+    """Content hash of a table's rows, as tracked by TableSpool.digest."""
+    h = hashlib.sha256()
+    for row in rows:
+        h.update(encode_row(row).encode("utf-8"))
+    return h.hexdigest()
+
+
+def keys_digest(keys) -> str:
+    """
+    Order-independent hash of a set of row ids (XOR of their hashes), so a
+    set can be checked against a stored digest without being stored itself.
+    """
+    acc = 0
+    for key in keys:
+        acc ^= int.from_bytes(hashlib.blake2b(str(key).encode("utf-8"), digest_size=8).digest(), "big")
+    return f"{acc:016x}"
+
+
+class TableSpool:
+    """
+    Serialized rows of one table, appended page by page to a temp file.
+    Also keeps the row count, a content digest, and for incremental backups
+    the max value seen in the `watermark` column (e.g. "updated_at"), the
+    {id: version} of rows within WATERMARK_OVERLAP of that max, and a
+    keys_digest() of the ids.
+
+    `resume_bytes` reopens a checkpointed spool: the file is cut back to
+    that size (a page written after the last checkpoint is dropped), its
+    rows are replayed into the count/digest/watermark, and new pages append.
+    """
+
+    def __init__(self, staging_dir: Path, table: str, watermark: str = None, resume_bytes: int = 0):
+        self.table = table
+        self.path = Path(staging_dir) / f"{table}.part"
+        self.count = 0
+        self.watermark_column = watermark
+        self.watermark = None
+        self._recent = {}
+        self._keys = 0
+        self._hash = hashlib.sha256()
+        if resume_bytes:
+            self._replay(resume_bytes)
+            self._fh = open(self.path, "a", encoding="utf-8")
+        else:
+            self._fh = open(self.path, "w", encoding="utf-8")
+
+    @property
+    def digest(self) -> str:
+        return self._hash.hexdigest()
+
+    @property
+    def keys(self) -> str:
+        return f"{self._keys:016x}"
+
+    @property
+    def recent(self) -> dict:
+        self._prune_recent()
+        return dict(self._recent)
+
+    def _prune_recent(self) -> None:
+        if self.watermark is None:
+            return
+        since = datetime.fromisoformat(self.watermark) - WATERMARK_OVERLAP
+        self._recent = {k: v for k, v in self._recent.items() if datetime.fromisoformat(v) >= since}
+
+    def _track(self, row: dict, text: str) -> None:
+        self._hash.update(text.encode("utf-8"))
+        self.count += 1
+        if self.watermark_column:
+            self._keys ^= int(keys_digest((row["id"],)), 16)
+        version = row.get(self.watermark_column) if self.watermark_column else None
+        if version:
+            self.watermark = max_timestamp(self.watermark, version)
+            self._recent[row["id"]] = version
+
+    def _replay(self, size: int) -> None:
+        with open(self.path, "r+b") as fh:
+            fh.truncate(size)
+            text = fh.read().decode("utf-8")
+        for row in json.loads("[" + text + "]"):
+            self._track(row, encode_row(row))
+        self._prune_recent()
+
+    def add(self, rows: list) -> None:
+        for row in rows:
+            text = encode_row(row)
+            self._fh.write(",\n" if self.count else "\n")
+            self._fh.write(text)
+            self._track(row, text)
+        if len(self._recent) > 2 * len(rows):
+            self._prune_recent()
+
+    def checkpoint(self) -> int:
+        """Flush and return the spool's size, to pass back as `resume_bytes`."""
+        self._fh.flush()
+        return os.fstat(self._fh.fileno()).st_size
+
+    def close(self) -> None:
+        self._fh.close()
+
+    def load_rows(self) -> list:
+        """Read the spooled rows back into memory."""
+        self.close()
+        with open(self.path, encoding="utf-8") as src:
+            return json.loads("[" + src.read() + "]")
+
+    def write_value(self, out) -> None:
+        """Write the table's JSON array, exactly as it appears in a snapshot."""
+        self.close()
+        if not self.count:
+            out.write("[]")
+            return
+        out.write("[")
+        with open(self.path, encoding="utf-8") as src:
+            shutil.copyfileobj(src, out)
+        out.write("\n  ]")
+
+
+def max_timestamp(a, b):
+    """Later of two ISO-8601 timestamp strings; None counts as earliest."""
+    if a is None or b is None:
+        return a if b is None else b
+    return b if datetime.fromisoformat(b) > datetime.fromisoformat(a) else a
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> Path:
+    """Write `data` to a temp file next to `path`, fsync, and rename into place."""
+    path = Path(path)
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    return path
+
+
+def atomic_write_text(path: Path, text: str) -> Path:
+    return atomic_write_bytes(path, text.encode("utf-8"))
+
+
+class SnapshotWriter:
+    """
+    Assemble a snapshot from table spools and publish it atomically.
+
+        with SnapshotWriter(path, timestamp) as writer:
+            writer.add_table(spool)
+    """
+
+    def __init__(self, path: Path, timestamp: str):
+        self.path = Path(path)
+        fd, tmp = tempfile.mkstemp(prefix=f".{self.path.name}.", suffix=".tmp", dir=self.path.parent)
+        self._tmp = Path(tmp)
+        self._fh = os.fdopen(fd, "w", encoding="utf-8")
+        self._fh.write("{\n  " + json.dumps("backup_timestamp") + ": " + json.dumps(timestamp))
+
+    def add_table(self, spool: TableSpool) -> None:
+        self._fh.write(",\n  " + json.dumps(spool.table) + ": ")
+        spool.write_value(self._fh)
+
+    def add_rows(self, table: str, rows: list) -> None:
+        """Write an in-memory table (small tables, tests)."""
+        self._fh.write(",\n  " + json.dumps(table) + ": " + encode_table(rows))
+
+    def add_raw(self, table: str, value_file) -> None:
+        """Copy a table's already-encoded JSON array from an open file."""
+        self._fh.write(",\n  " + json.dumps(table) + ": ")
+        shutil.copyfileobj(value_file, self._fh)
+
+    def commit(self) -> Path:
+        self._fh.write("\n}")
+        self._fh.flush()
+        os.fsync(self._fh.fileno())
+        self._fh.close()
+        os.chmod(self._tmp, 0o644)  # mkstemp creates 0600; match a plain write
+        os.replace(self._tmp, self.path)
+        return self.path
+
+    def abort(self) -> None:
+        self._fh.close()
+        self._tmp.unlink(missing_ok=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.abort()
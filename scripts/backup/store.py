@@ -0,0 +1,144 @@
+"""
+Content-addressed, deduplicated backup store.
+
+Each table's payload (its JSON array, byte-for-byte as it appears in a
+snapshot) is stored once under its SHA-256:
+
+    store/objects/ab/ab12…ef.json
+    store/manifests/scores-YYYY-MM-DD-HHMM.json
+
+A run writes one tiny manifest listing (table, hash, row count); tables
+that did not change since an earlier run point at the blob that is
+already there, so an idle run costs a few hundred bytes. Manifests
+concatenate back into the exact snapshot file the plain backend writes
+(`export`). Old manifests are dropped by `gc(keep)`, which then deletes
+every blob no surviving manifest references.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+from .snapshot import SnapshotWriter, TableSpool, atomic_write_text, encode_table
+
+STORE_DIR = "store"
+MANIFEST_GLOB = "scores-*.json"
+
+
+class _HashingWriter:
+    """File-like wrapper that hashes everything written through it."""
+
+    def __init__(self, fh):
+        self._fh = fh
+        self.hash = hashlib.sha256()
+
+    def write(self, text: str) -> int:
+        data = text.encode("utf-8")
+        self.hash.update(data)
+        return self._fh.write(data)
+
+
+class BlobStore:
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.objects = self.root / "objects"
+        self.manifests_dir = self.root / "manifests"
+        self.objects.mkdir(parents=True, exist_ok=True)
+        self.manifests_dir.mkdir(parents=True, exist_ok=True)
+
+    # ── Blobs ─────────────────────────────────────────────────────────────────
+
+    def blob_path(self, digest: str) -> Path:
+        return self.objects / digest[:2] / f"{digest}.json"
+
+    def _put(self, write) -> str:
+        """Stream a payload via `write(out)`, keep it only if it is new."""
+        fd, tmp = tempfile.mkstemp(prefix=".blob.", suffix=".tmp", dir=self.objects)
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                out = _HashingWriter(fh)
+                write(out)
+                fh.flush()
+                os.fsync(fh.fileno())
+            digest = out.hash.hexdigest()
+            target = self.blob_path(digest)
+            if target.exists():
+                os.unlink(tmp)
+            else:
+                target.parent.mkdir(exist_ok=True)
+                os.chmod(tmp, 0o644)
+                os.replace(tmp, target)
+            return digest
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+    def put_spool(self, spool: TableSpool) -> str:
+        return self._put(spool.write_value)
+
+    def put_rows(self, rows: list) -> str:
+        return self._put(lambda out: out.write(encode_table(rows)))
+
+    # ── Manifests ─────────────────────────────────────────────────────────────
+
+    def write_manifest(self, name: str, timestamp: str, entries: list) -> Path:
+        """`entries` is [(table, digest, row_count), …] in snapshot table order."""
+        manifest = {
+            "backup_timestamp": timestamp,
+            "tables": [{"table": t, "blob": d, "rows": n} for t, d, n in entries],
+        }
+        return atomic_write_text(self.manifests_dir / name, json.dumps(manifest, indent=2))
+
+    def manifests(self) -> list:
+        """Manifest paths, oldest first (names sort chronologically)."""
+        return sorted(self.manifests_dir.glob(MANIFEST_GLOB))
+
+    def read_manifest(self, name: str) -> dict:
+        return json.loads((self.manifests_dir / Path(name).name).read_text())
+
+    def load(self, name: str) -> dict:
+        """The backup bundle a manifest describes, as plain dicts."""
+        manifest = self.read_manifest(name)
+        bundle = {"backup_timestamp": manifest["backup_timestamp"]}
+        for entry in manifest["tables"]:
+            bundle[entry["table"]] = json.loads(self.blob_path(entry["blob"]).read_text())
+        return bundle
+
+    def export(self, name: str, out_path: Path) -> Path:
+        """Write the manifest's snapshot as the plain backend's JSON file."""
+        manifest = self.read_manifest(name)
+        with SnapshotWriter(out_path, manifest["backup_timestamp"]) as writer:
+            for entry in manifest["tables"]:
+                with open(self.blob_path(entry["blob"]), encoding="utf-8") as blob:
+                    writer.add_raw(entry["table"], blob)
+        return Path(out_path)
+
+    # ── Garbage collection ────────────────────────────────────────────────────
+
+    def refcounts(self) -> dict:
+        counts = {}
+        for path in self.manifests():
+            for entry in json.loads(path.read_text())["tables"]:
+                counts[entry["blob"]] = counts.get(entry["blob"], 0) + 1
+        return counts
+
+    def gc(self, keep: int):
+        """
+        Keep the newest `keep` manifests and delete blobs nothing references.
+        Returns (manifests_removed, blobs_removed, bytes_freed).
+        """
+        manifests = self.manifests()
+        expired = manifests[:-keep] if len(manifests) > keep else []
+        for path in expired:
+            path.unlink(missing_ok=True)
+
+        live = self.refcounts()
+        blobs_removed = bytes_freed = 0
+        for blob in self.objects.glob("*/*.json"):
+            if live.get(blob.stem, 0) == 0:
+                bytes_freed += blob.stat().st_size
+                blob.unlink(missing_ok=True)
+                blobs_removed += 1
+        return len(expired), blobs_removed, bytes_freed
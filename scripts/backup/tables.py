@@ -0,0 +1,121 @@
+"""
+Registry of the tables a backup covers (supabase/migrations/*.sql).
+
+Each entry declares how to read the table and how it relates to the rest:
+
+  * columns    – projection sent as `select=`, in table-definition order so
+                 rows serialize exactly as `select=*` returns them
+  * key        – primary key: the paging order, and the row identity for
+                 deltas, diffs, the catalog and restores
+  * parents    – tables its foreign keys point at, for restore order
+  * watermark  – column for incremental fetches, if rows carry one
+  * day_filter – PostgREST filter that limits the table to one trip day,
+                 filled in from resolve_day(); "*" copies the table whole
+                 into a day backup, None leaves it out
+
+REGISTRY is in foreign-key order: every table comes after its parents.
+"""
+
+import json
+from typing import NamedTuple
+
+ALL_ROWS = "*"
+
+
+class TableSpec(NamedTuple):
+    name: str
+    columns: tuple = ()
+    key: str = "id"
+    parents: tuple = ()
+    watermark: str = None
+    day_filter: str = None
+
+    @property
+    def select(self) -> str:
+        return ",".join(self.columns) if self.columns else "*"
+
+
+REGISTRY = [
+    TableSpec("settings", ("key", "value", "updated_at"), key="key", day_filter=ALL_ROWS),
+    TableSpec("players",
+              ("id", "name", "handicap_index", "team", "display_order", "created_at"),
+              day_filter=ALL_ROWS),
+    TableSpec("courses", ("id", "name", "day_number", "par_total", "created_at"),
+              day_filter="day_number=eq.{day}"),
+    TableSpec("tees", ("id", "course_id", "name", "rating", "slope", "created_at"),
+              parents=("courses",), day_filter="course_id=eq.{course}"),
+    TableSpec("holes", ("id", "course_id", "hole_number", "par", "handicap_rank", "created_at"),
+              parents=("courses",), day_filter="course_id=eq.{course}"),
+    TableSpec("hole_yardages", ("id", "hole_id", "tee_id", "yardage"),
+              parents=("holes", "tees")),
+    TableSpec("player_tee_assignments",
+              ("id", "player_id", "course_id", "tee_id", "course_handicap"),
+              parents=("players", "courses", "tees"), day_filter="course_id=eq.{course}"),
+    TableSpec("groups", ("id", "day_number", "group_number", "format", "created_at"),
+              day_filter="day_number=eq.{day}"),
+    TableSpec("group_players", ("id", "group_id", "player_id", "playing_handicap"),
+              parents=("groups", "players"), day_filter="group_id=in.({groups})"),
+    TableSpec("matches",
+              ("id", "group_id", "match_number", "format", "team_a_label", "team_b_label",
+               "team_a_points", "team_b_points", "status", "created_at", "point_value"),
+              parents=("groups",), day_filter="group_id=in.({groups})"),
+    TableSpec("match_players", ("id", "match_id", "player_id", "side"),
+              parents=("matches", "players"), day_filter="match_id=in.({matches})"),
+    TableSpec("scores",
+              ("id", "player_id", "course_id", "hole_number", "gross_score", "net_score",
+               "ph_score", "ch_strokes", "ph_strokes", "entered_by", "created_at", "updated_at"),
+              parents=("players", "courses"), watermark="updated_at",
+              day_filter="course_id=eq.{course}"),
+    TableSpec("score_history",
+              ("id", "score_id", "previous_gross", "new_gross", "changed_by", "changed_at"),
+              parents=("scores",), watermark="changed_at"),
+    TableSpec("island_player_assignments",
+              ("id", "day_number", "island_player_id", "opponent_a_id", "opponent_b_id",
+               "match_a_id", "match_b_id", "created_at"),
+              parents=("players", "matches"), day_filter="day_number=eq.{day}"),
+]
+
+SPECS = {spec.name: spec for spec in REGISTRY}
+
+
+def table_spec(table: str) -> TableSpec:
+    """The registry entry for `table`; unknown tables get `select=*` keyed on id."""
+    return SPECS.get(table) or TableSpec(table)
+
+
+def primary_key(table: str) -> str:
+    return table_spec(table).key
+
+
+def day_tables(tables: list = None) -> list:
+    """Tables (in registry order) that belong in a day backup."""
+    tables = tables or [spec.name for spec in REGISTRY]
+    return [t for t in tables if table_spec(t).day_filter is not None]
+
+
+def _ids(client, table: str, *filters) -> list:
+    query = "&".join(["select=id", *filters, "order=id.asc"])
+    _, _, body = client.get(f"/rest/v1/{table}?{query}")
+    return [row["id"] for row in json.loads(body)]
+
+
+def resolve_day(client, day: int) -> dict:
+    """
+    Ids the day filters refer to, {"day", "course", "groups", "matches"},
+    looked up through `client` (a fetch.RestClient).
+    """
+    courses = _ids(client, "courses", f"day_number=eq.{int(day)}")
+    if not courses:
+        raise ValueError(f"no course for day {day}")
+    groups = _ids(client, "groups", f"day_number=eq.{int(day)}")
+    matches = _ids(client, "matches", f"group_id=in.({','.join(groups)})")
+    return {"day": day, "course": courses[0], "groups": ",".join(groups), "matches": ",".join(matches)}
+
+
+def day_filters(tables: list, ids: dict) -> dict:
+    """{table: (filter,)} for the tables of a day backup; whole tables get ()."""
+    filters = {}
+    for table in tables:
+        template = table_spec(table).day_filter
+        filters[table] = () if template in (None, ALL_ROWS) else (template.format(**ids),)
+    return filters
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Benchmark backup-scores.py end to end against a local PostgREST stand-in
+(scripts/backup/fake_postgrest.py) serving a fixture snapshot.
+
+Each profile sets the stand-in's row scale, latency, bandwidth and error
+rate; each run starts backup-scores.py in a fresh process with an empty
+backup dir and records wall time, response bytes the stand-in sent, and
+the process's peak RSS. Extra arguments after `--` go to backup-scores.py.
+
+Usage: python3 scripts/bench-backup.py [--profile x10 ...] [--repeat 3] [--json out.json] [-- --compact]
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from backup.fake_postgrest import API_KEY, FakePostgrest, fixture_tables
+from backup.tables import REGISTRY
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+FIXTURE = REPO_ROOT / "backups" / "scores-2026-02-22-1718.json"
+BACKUP_SCRIPT = REPO_ROOT / "scripts" / "backup-scores.py"
+TABLES = [spec.name for spec in REGISTRY]   # tables missing from the fixture are served empty
+
+# name: (scores scale, seconds latency per request, bytes/s or None, error rate)
+PROFILES = {
+    "local": (1, 0.0, None, 0.0),
+    "wan":   (1, 0.08, 2_000_000, 0.0),
+    "x10":   (10, 0.08, 2_000_000, 0.0),
+    "x100":  (100, 0.08, 2_000_000, 0.0),
+    "flaky": (1, 0.08, 2_000_000, 0.02),
+}
+
+
+def peak_rss_mb(rusage) -> float:
+    """ru_maxrss is KiB on Linux, bytes on macOS."""
+    return rusage.ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def measure(cmd: list, env: dict, stderr_path: str):
+    """
+    Run `cmd` and return (exit code, wall seconds, peak RSS MB). Called in a
+    small launcher process: a forked child starts with its parent's RSS as
+    its high-water mark, and this process holds the x100 fixture tables.
+    """
+    with open(stderr_path, "w") as err:
+        started = time.perf_counter()
+        proc = subprocess.Popen(cmd, env=env, stdout=subprocess.DEVNULL, stderr=err)
+        # wait4 rather than proc.wait(): it also returns the child's rusage
+        _, status, rusage = os.wait4(proc.pid, 0)
+        proc.returncode = os.waitstatus_to_exitcode(status)
+    return proc.returncode, time.perf_counter() - started, peak_rss_mb(rusage)
+
+
+def run_backup(launcher, profile: str, extra_args: list, fixture: Path = FIXTURE) -> dict:
+    """One backup-scores.py run against a fresh stand-in; returns its measurements."""
+    scale, latency, bandwidth, error_rate = PROFILES[profile]
+    tables = fixture_tables(fixture, TABLES, scale=scale)
+    server = FakePostgrest(
+        tables, latency={t: latency for t in tables}, bandwidth=bandwidth,
+        error_rate=error_rate, seed=int(time.time()),
+    )
+    with server, tempfile.TemporaryDirectory(prefix="bench-backup-") as tmp:
+        key_file = Path(tmp) / "key"
+        key_file.write_text(API_KEY)
+        env = dict(
+            os.environ,
+            DEGEN_SUPABASE_URL=server.url,
+            DEGEN_KEY_FILE=str(key_file),
+            DEGEN_BACKUP_DIR=str(Path(tmp) / "backups"),
+        )
+        stderr_path = Path(tmp) / "stderr"
+        code, wall, rss = launcher.apply(
+            measure, ([sys.executable, str(BACKUP_SCRIPT), *extra_args], env, str(stderr_path))
+        )
+        stderr = stderr_path.read_text()
+        written = sum(f.stat().st_size for f in (Path(tmp) / "backups").rglob("*") if f.is_file())
+    return {
+        "profile": profile,
+        "ok": code == 0,
+        "wall_s": round(wall, 3),
+        "bytes_sent": server.bytes_sent,
+        "requests": len(server.requests),
+        "errors_injected": server.errors,
+        "bytes_written": written,
+        "peak_rss_mb": round(rss, 1),
+        "scores": len(tables["scores"]),
+        "stderr": stderr.strip()[-500:],
+    }
+
+
+def summarize(runs: list) -> dict:
+    ok = [r for r in runs if r["ok"]] or runs
+    return {
+        "profile": runs[0]["profile"],
+        "scores": runs[0]["scores"],
+        "runs": len(runs),
+        "failures": sum(not r["ok"] for r in runs),
+        "wall_s": statistics.median(r["wall_s"] for r in ok),
+        "bytes_sent": statistics.median(r["bytes_sent"] for r in ok),
+        "requests": statistics.median(r["requests"] for r in ok),
+        "peak_rss_mb": max(r["peak_rss_mb"] for r in ok),
+    }
+
+
+def main(argv=None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    extra = argv[argv.index("--") + 1:] if "--" in argv else []
+    argv = argv[:argv.index("--")] if "--" in argv else argv
+    parser = argparse.ArgumentParser(description="Benchmark backup-scores.py against a local stand-in.")
+    parser.add_argument("--profile", action="append", choices=sorted(PROFILES),
+                        help="profile to run (repeatable; default: all)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--fixture", type=Path, default=FIXTURE)
+    parser.add_argument("--json", type=Path, default=None, help="also write every run as JSON here")
+    args = parser.parse_args(argv)
+
+    results = []
+    launcher = multiprocessing.get_context("spawn").Pool(1)
+    print("| Profile | Scores | Runs | Failed | Wall s (median) | Bytes sent | Requests | Peak RSS MB |")
+    print("|---------|--------|------|--------|-----------------|------------|----------|-------------|")
+    for profile in args.profile or list(PROFILES):
+        runs = [run_backup(launcher, profile, extra, args.fixture) for _ in range(args.repeat)]
+        results.extend(runs)
+        s = summarize(runs)
+        print(f"| {profile} | {s['scores']:,} | {s['runs']} | {s['failures']} | {s['wall_s']:.2f} "
+              f"| {int(s['bytes_sent']):,} | {int(s['requests'])} | {s['peak_rss_mb']:.1f} |")
+        for r in runs:
+            if not r["ok"] and r["stderr"]:
+                print(f"  {profile} failure: {r['stderr'].splitlines()[-1]}", file=sys.stderr)
+    launcher.close()
+
+    if args.json:
+        args.json.write_text(json.dumps({"args": extra, "runs": results}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark the scoring.handicap lookup tables against computing each
+value per call, on a bulk-scoring workload: random (CH, hole rank) pairs
+like a season of scorecards, and course handicaps for every score row.
+
+Compares, for stroke counts: the handicap.ts if-chain against a table
+read, per hole and per 18-hole card (one row fetch, then 18 reads), and
+the old tier arithmetic over arrays against one fancy index. For course
+handicaps: the formula per row against the (HI, tee) table. Every pair
+of methods is checked to agree first (stroke counts over CH 0-54, where
+the if-chain is defined).
+
+Needs NumPy (pip install -r scripts/requirements.txt).
+
+Usage: python3 scripts/bench-handicap.py [--scores N]
+"""
+
+import argparse
+import math
+import sys
+
+import numpy as np
+
+from scoring.handicap import calc_strokes_array, calc_strokes_on_hole, course_handicap_table, stroke_row
+from scriptlib import median_ms
+
+REPEAT = 5
+TEES = [("Black", 74.7, 139), ("Yellow", 71.9, 132), ("White", 70.8, 129), ("Silver", 68.3, 122), ("Hawk", 70.0, 127)]
+
+
+def if_chain_strokes(handicap, rank):
+    """calcStrokesOnHole as handicap.ts writes it."""
+    if handicap >= 36:
+        return 3 if rank <= handicap - 36 else 2
+    elif handicap >= 18:
+        return 2 if rank <= handicap - 18 else 1
+    else:
+        return 1 if rank <= handicap else 0
+
+
+def tier_strokes_array(handicap, rank):
+    """The arithmetic array version the lookup table replaced."""
+    tier = np.clip(handicap // 18, 0, 2)
+    return tier + (rank <= handicap - 18 * tier)
+
+
+def formula_course_handicap(hi, slope, rating, par=72):
+    return math.floor(hi * (slope / 113) + (rating - par) + 0.5)
+
+
+def workload(n: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    handicaps = rng.integers(0, 55, n)
+    ranks = rng.integers(1, 19, n)
+    his = np.round(rng.uniform(0, 36, 40), 1).tolist()   # a 40-player roster
+    rows = [(his[p], TEES[t]) for p, t in zip(rng.integers(0, len(his), n), rng.integers(0, len(TEES), n))]
+    return handicaps, ranks, his, rows
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark handicap lookup tables.")
+    parser.add_argument("--scores", type=int, default=200_000, help="score rows in the workload")
+    args = parser.parse_args(argv)
+
+    handicaps, ranks, his, rows = workload(args.scores)
+    h_list, r_list = handicaps.tolist(), ranks.tolist()
+    grid_h, grid_r = np.meshgrid(np.arange(55), np.arange(1, 19), indexing="ij")
+    if (calc_strokes_array(grid_h, grid_r) != tier_strokes_array(grid_h, grid_r)).any() or any(
+            calc_strokes_on_hole(int(h), int(r)) != if_chain_strokes(int(h), int(r))
+            for h, r in zip(grid_h.ravel(), grid_r.ravel())):
+        print("ERROR: lookup tables disagree with handicap.ts", file=sys.stderr)
+        return 1
+    table = course_handicap_table(his, TEES)
+    if any(table[(hi, tee)] != formula_course_handicap(hi, tee[2], tee[1]) for hi, tee in rows):
+        print("ERROR: course handicap table disagrees with the formula", file=sys.stderr)
+        return 1
+
+    card_ranks = list(range(1, 19))
+    cards = h_list[::18]
+    results = [
+        ("strokes, per hole",
+         median_ms(lambda: [if_chain_strokes(h, r) for h, r in zip(h_list, r_list)], REPEAT),
+         median_ms(lambda: [calc_strokes_on_hole(h, r) for h, r in zip(h_list, r_list)], REPEAT)),
+        ("strokes, per card",
+         median_ms(lambda: [[if_chain_strokes(h, r) for r in card_ranks] for h in cards], REPEAT),
+         median_ms(lambda: [[row[r] for r in card_ranks] for row in map(stroke_row, cards)], REPEAT)),
+        ("strokes, array",
+         median_ms(lambda: tier_strokes_array(handicaps, ranks), REPEAT),
+         median_ms(lambda: calc_strokes_array(handicaps, ranks), REPEAT)),
+        ("course handicap, per row",
+         median_ms(lambda: [formula_course_handicap(hi, t[2], t[1]) for hi, t in rows], REPEAT),
+         median_ms(lambda: [table[row] for row in rows], REPEAT)),
+    ]
+
+    print(f"{args.scores:,} score rows, median of {REPEAT}")
+    print("| Workload | Computed ms | Lookup ms | Speedup |")
+    print("|----------|-------------|-----------|---------|")
+    for name, computed, lookup in results:
+        print(f"| {name} | {computed:.2f} | {lookup:.2f} | {computed / lookup:.1f}× |")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
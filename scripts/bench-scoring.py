@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Benchmark the Python scoring reference on synthetic rosters and seasons:
+every combination of --players and --days (default 11-1,000 players,
+3-50 days of 18 holes), with random CHs, hole ranks and pars.
+
+Per combination it times, as the testing plan uses them:
+  strokes      calc_strokes_on_hole for every player/day/hole
+  net          calc_net_score for every player/day/hole
+  engine       PlanEngine build plus one scenario's nets, as arrays
+  net table    generate_net_score_table for every day
+  <format>     generate_match_scenario for each of the five formats, over
+               the roster split into matches each day (at most
+               --max-matches per combination)
+
+and reports throughput (holes or matches per second) and peak traced
+memory. --json writes the results; --baseline compares against an
+earlier --json file and flags any case slower, or heavier, by more than
+--threshold, exiting 1 if there are any.
+
+Needs NumPy (pip install -r scripts/requirements.txt).
+
+Usage: python3 scripts/bench-scoring.py [--players 11 100] [--days 3 10] [--json out.json] [--baseline old.json]
+"""
+
+import argparse
+import json
+import platform
+import sys
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+from scriptlib import load_script, median_ms
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+REPEAT = 3
+PLAYERS = (11, 100, 1000)
+DAYS = (3, 10, 50)
+DEFAULT_THRESHOLD = 0.25
+
+# format: players per side
+FORMATS = {
+    "best_ball_validation": 2,
+    "best_ball": 2,
+    "low_total": 2,
+    "singles_match": 1,
+    "singles_stroke": 1,
+}
+
+
+plan = load_script("generate-testing-plan.py")
+
+
+def peak_kb(fn) -> float:
+    """Peak memory traced while `fn()` runs, in KiB (NumPy buffers included)."""
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def roster(n_players: int, n_days: int, seed: int = 0):
+    """Synthetic (players, ch, holes) in the shapes PlanEngine takes."""
+    rng = np.random.default_rng(seed)
+    names = [f"P{i:04d}" for i in range(n_players)]
+    days = range(1, n_days + 1)
+    holes = {day: [(n, int(par), int(rank)) for n, par, rank in
+                   zip(range(1, 19), rng.choice([3, 4, 4, 5], 18), rng.permutation(18) + 1)] for day in days}
+    ch = {name: {day: int(c) for day, c in zip(days, rng.integers(0, 40, n_days))} for name in names}
+    return [(name, 0.0) for name in names], ch, holes
+
+
+def match_sides(engine, format_code: str, max_matches: int) -> list:
+    """[(day, side A names, side B names)]: the roster split into matches every day, capped."""
+    per_side = FORMATS[format_code]
+    size = 2 * per_side
+    per_day = len(engine.names) // size
+    days = engine.days[:max(1, -(-max_matches // max(per_day, 1)))]
+    sides = []
+    for day in days:
+        for m in range(per_day):
+            names = engine.names[m * size:(m + 1) * size]
+            sides.append((day, names[:per_side], names[per_side:]))
+    return sides[:max_matches]
+
+
+def run_cases(n_players: int, n_days: int, repeat: int = REPEAT, max_matches: int = 500) -> list:
+    """Every case for one roster/season size: [{case, players, days, count, unit, ms, per_s, peak_kb}]."""
+    players, ch, holes = roster(n_players, n_days)
+    engine = plan.PlanEngine(players, ch, holes)
+    n_holes = engine.strokes.size
+    ch_list = np.repeat(engine.ch[:, :, None], 18, axis=2).ravel().tolist()
+    rank_list = np.broadcast_to(engine.rank[None], engine.strokes.shape).ravel().tolist()
+    par_list = np.broadcast_to(engine.par[None], engine.strokes.shape).ravel().tolist()
+    strokes_list = engine.strokes.ravel().tolist()
+    gross_list = engine.gross(plan.scenario_mixed_realistic).ravel().tolist()
+
+    def strokes():
+        return [plan.calc_strokes_on_hole(c, r) for c, r in zip(ch_list, rank_list)]
+
+    def net():
+        return [plan.calc_net_score(g, s, p, 3) for g, s, p in zip(gross_list, strokes_list, par_list)]
+
+    def engine_nets():
+        plan.PlanEngine(players, ch, holes).net(plan.scenario_mixed_realistic)
+
+    def net_tables():
+        fresh = plan.PlanEngine(players, ch, holes)
+        for day in fresh.days:
+            plan.generate_net_score_table(fresh, day, "Mixed", plan.scenario_mixed_realistic)
+
+    cases = [("strokes", strokes, n_holes, "holes"), ("net", net, n_holes, "holes"),
+             ("engine", engine_nets, n_holes, "holes"), ("net table", net_tables, n_holes, "holes")]
+    for format_code in FORMATS:
+        sides = match_sides(engine, format_code, max_matches)
+
+        def matches(sides=sides, format_code=format_code):
+            for day, team_a, team_b in sides:
+                plan.generate_match_scenario(engine, format_code, format_code, team_a, team_b, day,
+                                             plan.scenario_mixed_realistic)
+        cases.append((format_code, matches, len(sides), "matches"))
+
+    results = []
+    for name, fn, count, unit in cases:
+        ms = median_ms(fn, repeat)
+        results.append({"case": name, "players": n_players, "days": n_days, "count": count, "unit": unit,
+                        "ms": round(ms, 3), "per_s": round(count / (ms / 1000), 1) if ms else None,
+                        "peak_kb": round(peak_kb(fn), 1)})
+    return results
+
+
+def compare(results: list, baseline: list, threshold: float = DEFAULT_THRESHOLD) -> list:
+    """Cases slower or heavier than the baseline by more than `threshold`: [(result, metric, ratio)]."""
+    before = {(r["case"], r["players"], r["days"]): r for r in baseline}
+    flagged = []
+    for r in results:
+        old = before.get((r["case"], r["players"], r["days"]))
+        if old is None:
+            continue
+        if old["per_s"] and r["per_s"] and r["per_s"] < old["per_s"] * (1 - threshold):
+            flagged.append((r, "throughput", r["per_s"] / old["per_s"]))
+        if old["peak_kb"] and r["peak_kb"] > old["peak_kb"] * (1 + threshold):
+            flagged.append((r, "memory", r["peak_kb"] / old["peak_kb"]))
+    return flagged
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the Python scoring reference.")
+    parser.add_argument("--players", type=int, nargs="+", default=PLAYERS)
+    parser.add_argument("--days", type=int, nargs="+", default=DAYS)
+    parser.add_argument("--repeat", type=int, default=REPEAT)
+    parser.add_argument("--max-matches", type=int, default=500, help="matches per format and roster size")
+    parser.add_argument("--json", type=Path, help="write the results here")
+    parser.add_argument("--baseline", type=Path, help="earlier --json results to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"flag cases worse than the baseline by this fraction (default {DEFAULT_THRESHOLD})")
+    args = parser.parse_args(argv)
+
+    results = []
+    print(f"median of {args.repeat}")
+    print("| Case | Players | Days | Count | ms | Per second | Peak KiB |")
+    print("|------|---------|------|-------|----|------------|----------|")
+    for n_players in args.players:
+        for n_days in args.days:
+            for r in run_cases(n_players, n_days, args.repeat, args.max_matches):
+                results.append(r)
+                print(f"| {r['case']} | {r['players']:,} | {r['days']} | {r['count']:,} {r['unit']} | "
+                      f"{r['ms']:.1f} | {r['per_s'] or 0:,.0f} | {r['peak_kb']:,.0f} |")
+
+    if args.json:
+        args.json.write_text(json.dumps({
+            "python": platform.python_version(), "numpy": np.__version__, "repeat": args.repeat,
+            "results": results,
+        }, indent=2))
+
+    if args.baseline:
+        flagged = compare(results, json.loads(args.baseline.read_text())["results"], args.threshold)
+        for r, metric, ratio in flagged:
+            print(f"REGRESSION: {r['case']} at {r['players']} players × {r['days']} days: "
+                  f"{metric} {ratio:.2f}× baseline", file=sys.stderr)
+        if flagged:
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%} against {args.baseline.name}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Benchmark the compact .ddz snapshot format against the plain indent=2 JSON
+snapshots on the checked-in backups/*.json files.
+
+Reports size and dump/load time per file for: the current JSON format,
+compact+zlib and compact+lzma. Every compact file is checked to load back
+to exactly the dicts json.load returns.
+
+Usage: python3 scripts/bench-snapshot-format.py [backups/scores-*.json ...]
+"""
+
+import json
+import sys
+from pathlib import Path
+
+from backup.compact import decode_compact, encode_compact
+from scriptlib import median_ms
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+REPEAT = 5
+
+
+def main() -> int:
+    paths = [Path(p) for p in sys.argv[1:]] or sorted((REPO_ROOT / "backups").glob("scores-*.json"))
+    if not paths:
+        print("No snapshots to benchmark", file=sys.stderr)
+        return 1
+
+    print("| Snapshot | JSON | zlib | lzma | lzma ratio | JSON dump/load ms | zlib dump/load ms | lzma dump/load ms |")
+    print("|----------|------|------|------|------------|-------------------|-------------------|-------------------|")
+    totals = {"json": 0, "zlib": 0, "lzma": 0}
+    for path in paths:
+        raw = path.read_text()
+        bundle = json.loads(raw)
+        sizes = {"json": len(raw.encode("utf-8"))}
+        timing = {
+            "json": (
+                median_ms(lambda: json.dumps(bundle, indent=2, default=str), REPEAT),
+                median_ms(lambda: json.loads(raw), REPEAT),
+            )
+        }
+        for codec in ("zlib", "lzma"):
+            blob = encode_compact(bundle, codec)
+            if decode_compact(blob) != bundle:
+                print(f"ERROR: {path.name} does not round-trip through {codec}", file=sys.stderr)
+                return 1
+            sizes[codec] = len(blob)
+            timing[codec] = (
+                median_ms(lambda: encode_compact(bundle, codec), REPEAT),
+                median_ms(lambda: decode_compact(blob), REPEAT),
+            )
+        for k in totals:
+            totals[k] += sizes[k]
+        print(
+            f"| {path.name} | {sizes['json']:,} | {sizes['zlib']:,} | {sizes['lzma']:,} "
+            f"| {sizes['json'] / sizes['lzma']:.1f}× "
+            + " ".join(f"| {timing[k][0]:.1f} / {timing[k][1]:.1f}" for k in ("json", "zlib", "lzma"))
+            + " |"
+        )
+    print(
+        f"\nTotal: JSON {totals['json']:,} B, zlib {totals['zlib']:,} B, lzma {totals['lzma']:,} B "
+        f"({totals['json'] / totals['lzma']:.1f}× smaller)"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Differential fuzzer for the five match formats.
+
+Generates random gross-score cards over every HOLES day, random group
+compositions and net_max_over_par 2 or 3, with scores skewed toward net
+ties, the net cap and aces. A process pool scores them two
+ways and compares:
+
+  * in batches with the testing plan's array reference (match_points in
+    generate-testing-plan.py)
+  * card by card with a line-for-line port of calcMatchResult
+    (src/lib/scoring/engine.ts), for a sample of cards and for every
+    card that is kept as a fixture
+
+Cards are tagged with the edge cases they hit (validation tiebreak,
+low/total ties and splits, halved holes, stroke-play ties, tied matches,
+...). The first few cards of each format × tag combination, and every
+card where the two scorers disagree, are written to a fixture file that
+tests/scoring/35-match-fuzz-fixtures.spec.ts replays through the
+TypeScript engine.
+
+Needs NumPy (pip install -r scripts/requirements.txt).
+
+Usage: python3 scripts/fuzz-match-formats.py [--cards 1000000] [--seed 1] [--workers N]
+                                             [--keep 2] [--out tests/scoring/fixtures/match-fuzz.json]
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from scriptlib import load_script
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+FIXTURE_FILE = REPO_ROOT / "tests" / "scoring" / "fixtures" / "match-fuzz.json"
+
+
+plan = load_script("generate-testing-plan.py")
+ENGINE = plan.PlanEngine(plan.PLAYERS, plan.CH, plan.HOLES)
+
+# format: players per side
+FORMATS = {
+    "best_ball_validation": 2,
+    "best_ball": 2,
+    "low_total": 2,
+    "singles_match": 1,
+    "singles_stroke": 1,
+}
+BATCH = 20_000       # cards per pool task
+SAMPLE = 0.002       # share of cards also scored by the calcMatchResult port
+
+
+# ── calcMatchResult, card by card ─────────────────────────────────────────────
+
+def calc_match_result(format_code, team_a, team_b, holes, net_max_over_par, point_value=1):
+    """
+    Port of calcMatchResult: teams are [(playing handicap, [gross per hole])],
+    holes [(hole_number, par, rank)] in hole order.
+    """
+    hole_points = []
+    for h, (_, par, rank) in enumerate(holes):
+        def net(player):
+            ph, gross = player
+            return plan.calc_net_score(gross[h], plan.calc_strokes_on_hole(ph, rank), par, net_max_over_par)
+        a, b = [net(p) for p in team_a], [net(p) for p in team_b]
+        if format_code in ("best_ball_validation", "best_ball"):
+            if min(a) != min(b):
+                points = (1, 0) if min(a) < min(b) else (0, 1)
+            elif format_code == "best_ball" or max(a) == max(b):
+                points = (0, 0)
+            else:
+                points = (1, 0) if max(a) < max(b) else (0, 1)
+        elif format_code == "low_total":
+            points = ((min(a) < min(b)) + (sum(a) < sum(b)), (min(b) < min(a)) + (sum(b) < sum(a)))
+        elif format_code == "singles_match":
+            points = (1, 0) if a[0] < b[0] else (0, 1) if b[0] < a[0] else (0.5, 0.5)
+        else:
+            points = (0, 0)
+        hole_points.append([points, (a, b)])
+
+    if format_code == "singles_stroke":
+        total_a = sum(nets[0][0] for _, nets in hole_points)
+        total_b = sum(nets[1][0] for _, nets in hole_points)
+        hole_points[-1][0] = (1, 0) if total_a < total_b else (0, 1) if total_b < total_a else (0.5, 0.5)
+
+    a_total = sum(p[0] for p, _ in hole_points)
+    b_total = sum(p[1] for p, _ in hole_points)
+    winner = "A" if a_total > b_total else "B" if b_total > a_total else "tie"
+    return {
+        "teamAHolePoints": [p[0] for p, _ in hole_points],
+        "teamBHolePoints": [p[1] for p, _ in hole_points],
+        "teamATotalPoints": a_total,
+        "teamBTotalPoints": b_total,
+        "winner": winner,
+        "teamAMatchPoints": point_value * {"A": 1, "B": 0, "tie": 0.5}[winner],
+        "teamBMatchPoints": point_value * {"A": 0, "B": 1, "tie": 0.5}[winner],
+    }
+
+
+# ── Batches ───────────────────────────────────────────────────────────────────
+
+def random_cards(rng, n: int, per_side: int) -> dict:
+    """n random cards: day index, player indices, net_max and gross [card, player, hole]."""
+    n_players = 2 * per_side
+    day = rng.integers(len(ENGINE.days), size=n)
+    players = np.argsort(rng.random((n, len(ENGINE.names))), axis=1)[:, :n_players]
+    par = ENGINE.par[day][:, None, :]
+    # Mostly par-1..double bogey so nets collide often, plus blow-ups and aces
+    gross = par + rng.integers(-1, 3, size=(n, n_players, par.shape[-1]))
+    roll = rng.random(gross.shape)
+    gross = np.where(roll < 0.04, rng.integers(8, 16, size=gross.shape), gross)
+    gross = np.where(roll > 0.985, np.maximum(par - 2, 1), gross)
+    return {"day": day, "players": players, "net_max": rng.choice([2, 3], size=n), "gross": gross}
+
+
+def score_cards(format_code: str, cards: dict) -> dict:
+    """Reference scoring and edge-case tags for a batch of cards."""
+    per_side = FORMATS[format_code]
+    day, players, gross = cards["day"], cards["players"], cards["gross"]
+    ch = ENGINE.ch[players, day[:, None]]
+    ph = plan.calc_playing_handicap(ch, ch.min(axis=1, keepdims=True))
+    par, rank = ENGINE.par[day][:, None, :], ENGINE.rank[day][:, None, :]
+    strokes = plan.calc_strokes_array(ph[:, :, None], rank)
+    net_max = cards["net_max"][:, None, None]
+    nets = plan.calc_net_array(gross, strokes, par, net_max)
+    a, b = nets[:, :per_side], nets[:, per_side:]
+    a_pts, b_pts = plan.match_points(format_code, a, b)
+    a_total, b_total = a_pts.sum(axis=1), b_pts.sum(axis=1)
+
+    tags = {
+        "match_tie": a_total == b_total,
+        "net_cap": (gross - strokes > par + strokes + net_max).any(axis=(1, 2)),
+    }
+    if per_side == 2:
+        best_tied = a.min(axis=1) == b.min(axis=1)
+        if format_code == "best_ball_validation":
+            worst_tied = a.max(axis=1) == b.max(axis=1)
+            tags["validation_decides"] = (best_tied & ~worst_tied).any(axis=1)
+            tags["validation_tied"] = (best_tied & worst_tied).any(axis=1)
+        elif format_code == "best_ball":
+            tags["best_tied"] = best_tied.any(axis=1)
+        else:
+            low_a, low_b, tot_a, tot_b = a.min(axis=1), b.min(axis=1), a.sum(axis=1), b.sum(axis=1)
+            tags["low_tie"] = best_tied.any(axis=1)
+            tags["total_tie"] = (tot_a == tot_b).any(axis=1)
+            tags["split"] = (((low_a < low_b) & (tot_b < tot_a)) | ((low_b < low_a) & (tot_a < tot_b))).any(axis=1)
+    elif format_code == "singles_match":
+        tags["halved_hole"] = (a[:, 0] == b[:, 0]).any(axis=1)
+    else:
+        tags["total_tie"] = a[:, 0].sum(axis=1) == b[:, 0].sum(axis=1)
+    return {"ph": ph, "a_pts": a_pts, "b_pts": b_pts, "tags": tags}
+
+
+def card_case(format_code: str, cards: dict, scored: dict, i: int, tags: list) -> dict:
+    """One card as a fixture case, with the reference's expected result."""
+    per_side = FORMATS[format_code]
+    day = int(ENGINE.days[cards["day"][i]])
+    team = [{"name": ENGINE.names[p], "ph": int(ph), "gross": g.tolist()}
+            for p, ph, g in zip(cards["players"][i], scored["ph"][i], cards["gross"][i])]
+    a_pts, b_pts = scored["a_pts"][i].tolist(), scored["b_pts"][i].tolist()
+    a_total, b_total = sum(a_pts), sum(b_pts)
+    return {
+        "format": format_code,
+        "day": day,
+        "netMaxOverPar": int(cards["net_max"][i]),
+        "tags": tags,
+        "teamA": team[:per_side],
+        "teamB": team[per_side:],
+        "expected": {
+            "teamAHolePoints": a_pts,
+            "teamBHolePoints": b_pts,
+            "teamATotalPoints": a_total,
+            "teamBTotalPoints": b_total,
+            "winner": "A" if a_total > b_total else "B" if b_total > a_total else "tie",
+        },
+    }
+
+
+def check_case(case: dict) -> dict:
+    """calcMatchResult port's result for a case where it differs from `expected`, else None."""
+    holes = [tuple(h) for h in plan.HOLES[case["day"]]]
+    side = lambda team: [(p["ph"], p["gross"]) for p in team]  # noqa: E731
+    got = calc_match_result(case["format"], side(case["teamA"]), side(case["teamB"]),
+                            holes, case["netMaxOverPar"])
+    return None if all(got[k] == v for k, v in case["expected"].items()) else got
+
+
+def run_batch(task) -> dict:
+    """Pool task: generate, score and check one batch of one format."""
+    format_code, n, seed, keep = task
+    rng = np.random.default_rng(seed)
+    cards = random_cards(rng, n, FORMATS[format_code])
+    scored = score_cards(format_code, cards)
+    names = list(scored["tags"])
+    flags = np.stack([scored["tags"][t] for t in names], axis=1)
+
+    counts = {t: int(flags[:, j].sum()) for j, t in enumerate(names)}
+    kept, seen = {}, {}
+    # First `keep` cards of every tag combination, plus a random sample
+    combos = np.unique(flags, axis=0)
+    picks = {int(i) for combo in combos for i in np.flatnonzero((flags == combo).all(axis=1))[:keep]}
+    picks |= set(np.flatnonzero(rng.random(n) < SAMPLE).tolist())
+    failures, checked = [], 0
+    for i in sorted(picks):
+        tags = [t for j, t in enumerate(names) if flags[i, j]]
+        case = card_case(format_code, cards, scored, i, tags)
+        checked += 1
+        got = check_case(case)
+        if got is not None:
+            case["tags"].append("mismatch")
+            case["port"] = got
+            failures.append(case)
+            continue
+        signature = (format_code, tuple(tags))
+        if seen.get(signature, 0) < keep:
+            seen[signature] = seen.get(signature, 0) + 1
+            kept.setdefault(signature, []).append(case)
+    return {"format": format_code, "cards": n, "counts": counts, "checked": checked,
+            "kept": kept, "failures": failures}
+
+
+def plan_tasks(total: int, seed: int, keep: int) -> list:
+    per_format = -(-total // len(FORMATS))
+    seeds = iter(np.random.SeedSequence(seed).spawn(len(FORMATS) * -(-per_format // BATCH)))
+    tasks = []
+    for format_code in FORMATS:
+        for start in range(0, per_format, BATCH):
+            tasks.append((format_code, min(BATCH, per_format - start), next(seeds), keep))
+    return tasks
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Differential fuzzer for the match formats.")
+    parser.add_argument("--cards", type=int, default=1_000_000, help="cards in total, split over the formats")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--keep", type=int, default=2, help="fixture cases per format × edge-case combination")
+    parser.add_argument("--out", type=Path, default=FIXTURE_FILE)
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    tasks = plan_tasks(args.cards, args.seed, args.keep)
+    if args.workers > 1:
+        with multiprocessing.Pool(args.workers) as pool:
+            results = pool.map(run_batch, tasks, chunksize=1)
+    else:
+        results = list(map(run_batch, tasks))   # in-process; easier to debug
+    elapsed = time.perf_counter() - started
+
+    cases, failures, per_signature = [], [], {}
+    counts = {f: {} for f in FORMATS}
+    cards = {f: 0 for f in FORMATS}
+    checked = 0
+    for result in results:   # task order, so the output only depends on --seed
+        cards[result["format"]] += result["cards"]
+        checked += result["checked"]
+        failures.extend(result["failures"])
+        for tag, n in result["counts"].items():
+            counts[result["format"]][tag] = counts[result["format"]].get(tag, 0) + n
+        for signature, found in result["kept"].items():
+            room = args.keep - per_signature.get(signature, 0)
+            cases.extend(found[:room])
+            per_signature[signature] = per_signature.get(signature, 0) + len(found[:room])
+
+    print(f"Scored {sum(cards.values()):,} cards in {elapsed:.2f}s on {args.workers} workers; "
+          f"{checked:,} cross-checked against the calcMatchResult port, {len(failures)} disagreed")
+    print("| Format | Cards | Edge cases hit |")
+    print("|--------|-------|----------------|")
+    for format_code in FORMATS:
+        hits = ", ".join(f"{tag} {n:,}" for tag, n in counts[format_code].items())
+        print(f"| {format_code} | {cards[format_code]:,} | {hits} |")
+
+    fixture = {
+        "generatedBy": "scripts/fuzz-match-formats.py",
+        "seed": args.seed,
+        "cards": sum(cards.values()),
+        "holes": {str(day): [list(h) for h in plan.HOLES[day]] for day in ENGINE.days},
+        "cases": failures + cases,
+    }
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    body = ",\n".join(json.dumps(case, separators=(",", ":")) for case in fixture.pop("cases"))
+    header = json.dumps(fixture, separators=(",", ":"))[:-1]
+    args.out.write_text(f'{header},"cases":[\n{body}\n]}}\n')
+    print(f"Wrote {len(failures) + len(cases)} cases ({len(failures)} failing) to {args.out}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,103 +2,198 @@
 """
 Generate comprehensive TESTING-PLAN.md with all pre-calculated expected values.
 Uses verified Supabase CH values and actual hole data.
+
+By default the plan is built from the trip in scoring/builtin.py. Given
+a backup snapshot or the backup catalog it is built from those tables
+instead, for whatever roster and number of rounds they hold; holes, tees
+and tee assignments the backup lacks come from --reference, or else from
+the built-in trip (with a warning). Each section part (a
+day, a scenario, a match) renders on its own, in a process pool for large
+plans, and is streamed to the file in order. Rendered parts are cached on
+disk (--cache, default ~/.cache/degen-dudes/testing-plan or
+$DEGEN_PLAN_CACHE) under a hash of exactly the inputs they read, so after
+a data fix only the parts that read it render again. The same expected
+values are written as arrays to --fixtures (default TESTING-PLAN.fixtures/,
+see scoring/fixtures.py) for tests to load without parsing Markdown.
+
+Needs NumPy (pip install -r scripts/requirements.txt).
+
+  generate-testing-plan.py                               built-in data → TESTING-PLAN.md
+  generate-testing-plan.py backups/scores-2026-02-28-1418.json --out /tmp/plan.md
+  generate-testing-plan.py --catalog backups/catalog.sqlite --at 2026-02-28T14:18:00-07:00
 """
 
+import argparse
+import hashlib
+import itertools
+import json
 import math
+import multiprocessing
+import os
+import sys
 from datetime import datetime
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+
+from backup.snapshot import atomic_write_text
+# The trip's raw data (from Supabase — verified correct)
+from scoring.builtin import (CH, COURSES, GROUPS, HOLES, MATCH_GROUPS, PLAYER_IDS, PLAYERS, TEAMS, TEES,
+                             builtin_tables)
+from scoring.handicap import (calc_playing_handicap, calc_strokes_array, calc_strokes_on_hole,
+                              course_handicap_table, course_handicap_unrounded)
+from scoring.fixtures import write_fixtures
+from scoring.matches import calc_net_array, match_points
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+PARALLEL_MIN_STROKES = 50_000   # smaller plans render faster than a process pool starts
+CACHE_DIR = Path(os.environ.get("DEGEN_PLAN_CACHE", Path.home() / ".cache" / "degen-dudes" / "testing-plan"))
+DEFAULT_CACHE_BYTES = 64 * 2**20
+PLAN_TABLES = ("players", "courses", "tees", "holes", "player_tee_assignments",
+               "groups", "group_players", "matches", "match_players")
+
 
 # ============================================================
-# RAW DATA (from Supabase — verified correct)
+# PLAN INPUTS (the built-in trip, or a backup's tables)
 # ============================================================
 
-PLAYERS = [
-    ("Ryan", 8.9), ("Kiki", 9.3), ("Mack", 10.0), ("Bruce", 10.6),
-    ("Matthew", 11.0), ("C-Pat", 11.5), ("Eric", 13.5), ("Ben", 19.0),
-    ("Gary", 22.1), ("Chris", 30.0), ("Jauch", 36.0),
-]
+class PlanData(NamedTuple):
+    players: list       # [(name, HI)] in display order
+    player_ids: dict    # name → id
+    courses: dict       # day → {"name", "id", "par"}
+    holes: dict         # day → [(hole_num, par, hdcp_rank)]
+    ch: dict            # name → {day: CH}
+    tees: dict          # name → {day: (tee, rating, slope)}
+    teams: dict         # team → [names]
+    groups: list        # first day's groups: [(group number, [names], format)]
+    match_groups: dict  # MATCH_GROUPS keys → (side A names, side B names)
 
-PLAYER_IDS = {
-    "Ryan": "06559478-aa82-4a0d-aa26-d239ae8414f4",
-    "Kiki": "2377121e-5093-4250-9459-9cec514d9ff4",
-    "Mack": "c407edd3-591f-4faf-afed-c6e156698b33",
-    "Bruce": "8ba6e2af-35d9-42bb-9750-f35fcbb9746c",
-    "Matthew": "57a4fdd1-6cac-4264-ad8d-809aef763ee1",
-    "C-Pat": "5ac3e47e-68d3-4a66-a6ae-47376bdd9faf",
-    "Eric": "989f9143-2f6b-4060-8875-20feb87ead55",
-    "Ben": "e2fc862d-3f4b-49f7-ac6f-97abecaad00e",
-    "Gary": "e0928ef5-83fe-440c-8a1c-76704f4886af",
-    "Chris": "6e49119a-2050-4e50-be46-42c2e89451b8",
-    "Jauch": "2dcc566e-b465-431b-90a1-0f9791de614e",
-}
 
-COURSES = {
-    1: {"name": "Terra Lago North", "id": "9333b881-441e-43f0-9aa8-efe8f9dcd203", "par": 72},
-    2: {"name": "PGA West Mountain", "id": "fb74b2c0-b9df-4926-8867-13d83a2cdf7f", "par": 72},
-    3: {"name": "Eagle Falls", "id": "6a96b6d2-9271-4191-ba6c-da0232a9ca46", "par": 72},
-}
+BUILTIN = PlanData(PLAYERS, PLAYER_IDS, COURSES, HOLES, CH, TEES, TEAMS, GROUPS, MATCH_GROUPS)
 
-# Hole data: {day: [(hole_num, par, hdcp_rank), ...]}
-HOLES = {
-    1: [  # Terra Lago North
-        (1, 4, 9), (2, 4, 15), (3, 3, 17), (4, 5, 7), (5, 4, 1), (6, 4, 11),
-        (7, 3, 13), (8, 5, 5), (9, 4, 3), (10, 4, 10), (11, 4, 16), (12, 3, 18),
-        (13, 5, 8), (14, 4, 2), (15, 4, 12), (16, 3, 14), (17, 5, 6), (18, 4, 4),
-    ],
-    2: [  # PGA West Mountain
-        (1, 4, 9), (2, 5, 5), (3, 4, 13), (4, 3, 17), (5, 4, 3), (6, 4, 11),
-        (7, 5, 1), (8, 3, 15), (9, 4, 7), (10, 4, 10), (11, 4, 14), (12, 3, 18),
-        (13, 5, 6), (14, 4, 2), (15, 4, 12), (16, 3, 16), (17, 5, 4), (18, 4, 8),
-    ],
-    3: [  # Eagle Falls
-        (1, 4, 7), (2, 5, 3), (3, 3, 15), (4, 4, 11), (5, 4, 1), (6, 3, 17),
-        (7, 5, 5), (8, 4, 9), (9, 4, 13), (10, 4, 8), (11, 4, 4), (12, 3, 18),
-        (13, 5, 2), (14, 4, 10), (15, 4, 6), (16, 3, 16), (17, 5, 12), (18, 4, 14),
-    ],
-}
 
-# Course handicaps (from Supabase — verified correct)
-CH = {
-    "Ryan":    {1: 14, 2: 11, 3: 8},
-    "Kiki":    {1: 11, 2: 6,  3: 8},
-    "Mack":    {1: 12, 2: 11, 3: 9},
-    "Bruce":   {1: 16, 2: 12, 3: 10},
-    "Matthew": {1: 16, 2: 14, 3: 10},
-    "C-Pat":   {1: 17, 2: 9,  3: 11},
-    "Eric":    {1: 16, 2: 14, 3: 13},
-    "Ben":     {1: 22, 2: 20, 3: 19},
-    "Gary":    {1: 26, 2: 20, 3: 23},
-    "Chris":   {1: 35, 2: 33, 3: 32},
-    "Jauch":   {1: 42, 2: 35, 3: 38},
-}
+def plan_data(rows):
+    """
+    PlanData from the app's tables. `rows(table)` returns a table's rows;
+    it is called once for each of PLAN_TABLES and for nothing else, and
+    every table is indexed by id in one pass.
+    """
+    players = sorted(rows("players"), key=lambda p: (p.get("display_order") or 0, p["name"]))
+    names = {p["id"]: p["name"] for p in players}
+    order = {p["name"]: i for i, p in enumerate(players)}
+    courses = {c["day_number"]: {"name": c["name"], "id": c["id"], "par": c["par_total"]}
+               for c in sorted(rows("courses"), key=lambda c: c["day_number"])}
+    day_of = {c["id"]: day for day, c in courses.items()}
+    tee_rows = {t["id"]: (t["name"], t["rating"], t["slope"]) for t in rows("tees")}
 
-# Tee info for reference
-TEES = {
-    "Ryan":    {1: ("Black", 74.7, 139), 2: ("Black", 72.8, 135), 3: ("Hawk", 70.0, 127)},
-    "Kiki":    {1: ("Yellow", 71.9, 132), 2: ("Silver", 68.3, 122), 3: ("Hawk", 70.0, 127)},
-    "Mack":    {1: ("Yellow", 71.9, 132), 2: ("Black/White", 71.8, 132), 3: ("Hawk", 70.0, 127)},
-    "Bruce":   {1: ("Black", 74.7, 139), 2: ("Black/White", 71.8, 132), 3: ("Hawk", 70.0, 127)},
-    "Matthew": {1: ("Black", 74.7, 139), 2: ("Black", 72.8, 135), 3: ("Hawk", 70.0, 127)},
-    "C-Pat":   {1: ("Black", 74.7, 139), 2: ("Silver", 68.3, 122), 3: ("Hawk", 70.0, 127)},
-    "Eric":    {1: ("Yellow", 71.9, 132), 2: ("White", 70.8, 129), 3: ("Hawk", 70.0, 127)},
-    "Ben":     {1: ("Yellow", 71.9, 132), 2: ("White", 70.8, 129), 3: ("Hawk", 70.0, 127)},
-    "Gary":    {1: ("Yellow", 71.9, 132), 2: ("Silver", 68.3, 122), 3: ("Hawk", 70.0, 127)},
-    "Chris":   {1: ("Yellow", 71.9, 132), 2: ("White", 70.8, 129), 3: ("Hawk", 70.0, 127)},
-    "Jauch":   {1: ("Yellow", 71.9, 132), 2: ("Silver", 68.3, 122), 3: ("Hawk", 70.0, 127)},
-}
+    holes = {day: [] for day in courses}
+    for h in rows("holes"):
+        if h["course_id"] in day_of:
+            holes[day_of[h["course_id"]]].append((h["hole_number"], h["par"], h["handicap_rank"]))
+    ch, tees = {name: {} for name in order}, {name: {} for name in order}
+    for a in rows("player_tee_assignments"):
+        name, day = names.get(a["player_id"]), day_of.get(a["course_id"])
+        if name is not None and day is not None and a["tee_id"] in tee_rows:
+            ch[name][day], tees[name][day] = a["course_handicap"], tee_rows[a["tee_id"]]
+
+    missing = [f"holes for day {day}" for day, h in holes.items() if not h]
+    missing += [f"{name}'s tee on day {day}" for name in order for day in courses if day not in ch[name]]
+    if not players or not courses or missing:
+        raise ValueError("plan inputs incomplete: " + (", ".join(missing[:5]) or "no players or courses"))
+    # PlanEngine keeps holes as [day, hole] arrays
+    if len({len(h) for h in holes.values()}) > 1:
+        raise ValueError("plan needs the same number of holes every day: "
+                         + ", ".join(f"day {day} has {len(h)}" for day, h in holes.items()))
+
+    teams = {}
+    for p in players:
+        if p.get("team"):
+            teams.setdefault(p["team"], []).append(p["name"])
+
+    first_day = min(courses)
+    groups = sorted((g for g in rows("groups") if g["day_number"] == first_day), key=lambda g: g["group_number"])
+    members = {g["id"]: [] for g in groups}
+    for gp in rows("group_players"):
+        if gp["group_id"] in members and gp["player_id"] in names:
+            members[gp["group_id"]].append(names[gp["player_id"]])
+    group_rows = [(g["group_number"], sorted(members[g["id"]], key=order.get), g["format"]) for g in groups]
+
+    group_number = {g["id"]: g["group_number"] for g in groups}
+    matches = sorted((m for m in rows("matches") if m["group_id"] in group_number),
+                     key=lambda m: (group_number[m["group_id"]], m["match_number"]))
+    sides = {m["id"]: ([], []) for m in matches}
+    for mp in rows("match_players"):
+        if mp["match_id"] in sides and mp["player_id"] in names:
+            sides[mp["match_id"]][mp["side"] == "b"].append(names[mp["player_id"]])
+    day_ch = {name: ch[name][first_day] for name in order}
+    match_groups = _pick_match_groups([tuple(sorted(side, key=order.get) for side in sides[m["id"]])
+                                       for m in matches], day_ch)
+
+    return PlanData([(p["name"], p["handicap_index"]) for p in players],
+                    {p["name"]: p["id"] for p in players},
+                    courses, {day: sorted(h) for day, h in holes.items()}, ch, tees,
+                    teams, group_rows, match_groups)
+
+
+def _pick_match_groups(sides, day_ch):
+    """
+    Section 4 sides: the first pairs match, the first singles match and
+    the singles match with the highest combined CH. Without matches, the
+    four lowest CHs play pairs, the middle two singles and the top two
+    the high HC singles.
+    """
+    pairs = [s for s in sides if len(s[0]) == len(s[1]) == 2]
+    singles = [s for s in sides if len(s[0]) == len(s[1]) == 1]
+    by_ch = sorted(day_ch, key=day_ch.get)
+    mid = max(len(by_ch) // 2 - 1, 0)
+    return {
+        "pairs": pairs[0] if pairs else ([by_ch[0], by_ch[2]], [by_ch[1], by_ch[3]]),
+        "singles": singles[0] if singles else ([by_ch[mid]], [by_ch[mid + 1]]),
+        "high_singles": max(singles, key=lambda s: day_ch[s[0][0]] + day_ch[s[1][0]])
+        if singles else ([by_ch[-2]], [by_ch[-1]]),
+    }
+
+
+def load_plan_data(snapshot=None, catalog=None, at=None, reference=None):
+    """
+    PlanData from a snapshot file or a catalog (as of `at`, default its
+    latest backup), else BUILTIN. Tables a snapshot lacks come from the
+    `reference` snapshot; holes, tees and tee assignments still missing
+    come from the built-in trip, with a warning on stderr.
+    """
+    if catalog is not None:
+        from backup.catalog import Catalog
+        with Catalog(catalog) as cat:
+            at = at or cat.latest()
+            return plan_data(_or_builtin(lambda table: cat.rows_at(table, at)))
+    if snapshot is None:
+        return BUILTIN
+    from backup import load_snapshot
+    bundle = load_snapshot(snapshot)
+    extra = load_snapshot(reference) if reference else {}
+    return plan_data(_or_builtin(lambda table: bundle.get(table) or extra.get(table, [])))
+
+
+def _or_builtin(rows):
+    """`rows`, with the built-in trip's rows for the tables it has none of."""
+    builtin = builtin_tables()
+
+    def rows_or_builtin(table):
+        found = rows(table)
+        if found or table not in builtin:
+            return found
+        print(f"WARNING: no {table} in the backup; using the built-in trip's", file=sys.stderr)
+        return builtin[table]
+    return rows_or_builtin
 
 
 # ============================================================
 # SCORING FUNCTIONS (match handicap.ts exactly)
 # ============================================================
 
-def calc_strokes_on_hole(handicap, hole_handicap_rank):
-    """Matches calcStrokesOnHole in handicap.ts"""
-    if handicap >= 36:
-        return 3 if hole_handicap_rank <= (handicap - 36) else 2
-    elif handicap >= 18:
-        return 2 if hole_handicap_rank <= (handicap - 18) else 1
-    else:
-        return 1 if hole_handicap_rank <= handicap else 0
+# calc_strokes_on_hole, calc_playing_handicap and calc_course_handicap are
+# table lookups in scoring/handicap.py
 
 def calc_net_score(gross, strokes, par, net_max_over_par):
     """Matches calcNetScore in handicap.ts"""
@@ -106,76 +201,109 @@ def calc_net_score(gross, strokes, par, net_max_over_par):
     cap = par + strokes + net_max_over_par
     return min(raw, cap)
 
-def calc_playing_handicap(player_ch, min_group_ch):
-    return player_ch - min_group_ch
+
+# ============================================================
+# STROKE / NET ENGINE (players × days × holes arrays)
+# ============================================================
+
+class PlanEngine:
+    """
+    Every number in the plan, as arrays built once from the players, CHs and holes:
+
+      ch       [player, day]          course handicap
+      par/rank [day, hole]            hole data (hole_num holds the numbers)
+      strokes  [player, day, hole]    CH strokes
+
+    Scenario grosses and nets are whole-array operations on top of these,
+    cached per scenario, and every section renders from the cached arrays.
+    """
+
+    def __init__(self, players, ch, holes):
+        self.names = [name for name, _ in players]
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.days = sorted(holes)
+        self.day_index = {day: i for i, day in enumerate(self.days)}
+        self.hole_num = np.array([[h[0] for h in holes[day]] for day in self.days])
+        self.par = np.array([[h[1] for h in holes[day]] for day in self.days])
+        self.rank = np.array([[h[2] for h in holes[day]] for day in self.days])
+        self.ch = np.array([[ch[name][day] for day in self.days] for name in self.names])
+        self.strokes = calc_strokes_array(self.ch[:, :, None], self.rank[None])
+        self._gross = {}
+        self._net = {}
+
+    def gross(self, scenario):
+        """[player, day, hole] gross scores of a scenario."""
+        if scenario not in self._gross:
+            names = np.array(self.names)[:, None, None]
+            gross = scenario(names, self.hole_num[None], self.par[None], self.rank[None], self.ch[:, :, None])
+            self._gross[scenario] = np.broadcast_to(gross, self.strokes.shape)
+        return self._gross[scenario]
+
+    def net(self, scenario, net_max=3):
+        """[player, day, hole] CH-net scores of a scenario."""
+        key = (scenario, net_max)
+        if key not in self._net:
+            self._net[key] = calc_net_array(self.gross(scenario), self.strokes, self.par[None], net_max)
+        return self._net[key]
 
 
 # ============================================================
 # GENERATE FULL STROKE TABLES
 # ============================================================
 
-def generate_stroke_table(day):
+def generate_stroke_table(engine, day):
     """Generate full stroke table for a day."""
     lines = []
-    holes = HOLES[day]
+    d = engine.day_index[day]
+    strokes = engine.strokes[:, d]
+    totals = strokes.sum(axis=1)
     
     # Header
     header = f"| Player | CH |"
-    for h_num, _, _ in holes:
+    for h_num in engine.hole_num[d]:
         header += f" H{h_num} |"
     header += " Tot |"
     lines.append(header)
     
     sep = "|--------|-----|"
-    for _ in holes:
+    for _ in engine.hole_num[d]:
         sep += "-----|"
     sep += "-----|"
     lines.append(sep)
     
-    for name, _ in PLAYERS:
-        ch = CH[name][day]
-        row = f"| {name:7s} | {ch:3d} |"
-        total = 0
-        for _, par, hdcp_rank in holes:
-            s = calc_strokes_on_hole(ch, hdcp_rank)
-            total += s
-            row += f"  {s}  |"
-        row += f" {total:3d} |"
+    for i, name in enumerate(engine.names):
+        row = f"| {name:7s} | {engine.ch[i, d]:3d} |"
+        row += "".join(f"  {s}  |" for s in strokes[i].tolist())
+        row += f" {totals[i]:3d} |"
         lines.append(row)
     
     return "\n".join(lines)
 
 
-def generate_net_score_table(day, scenario_name, gross_func, net_max=3):
+def generate_net_score_table(engine, day, scenario_name, gross_func, net_max=3):
     """Generate net score table for a test scenario."""
     lines = []
-    holes = HOLES[day]
+    d = engine.day_index[day]
+    gross = engine.gross(gross_func)[:, d]
+    net = engine.net(gross_func, net_max)[:, d]
+    total_gross, total_net = gross.sum(axis=1), net.sum(axis=1)
     
     header = f"| Player | CH |"
-    for h_num, _, _ in holes:
+    for h_num in engine.hole_num[d]:
         header += f" H{h_num} |"
     header += " Gross | Net |"
     lines.append(header)
     
     sep = "|--------|-----|"
-    for _ in holes:
+    for _ in engine.hole_num[d]:
         sep += "------|"
     sep += "-------|------|"
     lines.append(sep)
     
-    for name, _ in PLAYERS:
-        ch = CH[name][day]
-        row = f"| {name:7s} | {ch:3d} |"
-        total_gross = 0
-        total_net = 0
-        for h_num, par, hdcp_rank in holes:
-            gross = gross_func(name, h_num, par, hdcp_rank, ch)
-            strokes = calc_strokes_on_hole(ch, hdcp_rank)
-            net = calc_net_score(gross, strokes, par, net_max)
-            total_gross += gross
-            total_net += net
-            row += f" {gross}/{net} |"
-        row += f"  {total_gross:4d} | {total_net:4d} |"
+    for i, name in enumerate(engine.names):
+        row = f"| {name:7s} | {engine.ch[i, d]:3d} |"
+        row += "".join(f" {g}/{n} |" for g, n in zip(gross[i].tolist(), net[i].tolist()))
+        row += f"  {total_gross[i]:4d} | {total_net[i]:4d} |"
         lines.append(row)
     
     return "\n".join(lines)
@@ -184,6 +312,8 @@ def generate_net_score_table(day, scenario_name, gross_func, net_max=3):
 # ============================================================
 # TEST SCENARIOS
 # ============================================================
+# Each takes (name, h_num, par, hdcp_rank, ch) as scalars or as arrays that
+# broadcast together, so the engine scores a whole scenario in one call.
 
 def scenario_par_plus_2(name, h_num, par, hdcp_rank, ch):
     """Everyone shoots par+2 on every hole."""
@@ -194,24 +324,19 @@ def scenario_mixed_realistic(name, h_num, par, hdcp_rank, ch):
     # Low handicappers: par to bogey
     # High handicappers: bogey to triple
     # Specific holes trigger net cap and tiebreaker scenarios
-    if ch <= 12:  # Ryan, Kiki, Mack
-        base = par + (1 if hdcp_rank <= 9 else 0)  # bogey on hard holes, par on easy
-        if h_num == 5:  # birdie on hole 5 for all low HC
-            return par - 1
-        return base
-    elif ch <= 17:  # Bruce, Matthew, C-Pat, Eric
-        base = par + 1  # bogey everywhere
-        if h_num == 13:  # birdie on hole 13
-            return par - 1
-        if h_num == 1:  # double on hole 1
-            return par + 2
-        return base
-    elif ch <= 23:  # Ben, Gary
-        return par + 2  # double bogey everywhere
-    else:  # Chris, Jauch — very high HC
-        if h_num == 3 or h_num == 12:  # par 3s: hit 10 (tests net cap)
-            return 10
-        return par + 3  # triple bogey
+    return np.select(
+        [ch <= 12, ch <= 17, ch <= 23],
+        [
+            # Ryan, Kiki, Mack: bogey on hard holes, par on easy, birdie on hole 5
+            np.where(h_num == 5, par - 1, par + (hdcp_rank <= 9)),
+            # Bruce, Matthew, C-Pat, Eric: bogey everywhere, birdie on 13, double on 1
+            np.where(h_num == 13, par - 1, np.where(h_num == 1, par + 2, par + 1)),
+            # Ben, Gary: double bogey everywhere
+            par + 2,
+        ],
+        # Chris, Jauch — very high HC: triple bogey, par 3s hit 10 (tests net cap)
+        np.where((h_num == 3) | (h_num == 12), 10, par + 3),
+    )
 
 def scenario_net_cap_stress(name, h_num, par, hdcp_rank, ch):
     """Everyone shoots 15 on every hole — stresses the net cap."""
@@ -219,33 +344,101 @@ def scenario_net_cap_stress(name, h_num, par, hdcp_rank, ch):
 
 def scenario_ace_and_eagle(name, h_num, par, hdcp_rank, ch):
     """Hole-in-one on par 3s, eagle on par 5s, par elsewhere."""
-    if par == 3:
-        return 1  # ace
-    elif par == 5:
-        return 3  # eagle
-    else:
-        return par  # par on 4s
+    return np.select([par == 3, par == 5], [1, 3], par)  # ace, eagle, par on 4s
 
 
 # ============================================================
 # MATCH FORMAT TEST SCENARIOS
 # ============================================================
 
-def generate_match_scenario(format_name, format_code, team_a_players, team_b_players, day, gross_func, net_max=3):
+def match_hole_points(format_code, a_nets, b_nets):
+    """
+    Per-hole (team A points, team B points, result labels) for one match,
+    from [player, hole] PH-net arrays of each side.
+    """
+    a_pts, b_pts = match_points(format_code, a_nets, b_nets)
+    n = a_nets.shape[1]
+    results = [""] * n
+    if format_code in ("best_ball_validation", "best_ball"):
+        best_a, best_b = a_nets.min(axis=0), b_nets.min(axis=0)
+        worst_a, worst_b = a_nets.max(axis=0), b_nets.max(axis=0)
+        validate = format_code == "best_ball_validation"
+        for h in range(n):
+            if best_a[h] != best_b[h]:
+                results[h] = f"{'A' if a_pts[h] else 'B'} ({best_a[h]} vs {best_b[h]})"
+            elif validate and worst_a[h] != worst_b[h]:
+                results[h] = f"{'A' if a_pts[h] else 'B'}-val ({worst_a[h]} vs {worst_b[h]})"
+            else:
+                results[h] = "Tie"
+    elif format_code == "low_total":
+        low_a, low_b = a_nets.min(axis=0), b_nets.min(axis=0)
+        total_a, total_b = a_nets.sum(axis=0), b_nets.sum(axis=0)
+        for h in range(n):
+            low = "Low=Tie" if low_a[h] == low_b[h] else f"Low→{'A' if low_a[h] < low_b[h] else 'B'}"
+            tot = "Tot=Tie" if total_a[h] == total_b[h] else f"Tot→{'A' if total_a[h] < total_b[h] else 'B'}"
+            results[h] = f"{low} {tot}"
+    elif format_code == "singles_match":
+        net_a, net_b = a_nets[0], b_nets[0]
+        for h in range(n):
+            if net_a[h] == net_b[h]:
+                results[h] = f"Tie ({net_a[h]})"
+            else:
+                results[h] = f"{'A' if net_a[h] < net_b[h] else 'B'} ({net_a[h]} vs {net_b[h]})"
+    return a_pts, b_pts, results
+
+
+def _points_total(points, fractional):
+    """Sum as the old running total printed: an int unless half points were involved."""
+    total = float(points.sum())
+    return total if fractional else int(total)
+
+
+def match_result(engine, format_code, team_a_players, team_b_players, day, gross_func, net_max=3):
+    """
+    Playing handicaps and [player, hole] gross, PH strokes and PH-net of
+    one match, with the per-hole points and result labels.
+    """
+    d = engine.day_index[day]
+    idx = [engine.index[p] for p in team_a_players + team_b_players]
+    chs = engine.ch[idx, d]
+    phs = calc_playing_handicap(chs, chs.min())
+    par, rank = engine.par[d], engine.rank[d]
+    gross = engine.gross(gross_func)[idx, d]
+    ph_strokes = calc_strokes_array(phs[:, None], rank[None])
+    ph_net = calc_net_array(gross, ph_strokes, par[None], net_max)
+    n_a = len(team_a_players)
+    if format_code == "singles_stroke":
+        a_pts, b_pts = match_points(format_code, ph_net[:n_a], ph_net[n_a:])
+        results = [""] * len(par)
+    else:
+        a_pts, b_pts, results = match_hole_points(format_code, ph_net[:n_a], ph_net[n_a:])
+    return phs, gross, ph_strokes, ph_net, a_pts, b_pts, results
+
+
+def final_points(a_pts, b_pts):
+    """(team A total, team B total, A match point, B match point)."""
+    fractional = bool((a_pts % 1).any())
+    team_a_total = _points_total(a_pts, fractional)
+    team_b_total = _points_total(b_pts, fractional)
+    if team_a_total > team_b_total:
+        return team_a_total, team_b_total, 1, 0
+    elif team_b_total > team_a_total:
+        return team_a_total, team_b_total, 0, 1
+    return team_a_total, team_b_total, 0.5, 0.5
+
+
+def generate_match_scenario(engine, format_name, format_code, team_a_players, team_b_players, day, gross_func, net_max=3):
     """Generate expected match results for a format."""
     lines = []
-    holes = HOLES[day]
-    
-    # Calculate playing handicaps
+    d = engine.day_index[day]
     all_players = team_a_players + team_b_players
-    chs = {p: CH[p][day] for p in all_players}
-    min_ch = min(chs.values())
-    phs = {p: chs[p] - min_ch for p in all_players}
+    phs, gross, ph_strokes, ph_net, a_pts, b_pts, results = match_result(
+        engine, format_code, team_a_players, team_b_players, day, gross_func, net_max)
     
     lines.append(f"**Format:** {format_name} (`{format_code}`)")
     lines.append(f"**Team A:** {', '.join(team_a_players)}")
     lines.append(f"**Team B:** {', '.join(team_b_players)}")
-    lines.append(f"**Playing Handicaps:** " + ", ".join(f"{p}={phs[p]}" for p in all_players))
+    lines.append(f"**Playing Handicaps:** " + ", ".join(f"{p}={ph}" for p, ph in zip(all_players, phs.tolist())))
     lines.append("")
     
     header = "| Hole | Par |"
@@ -260,502 +453,646 @@ def generate_match_scenario(format_name, format_code, team_a_players, team_b_pla
     sep += "--------|"
     lines.append(sep)
     
-    team_a_total = 0
-    team_b_total = 0
-    
-    for h_num, par, hdcp_rank in holes:
-        row = f"| {h_num:4d} | {par:3d} |"
-        
-        a_nets = []
-        b_nets = []
-        
-        for p in all_players:
-            gross = gross_func(p, h_num, par, hdcp_rank, CH[p][day])
-            ph_strokes = calc_strokes_on_hole(phs[p], hdcp_rank)
-            ph_net = calc_net_score(gross, ph_strokes, par, net_max)
-            row += f" {gross}/{ph_net}({ph_strokes}s) |"
-            
-            if p in team_a_players:
-                a_nets.append(ph_net)
-            else:
-                b_nets.append(ph_net)
-        
-        # Calculate result based on format
-        result = ""
-        if format_code in ("best_ball_validation", "best_ball"):
-            best_a = min(a_nets)
-            best_b = min(b_nets)
-            if best_a < best_b:
-                team_a_total += 1
-                result = f"A ({best_a} vs {best_b})"
-            elif best_b < best_a:
-                team_b_total += 1
-                result = f"B ({best_a} vs {best_b})"
-            else:
-                if format_code == "best_ball_validation":
-                    worst_a = max(a_nets)
-                    worst_b = max(b_nets)
-                    if worst_a < worst_b:
-                        team_a_total += 1
-                        result = f"A-val ({worst_a} vs {worst_b})"
-                    elif worst_b < worst_a:
-                        team_b_total += 1
-                        result = f"B-val ({worst_a} vs {worst_b})"
-                    else:
-                        result = "Tie"
-                else:
-                    result = "Tie"
-        elif format_code == "low_total":
-            low_a = min(a_nets)
-            low_b = min(b_nets)
-            total_a = sum(a_nets)
-            total_b = sum(b_nets)
-            pts = []
-            if low_a < low_b:
-                team_a_total += 1; pts.append("Low→A")
-            elif low_b < low_a:
-                team_b_total += 1; pts.append("Low→B")
-            else:
-                pts.append("Low=Tie")
-            if total_a < total_b:
-                team_a_total += 1; pts.append("Tot→A")
-            elif total_b < total_a:
-                team_b_total += 1; pts.append("Tot→B")
-            else:
-                pts.append("Tot=Tie")
-            result = " ".join(pts)
-        elif format_code in ("singles_match", "singles_stroke"):
-            net_a = a_nets[0]
-            net_b = b_nets[0]
-            if format_code == "singles_match":
-                if net_a < net_b:
-                    team_a_total += 1; result = f"A ({net_a} vs {net_b})"
-                elif net_b < net_a:
-                    team_b_total += 1; result = f"B ({net_a} vs {net_b})"
-                else:
-                    team_a_total += 0.5; team_b_total += 0.5; result = f"Tie ({net_a})"
-        
-        row += f" {result} |"
+    for h, (h_num, p) in enumerate(zip(engine.hole_num[d].tolist(), engine.par[d].tolist())):
+        row = f"| {h_num:4d} | {p:3d} |"
+        for i in range(len(all_players)):
+            row += f" {gross[i, h]}/{ph_net[i, h]}({ph_strokes[i, h]}s) |"
+        row += f" {results[h]} |"
         lines.append(row)
     
+    team_a_total, team_b_total, a_match, b_match = final_points(a_pts, b_pts)
     lines.append("")
     lines.append(f"**Final Score:** Team A: {team_a_total} — Team B: {team_b_total}")
-    
-    if team_a_total > team_b_total:
-        lines.append(f"**Match Points:** A=1, B=0")
-    elif team_b_total > team_a_total:
-        lines.append(f"**Match Points:** A=0, B=1")
-    else:
-        lines.append(f"**Match Points:** A=0.5, B=0.5")
+    lines.append(f"**Match Points:** A={a_match}, B={b_match}")
     
     return "\n".join(lines)
 
 
 # ============================================================
-# MAIN: Generate the full testing plan
+# RENDERING: one generator of lines per section part
 # ============================================================
+# Each part takes (data, engine, *args) and yields the plan's lines for
+# one day, scenario or match. Parts only read the data and the engine, so
+# they render in any order (or in other processes) and join back up in
+# plan order.
 
-def main():
-    out = []
-    
-    out.append(f"# Degen Dudes — Comprehensive Scoring Test Plan")
-    out.append(f"## Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')} by Opus 4.6")
-    out.append(f"## Purpose: Ground truth for ALL automated scoring verification")
-    out.append("")
-    out.append("**This file supersedes the previous TESTING-PLAN.md which had 9 incorrect CH values.**")
-    out.append("All values below are verified against Supabase database and the USGA formula:")
-    out.append("```")
-    out.append("CH = ROUND(HI × (Slope / 113) + (Rating - Par))")
-    out.append("```")
-    out.append("")
-    out.append("---")
-    out.append("")
-    
-    # ========== SECTION 1: CH Verification ==========
-    out.append("## Section 1: Course Handicap Verification")
-    out.append("")
-    out.append("These are the values stored in Supabase `player_tee_assignments.course_handicap`.")
-    out.append("The test suite should verify the app calculates these correctly.")
-    out.append("")
-    
-    for day in [1, 2, 3]:
-        course = COURSES[day]
-        out.append(f"### Day {day}: {course['name']} (Par {course['par']})")
-        out.append("")
-        out.append("| Player | HI | Tee | Rating | Slope | Calculation | Expected CH |")
-        out.append("|--------|-----|-----|--------|-------|-------------|-------------|")
+def plan_header(data, engine):
+    """Title block; the only part that changes on every run."""
+    yield f"# Degen Dudes — Comprehensive Scoring Test Plan"
+    yield f"## Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')} by Opus 4.6"
+    yield f"## Purpose: Ground truth for ALL automated scoring verification"
+    yield ""
+    yield "**This file supersedes the previous TESTING-PLAN.md which had 9 incorrect CH values.**"
+    yield "All values below are verified against Supabase database and the USGA formula:"
+    yield "```"
+    yield "CH = ROUND(HI × (Slope / 113) + (Rating - Par))"
+    yield "```"
+    yield ""
+    yield "---"
+    yield ""
+
+
+def section_1(data, engine, day):
+    """Section 1: course handicaps for one day."""
+    if day == engine.days[0]:
+        yield "## Section 1: Course Handicap Verification"
+        yield ""
+        yield "These are the values stored in Supabase `player_tee_assignments.course_handicap`."
+        yield "The test suite should verify the app calculates these correctly."
+        yield ""
+    course = data.courses[day]
+    yield f"### Day {day}: {course['name']} (Par {course['par']})"
+    yield ""
+    yield "| Player | HI | Tee | Rating | Slope | Calculation | Expected CH |"
+    yield "|--------|-----|-----|--------|-------|-------------|-------------|"
         
-        for name, hi in PLAYERS:
-            ch = CH[name][day]
-            tee_name, rating, slope = TEES[name][day]
-            raw = hi * (slope / 113) + (rating - 72)
-            out.append(f"| {name} | {hi} | {tee_name} | {rating} | {slope} | ROUND({raw:.4f}) | **{ch}** |")
-        out.append("")
-    
-    # ========== SECTION 2: Stroke Distribution Tables ==========
-    out.append("---")
-    out.append("")
-    out.append("## Section 2: Stroke Distribution (CH Strokes per Hole)")
-    out.append("")
-    out.append("Shows how many strokes each player gets on each hole based on their Course Handicap.")
-    out.append("Formula: CH≥36 → 3 strokes if rank≤(CH-36), else 2; CH≥18 → 2 if rank≤(CH-18), else 1; else 1 if rank≤CH, else 0")
-    out.append("")
-    
-    for day in [1, 2, 3]:
-        course = COURSES[day]
-        out.append(f"### Day {day}: {course['name']}")
-        out.append("")
+    tee_ch = course_handicap_table({hi for _, hi in data.players},
+                                   {data.tees[name][day] for name, _ in data.players}, course["par"])
+    for name, hi in data.players:
+        ch, computed = data.ch[name][day], tee_ch[(hi, data.tees[name][day])]
+        tee_name, rating, slope = data.tees[name][day]
+        raw = course_handicap_unrounded(hi, slope, rating, course["par"])
+        calculation = f"ROUND({raw:.4f})" if computed == ch else f"ROUND({raw:.4f}) = {computed} ⚠️ ≠ stored"
+        yield f"| {name} | {hi} | {tee_name} | {rating} | {slope} | {calculation} | **{ch}** |"
+    yield ""
+
+
+def section_2(data, engine, day):
+    """Section 2: stroke distribution for one day."""
+    if day == engine.days[0]:
+        yield "---"
+        yield ""
+        yield "## Section 2: Stroke Distribution (CH Strokes per Hole)"
+        yield ""
+        yield "Shows how many strokes each player gets on each hole based on their Course Handicap."
+        yield "Formula: CH≥36 → 3 strokes if rank≤(CH-36), else 2; CH≥18 → 2 if rank≤(CH-18), else 1; else 1 if rank≤CH, else 0"
+        yield ""
+    course = data.courses[day]
+    yield f"### Day {day}: {course['name']}"
+    yield ""
         
-        # Hole info sub-header
-        holes = HOLES[day]
-        hole_info = "| | |"
-        for h_num, par, rank in holes:
-            hole_info += f" P{par}/R{rank} |"
-        hole_info += " |"
-        out.append(hole_info)
-        out.append("")
+    # Hole info sub-header
+    holes = data.holes[day]
+    hole_info = "| | |"
+    for h_num, par, rank in holes:
+        hole_info += f" P{par}/R{rank} |"
+    hole_info += " |"
+    yield hole_info
+    yield ""
         
-        out.append(generate_stroke_table(day))
-        out.append("")
-    
-    # ========== SECTION 3: Test Scenarios ==========
-    out.append("---")
-    out.append("")
-    out.append("## Section 3: Test Scenarios with Expected Net Scores")
-    out.append("")
-    out.append("Each cell shows `gross/net`. NET_MAX_OVER_PAR = 3 unless otherwise noted.")
-    out.append("")
-    
-    # Scenario A: Par+2
-    out.append("### Scenario A: Everyone Shoots Par+2 (Baseline)")
-    out.append("")
-    out.append("Simple, easy to verify. Every player scores par+2 on every hole.")
-    out.append("Players with strokes: net = (par+2) - strokes. Players without: net = par+2.")
-    out.append("")
-    
-    for day in [1, 2, 3]:
-        course = COURSES[day]
-        out.append(f"#### Day {day}: {course['name']}")
-        out.append("")
-        out.append(generate_net_score_table(day, "Par+2", scenario_par_plus_2))
-        out.append("")
-    
-    # Scenario B: Mixed realistic
-    out.append("### Scenario B: Mixed Realistic Scores")
-    out.append("")
-    out.append("Low HC (≤12): par on easy holes, bogey on hard, birdie on hole 5.")
-    out.append("Mid HC (13-17): bogey everywhere, birdie on hole 13, double on hole 1.")
-    out.append("High HC (18-23): double bogey everywhere.")
-    out.append("Very high HC (24+): triple bogey, except par 3s score 10 (tests net cap).")
-    out.append("")
-    
-    for day in [1, 2, 3]:
-        course = COURSES[day]
-        out.append(f"#### Day {day}: {course['name']}")
-        out.append("")
-        out.append(generate_net_score_table(day, "Mixed", scenario_mixed_realistic))
-        out.append("")
-    
-    # Scenario C: Net cap stress test
-    out.append("### Scenario C: Net Cap Stress Test (Gross=15 Everywhere)")
-    out.append("")
-    out.append("Every player shoots 15 on every hole. Tests that net_score = min(gross-strokes, par+strokes+NET_MAX_OVER_PAR).")
-    out.append("With NET_MAX_OVER_PAR=3:")
-    out.append("")
-    
-    # Just Day 1 for this — it's a stress test, one day is enough
-    out.append(f"#### Day 1: {COURSES[1]['name']} (NET_MAX_OVER_PAR=3)")
-    out.append("")
-    out.append(generate_net_score_table(1, "Cap3", scenario_net_cap_stress, net_max=3))
-    out.append("")
-    
-    out.append(f"#### Day 1: {COURSES[1]['name']} (NET_MAX_OVER_PAR=2)")
-    out.append("")
-    out.append(generate_net_score_table(1, "Cap2", scenario_net_cap_stress, net_max=2))
-    out.append("")
-    
-    # Scenario D: Aces and eagles
-    out.append("### Scenario D: Aces and Eagles")
-    out.append("")
-    out.append("Hole-in-one on par 3s (gross=1), eagle on par 5s (gross=3), par on par 4s.")
-    out.append("Tests that very low scores are handled correctly (net can go very negative).")
-    out.append("")
-    out.append(f"#### Day 1: {COURSES[1]['name']}")
-    out.append("")
-    out.append(generate_net_score_table(1, "Aces", scenario_ace_and_eagle))
-    out.append("")
-    
-    # ========== SECTION 4: Match Format Verification ==========
-    out.append("---")
-    out.append("")
-    out.append("## Section 4: Match Format Verification")
-    out.append("")
-    out.append("Tests all 5 match formats with controlled scores. Uses Day 1 data.")
-    out.append("Playing Handicap (PH) = player CH - min(group CH). Match points use PH-based net scores.")
-    out.append("")
-    
-    # Test groups for format verification
-    # Group 1: 4 players (pairs formats)
-    g1 = {"a": ["Ryan", "Mack"], "b": ["Kiki", "Bruce"]}
-    # Group 2: 2 players (singles)
-    g2_singles = {"a": ["Eric"], "b": ["Ben"]}
-    # Group 3: High HC singles
-    g3_singles = {"a": ["Chris"], "b": ["Jauch"]}
-    
-    out.append("### 4a: Best Ball + Validation")
-    out.append("")
-    out.append(generate_match_scenario(
-        "Best Ball + Validation", "best_ball_validation",
-        g1["a"], g1["b"], 1, scenario_mixed_realistic
-    ))
-    out.append("")
-    
-    out.append("### 4b: Best Ball (No Validation)")
-    out.append("")
-    out.append(generate_match_scenario(
-        "Best Ball", "best_ball",
-        g1["a"], g1["b"], 1, scenario_mixed_realistic
-    ))
-    out.append("")
-    
-    out.append("### 4c: Low Ball + Total")
-    out.append("")
-    out.append(generate_match_scenario(
-        "Low Ball + Total", "low_total",
-        g1["a"], g1["b"], 1, scenario_mixed_realistic
-    ))
-    out.append("")
-    
-    out.append("### 4d: Singles Match Play")
-    out.append("")
-    out.append(generate_match_scenario(
-        "Singles Match Play", "singles_match",
-        g2_singles["a"], g2_singles["b"], 1, scenario_mixed_realistic
-    ))
-    out.append("")
-    
-    out.append("### 4e: Singles Match Play (High HC)")
-    out.append("")
-    out.append(generate_match_scenario(
-        "Singles Match Play (High HC)", "singles_match",
-        g3_singles["a"], g3_singles["b"], 1, scenario_mixed_realistic
-    ))
-    out.append("")
-    
-    out.append("### 4f: Singles Stroke Play")
-    out.append("")
-    out.append("Same as singles match play but winner determined by total PH-net across 18 holes, not hole-by-hole.")
-    out.append("Use the same scores from 4d (Eric vs Ben). Sum the PH-net columns. Lower total wins the match point.")
-    out.append("")
+    yield generate_stroke_table(engine, day)
+    yield ""
+
+
+SCENARIO_TEXT = {
+    "A": [
+        "### Scenario A: Everyone Shoots Par+2 (Baseline)",
+        "",
+        "Simple, easy to verify. Every player scores par+2 on every hole.",
+        "Players with strokes: net = (par+2) - strokes. Players without: net = par+2.",
+        "",
+    ],
+    "B": [
+        "### Scenario B: Mixed Realistic Scores",
+        "",
+        "Low HC (≤12): par on easy holes, bogey on hard, birdie on hole 5.",
+        "Mid HC (13-17): bogey everywhere, birdie on hole 13, double on hole 1.",
+        "High HC (18-23): double bogey everywhere.",
+        "Very high HC (24+): triple bogey, except par 3s score 10 (tests net cap).",
+        "",
+    ],
+}
+
+
+def section_3(data, engine, scenario, day=None):
+    """Section 3: scenario A or B for one day, or scenario C or D (first day only)."""
+    first = engine.days[0]
+    if scenario == "A" and day == first:
+        yield "---"
+        yield ""
+        yield "## Section 3: Test Scenarios with Expected Net Scores"
+        yield ""
+        yield "Each cell shows `gross/net`. NET_MAX_OVER_PAR = 3 unless otherwise noted."
+        yield ""
+    if scenario in SCENARIO_TEXT:
+        if day == first:
+            yield from SCENARIO_TEXT[scenario]
+        course = data.courses[day]
+        yield f"#### Day {day}: {course['name']}"
+        yield ""
+        yield generate_net_score_table(engine, day, "Par+2" if scenario == "A" else "Mixed",
+                                       scenario_par_plus_2 if scenario == "A" else scenario_mixed_realistic)
+        yield ""
+    elif scenario == "C":
+        yield "### Scenario C: Net Cap Stress Test (Gross=15 Everywhere)"
+        yield ""
+        yield "Every player shoots 15 on every hole. Tests that net_score = min(gross-strokes, par+strokes+NET_MAX_OVER_PAR)."
+        yield "With NET_MAX_OVER_PAR=3:"
+        yield ""
     
-    # ========== SECTION 5: NET_MAX_OVER_PAR Comparison ==========
-    out.append("---")
-    out.append("")
-    out.append("## Section 5: NET_MAX_OVER_PAR Comparison (2 vs 3)")
-    out.append("")
-    out.append("The app setting `net_max_over_par` is configurable (Admin → Settings). Ben may set it to 2 or 3.")
-    out.append("This section shows how the same gross scores produce different nets under each value.")
-    out.append("")
-    out.append("Using Scenario B (mixed realistic), Day 1, comparing only players where it matters (high HC players):")
-    out.append("")
+        # Just the first day for this — it's a stress test, one day is enough
+        yield f"#### Day {first}: {data.courses[first]['name']} (NET_MAX_OVER_PAR=3)"
+        yield ""
+        yield generate_net_score_table(engine, first, "Cap3", scenario_net_cap_stress, net_max=3)
+        yield ""
     
-    for net_max in [3, 2]:
-        out.append(f"### NET_MAX_OVER_PAR = {net_max}")
-        out.append("")
-        lines_header = "| Player | CH | Hole | Par | Gross | Strokes | Raw Net | Cap | Final Net |"
-        lines_sep = "|--------|-----|------|-----|-------|---------|---------|-----|-----------|"
-        out.append(lines_header)
-        out.append(lines_sep)
+        yield f"#### Day {first}: {data.courses[first]['name']} (NET_MAX_OVER_PAR=2)"
+        yield ""
+        yield generate_net_score_table(engine, first, "Cap2", scenario_net_cap_stress, net_max=2)
+        yield ""
+    else:
+        # Scenario D: Aces and eagles
+        yield "### Scenario D: Aces and Eagles"
+        yield ""
+        yield "Hole-in-one on par 3s (gross=1), eagle on par 5s (gross=3), par on par 4s."
+        yield "Tests that very low scores are handled correctly (net can go very negative)."
+        yield ""
+        yield f"#### Day {first}: {data.courses[first]['name']}"
+        yield ""
+        yield generate_net_score_table(engine, first, "Aces", scenario_ace_and_eagle)
+        yield ""
+
+
+# Section 4 scenarios: (heading, format name, format code, MATCH_GROUPS key)
+MATCH_SCENARIOS = [
+    ("4a: Best Ball + Validation", "Best Ball + Validation", "best_ball_validation", "pairs"),
+    ("4b: Best Ball (No Validation)", "Best Ball", "best_ball", "pairs"),
+    ("4c: Low Ball + Total", "Low Ball + Total", "low_total", "pairs"),
+    ("4d: Singles Match Play", "Singles Match Play", "singles_match", "singles"),
+    ("4e: Singles Match Play (High HC)", "Singles Match Play (High HC)", "singles_match", "high_singles"),
+]
+
+
+def section_4(data, engine, index):
+    """Section 4: one match scenario, or 4f (singles stroke play) after the last."""
+    first = engine.days[0]
+    if index == 0:
+        yield "---"
+        yield ""
+        yield "## Section 4: Match Format Verification"
+        yield ""
+        yield f"Tests all 5 match formats with controlled scores. Uses Day {first} data."
+        yield "Playing Handicap (PH) = player CH - min(group CH). Match points use PH-based net scores."
+        yield ""
+    if index < len(MATCH_SCENARIOS):
+        heading, format_name, format_code, key = MATCH_SCENARIOS[index]
+        team_a, team_b = data.match_groups[key]
+        yield f"### {heading}"
+        yield ""
+        yield generate_match_scenario(engine, format_name, format_code, team_a, team_b, first,
+                                      scenario_mixed_realistic)
+        yield ""
+        return
+    team_a, team_b = data.match_groups["singles"]
+    yield "### 4f: Singles Stroke Play"
+    yield ""
+    yield "Same as singles match play but winner determined by total PH-net across 18 holes, not hole-by-hole."
+    yield f"Use the same scores from 4d ({' & '.join(team_a)} vs {' & '.join(team_b)}). " \
+          "Sum the PH-net columns. Lower total wins the match point."
+    yield ""
+
+
+def section_5(data, engine, net_max):
+    """Section 5: the net cap at one NET_MAX_OVER_PAR (3 comes first)."""
+    first = engine.days[0]
+    if net_max == 3:
+        yield "---"
+        yield ""
+        yield "## Section 5: NET_MAX_OVER_PAR Comparison (2 vs 3)"
+        yield ""
+        yield "The app setting `net_max_over_par` is configurable (Admin → Settings). Ben may set it to 2 or 3."
+        yield "This section shows how the same gross scores produce different nets under each value."
+        yield ""
+        yield f"Using Scenario B (mixed realistic), Day {first}, comparing only players where it matters (high HC players):"
+        yield ""
+    yield f"### NET_MAX_OVER_PAR = {net_max}"
+    yield ""
+    lines_header = "| Player | CH | Hole | Par | Gross | Strokes | Raw Net | Cap | Final Net |"
+    lines_sep = "|--------|-----|------|-----|-------|---------|---------|-----|-----------|"
+    yield lines_header
+    yield lines_sep
         
-        for name in ["Chris", "Jauch"]:
-            ch = CH[name][1]
-            for h_num, par, hdcp_rank in HOLES[1][:6]:  # First 6 holes only
-                gross = scenario_mixed_realistic(name, h_num, par, hdcp_rank, ch)
-                strokes = calc_strokes_on_hole(ch, hdcp_rank)
-                raw = gross - strokes
-                cap = par + strokes + net_max
-                final = min(raw, cap)
-                capped = " ← CAPPED" if raw > cap else ""
-                out.append(f"| {name} | {ch} | {h_num} | {par} | {gross} | {strokes} | {raw} | {cap} | **{final}**{capped} |")
-        out.append("")
-    
-    # ========== SECTION 6: Leaderboard Verification ==========
-    out.append("---")
-    out.append("")
-    out.append("## Section 6: Leaderboard Expected Values")
-    out.append("")
-    out.append("After entering Scenario A (par+2) scores for all 3 days, expected leaderboard standings:")
-    out.append("")
-    
-    leaderboard = []
-    for name, _ in PLAYERS:
-        total_gross = 0
-        total_net = 0
-        total_par = 0
-        for day in [1, 2, 3]:
-            ch = CH[name][day]
-            for h_num, par, hdcp_rank in HOLES[day]:
-                gross = par + 2
-                strokes = calc_strokes_on_hole(ch, hdcp_rank)
-                net = calc_net_score(gross, strokes, par, 3)
-                total_gross += gross
-                total_net += net
-                total_par += par
-        leaderboard.append((name, total_gross, total_net, total_par, total_net - total_par))
-    
-    leaderboard.sort(key=lambda x: x[4])
+    d = engine.day_index[first]
+    gross = engine.gross(scenario_mixed_realistic)[:, d, :6]  # First 6 holes only
+    strokes = engine.strokes[:, d, :6]
+    raw = gross - strokes
+    cap = engine.par[d, :6] + strokes + net_max
+    final = np.minimum(raw, cap)
+    # The two highest CHs, in roster order
+    for i in sorted(np.argsort(engine.ch[:, d], kind="stable")[-2:]):
+        name = engine.names[i]
+        ch = engine.ch[i, d]
+        for h in range(6):
+            h_num, par = engine.hole_num[d, h], engine.par[d, h]
+            capped = " ← CAPPED" if raw[i, h] > cap[i, h] else ""
+            yield f"| {name} | {ch} | {h_num} | {par} | {gross[i, h]} | {strokes[i, h]} | {raw[i, h]} | {cap[i, h]} | **{final[i, h]}**{capped} |"
+    yield ""
+
+
+def leaderboard(engine):
+    """[(name, total gross, total net, total par, net vs par)] after scenario A, best first."""
+    total_gross = engine.gross(scenario_par_plus_2).sum(axis=(1, 2)).tolist()
+    total_net = engine.net(scenario_par_plus_2, 3).sum(axis=(1, 2)).tolist()
+    total_par = int(engine.par.sum())
+    standings = [
+        (name, tg, tn, total_par, tn - total_par)
+        for name, tg, tn in zip(engine.names, total_gross, total_net)
+    ]
+    standings.sort(key=lambda x: x[4])
+    return standings
+
+
+def section_6(data, engine):
+    """Section 6: leaderboard after scenario A on every day."""
+    days = engine.days
+    yield "---"
+    yield ""
+    yield "## Section 6: Leaderboard Expected Values"
+    yield ""
+    yield f"After entering Scenario A (par+2) scores for all {len(days)} days, expected leaderboard standings:"
+    yield ""
     
-    out.append("| Rank | Player | Total Gross | Total Net | vs Par |")
-    out.append("|------|--------|-------------|-----------|--------|")
-    for i, (name, tg, tn, tp, diff) in enumerate(leaderboard, 1):
+    yield "| Rank | Player | Total Gross | Total Net | vs Par |"
+    yield "|------|--------|-------------|-----------|--------|"
+    for i, (name, tg, tn, tp, diff) in enumerate(leaderboard(engine), 1):
         diff_str = f"+{diff}" if diff > 0 else str(diff)
-        out.append(f"| {i} | {name} | {tg} | {tn} | {diff_str} |")
-    out.append("")
-    
-    # ========== SECTION 7: Data Reset & Setup ==========
-    out.append("---")
-    out.append("")
-    out.append("## Section 7: Test Data Management")
-    out.append("")
-    out.append("### Reset Script (run before each test)")
-    out.append("```sql")
-    out.append("DELETE FROM scores;")
-    out.append("DELETE FROM match_players;")
-    out.append("DELETE FROM matches;")
-    out.append("DELETE FROM group_players;")
-    out.append("DELETE FROM groups;")
-    out.append("UPDATE players SET team = NULL;")
-    out.append("```")
-    out.append("")
-    out.append("### Test Team Assignments")
-    out.append("| Team USA | Team Europe |")
-    out.append("|----------|-------------|")
-    out.append("| Ryan | Kiki |")
-    out.append("| Mack | Bruce |")
-    out.append("| Matthew | C-Pat |")
-    out.append("| Eric | Ben |")
-    out.append("| Gary | Chris |")
-    out.append("| Jauch | |")
-    out.append("")
-    out.append("### Test Group Configuration (Day 1)")
-    out.append("| Group | Players | Default Format |")
-    out.append("|-------|---------|----------------|")
-    out.append("| 1 | Ryan, Kiki, Mack, Bruce | best_ball_validation |")
-    out.append("| 2 | Matthew, C-Pat, Eric, Ben | best_ball_validation |")
-    out.append("| 3 | Gary, Chris, Jauch | singles_match |")
-    out.append("")
-    out.append("### Service Role Key Location")
-    out.append("`~/.config/supabase/degen-dudes-service-role` — NEVER display in logs or chat.")
-    out.append("")
-    out.append("### Supabase API Base")
-    out.append("`https://lnnlabbdffowjpaxvnsp.supabase.co/rest/v1/`")
-    out.append("")
+        yield f"| {i} | {name} | {tg} | {tn} | {diff_str} |"
+    yield ""
+
+
+def sections_7_to_9(data, engine):
+    """Sections 7-9: test data, implementation guide and quick reference."""
+    days, first = engine.days, engine.days[0]
+    yield "---"
+    yield ""
+    yield "## Section 7: Test Data Management"
+    yield ""
+    yield "### Reset Script (run before each test)"
+    yield "```sql"
+    yield "DELETE FROM scores;"
+    yield "DELETE FROM match_players;"
+    yield "DELETE FROM matches;"
+    yield "DELETE FROM group_players;"
+    yield "DELETE FROM groups;"
+    yield "UPDATE players SET team = NULL;"
+    yield "```"
+    yield ""
+    yield "### Test Team Assignments"
+    yield "|" + "|".join(f" Team {team} " for team in data.teams) + "|"
+    yield "|" + "|".join("-" * (len(team) + 7) for team in data.teams) + "|"
+    for row in itertools.zip_longest(*data.teams.values(), fillvalue=""):
+        yield "|" + "|".join(f" {name} " if name else " " for name in row) + "|"
+    yield ""
+    yield f"### Test Group Configuration (Day {first})"
+    yield "| Group | Players | Default Format |"
+    yield "|-------|---------|----------------|"
+    for number, names, format_code in data.groups:
+        yield f"| {number} | {', '.join(names)} | {format_code} |"
+    yield ""
+    yield "### Service Role Key Location"
+    yield "`~/.config/supabase/degen-dudes-service-role` — NEVER display in logs or chat."
+    yield ""
+    yield "### Supabase API Base"
+    yield "`https://lnnlabbdffowjpaxvnsp.supabase.co/rest/v1/`"
+    yield ""
     
     # ========== SECTION 8: Test Implementation Guide ==========
-    out.append("---")
-    out.append("")
-    out.append("## Section 8: Test Implementation Guide")
-    out.append("")
-    out.append("### Method 1: Unit Tests (scoring engine)")
-    out.append("")
-    out.append("Import the scoring functions directly and verify against Section 2 & 3 expected values.")
-    out.append("These run instantly, no browser needed.")
-    out.append("")
-    out.append("```typescript")
-    out.append("import { calcStrokesOnHole, calcNetScore, calcCourseHandicap } from '@/lib/scoring'")
-    out.append("")
-    out.append("// Verify every CH value")
-    out.append("test('Ryan Day 1 CH', () => {")
-    out.append("  expect(calcCourseHandicap(8.9, 139, 74.7, 72)).toBe(14)")
-    out.append("})")
-    out.append("")
-    out.append("// Verify strokes on every hole")
-    out.append("test('Jauch Day 1 Hole 5 (rank 1, CH=42) gets 3 strokes', () => {")
-    out.append("  expect(calcStrokesOnHole(42, 1)).toBe(3)")
-    out.append("})")
-    out.append("")
-    out.append("// Verify net scores with cap")
-    out.append("test('net score cap: gross=15, strokes=2, par=4, maxOver=3 → net=9 (capped)', () => {")
-    out.append("  expect(calcNetScore(15, 2, 4, 3)).toBe(9) // cap = 4+2+3 = 9")
-    out.append("})")
-    out.append("```")
-    out.append("")
-    out.append("### Method 2: UI Integration Tests (Playwright)")
-    out.append("")
-    out.append("Enter scores through the real app UI and verify displayed values match expected.")
-    out.append("")
-    out.append("**Test flow:**")
-    out.append("1. Reset test data (API call to Supabase)")
-    out.append("2. Set team assignments (API call)")
-    out.append("3. Create groups via Admin UI or API")
-    out.append("4. Create matches via Admin UI or API")
-    out.append("5. Enter gross scores via Score Entry UI (navigate to day → group → hole → +/- → save)")
-    out.append("6. After each hole: verify net score displayed in score entry matches expected")
-    out.append("7. After all 18 holes: navigate to /scorecards, verify all values")
-    out.append("8. Navigate to /strokes, verify stroke dots match Section 2 tables")
-    out.append("9. Navigate to /leaderboard, verify standings match Section 6")
-    out.append("10. Navigate to /matches, verify match points match Section 4")
-    out.append("")
-    out.append("**Multi-user simulation:**")
-    out.append("3 browser contexts entering scores simultaneously (one per group).")
-    out.append("4th context on /leaderboard verifying real-time updates.")
-    out.append("")
-    out.append("**Undo test:**")
-    out.append("1. Enter gross=6 for Eric on Hole 1 → verify net displayed")
-    out.append("2. Click Undo → verify previous value restored")
-    out.append("3. Enter gross=7 → verify new net displayed")
-    out.append("4. Navigate to /history → verify all 3 entries visible")
-    out.append("")
-    out.append("### Playwright Config Notes")
-    out.append("")
-    out.append("- Existing config at `~/code/degen-dudes/playwright.config.ts`")
-    out.append("- Tests run against live URL: `https://degen-dudes-golf.vercel.app`")
-    out.append("- Auth handled by global-setup.ts (PIN 2626)")
-    out.append("- Scoring tests should go in `tests/scoring/` directory")
-    out.append("- Update `testMatch` in config if new naming convention needed")
-    out.append("- Workers: 1 (sequential — setup must run before score tests)")
-    out.append("")
+    yield "---"
+    yield ""
+    yield "## Section 8: Test Implementation Guide"
+    yield ""
+    yield "### Method 1: Unit Tests (scoring engine)"
+    yield ""
+    yield "Import the scoring functions directly and verify against Section 2 & 3 expected values."
+    yield "These run instantly, no browser needed."
+    yield ""
+    yield "```typescript"
+    yield "import { calcStrokesOnHole, calcNetScore, calcCourseHandicap } from '@/lib/scoring'"
+    yield ""
+    d = engine.day_index[first]
+    (name, hi), (_, rating, slope) = data.players[0], data.tees[data.players[0][0]][first]
+    yield "// Verify every CH value"
+    yield f"test('{name} Day {first} CH', () => {{"
+    yield f"  expect(calcCourseHandicap({hi}, {slope}, {rating}, {data.courses[first]['par']})).toBe({engine.ch[0, d]})"
+    yield "})"
+    yield ""
+    top, hardest = int(engine.ch[:, d].argmax()), int(engine.rank[d].argmin())
+    yield "// Verify strokes on every hole"
+    yield f"test('{engine.names[top]} Day {first} Hole {engine.hole_num[d, hardest]} (rank 1, CH={engine.ch[top, d]}) " \
+          f"gets {engine.strokes[top, d, hardest]} strokes', () => {{"
+    yield f"  expect(calcStrokesOnHole({engine.ch[top, d]}, 1)).toBe({engine.strokes[top, d, hardest]})"
+    yield "})"
+    yield ""
+    yield "// Verify net scores with cap"
+    yield "test('net score cap: gross=15, strokes=2, par=4, maxOver=3 → net=9 (capped)', () => {"
+    yield "  expect(calcNetScore(15, 2, 4, 3)).toBe(9) // cap = 4+2+3 = 9"
+    yield "})"
+    yield "```"
+    yield ""
+    yield "### Method 2: UI Integration Tests (Playwright)"
+    yield ""
+    yield "Enter scores through the real app UI and verify displayed values match expected."
+    yield ""
+    yield "**Test flow:**"
+    yield "1. Reset test data (API call to Supabase)"
+    yield "2. Set team assignments (API call)"
+    yield "3. Create groups via Admin UI or API"
+    yield "4. Create matches via Admin UI or API"
+    yield "5. Enter gross scores via Score Entry UI (navigate to day → group → hole → +/- → save)"
+    yield "6. After each hole: verify net score displayed in score entry matches expected"
+    yield "7. After all 18 holes: navigate to /scorecards, verify all values"
+    yield "8. Navigate to /strokes, verify stroke dots match Section 2 tables"
+    yield "9. Navigate to /leaderboard, verify standings match Section 6"
+    yield "10. Navigate to /matches, verify match points match Section 4"
+    yield ""
+    yield "**Multi-user simulation:**"
+    yield "3 browser contexts entering scores simultaneously (one per group)."
+    yield "4th context on /leaderboard verifying real-time updates."
+    yield ""
+    yield "**Undo test:**"
+    yield "1. Enter gross=6 for Eric on Hole 1 → verify net displayed"
+    yield "2. Click Undo → verify previous value restored"
+    yield "3. Enter gross=7 → verify new net displayed"
+    yield "4. Navigate to /history → verify all 3 entries visible"
+    yield ""
+    yield "### Playwright Config Notes"
+    yield ""
+    yield "- Existing config at `~/code/degen-dudes/playwright.config.ts`"
+    yield "- Tests run against live URL: `https://degen-dudes-golf.vercel.app`"
+    yield "- Auth handled by global-setup.ts (PIN 2626)"
+    yield "- Scoring tests should go in `tests/scoring/` directory"
+    yield "- Update `testMatch` in config if new naming convention needed"
+    yield "- Workers: 1 (sequential — setup must run before score tests)"
+    yield ""
     
     # ========== SECTION 9: Quick Reference ==========
-    out.append("---")
-    out.append("")
-    out.append("## Section 9: Quick Reference")
-    out.append("")
-    out.append("### Player IDs")
-    out.append("| Player | ID |")
-    out.append("|--------|----|")
-    for name, _ in PLAYERS:
-        out.append(f"| {name} | `{PLAYER_IDS[name]}` |")
-    out.append("")
-    
-    out.append("### Course IDs")
-    out.append("| Day | Course | ID |")
-    out.append("|-----|--------|----|")
-    for day in [1, 2, 3]:
-        c = COURSES[day]
-        out.append(f"| {day} | {c['name']} | `{c['id']}` |")
-    out.append("")
+    yield "---"
+    yield ""
+    yield "## Section 9: Quick Reference"
+    yield ""
+    yield "### Player IDs"
+    yield "| Player | ID |"
+    yield "|--------|----|"
+    for name, _ in data.players:
+        yield f"| {name} | `{data.player_ids[name]}` |"
+    yield ""
     
-    out.append("### Scoring Formulas")
-    out.append("```")
-    out.append("CH = ROUND(HI × (Slope / 113) + (Rating - Par))")
-    out.append("PH = CH - min(group CH)")
-    out.append("Strokes: CH≥36 → rank≤(CH-36)?3:2; CH≥18 → rank≤(CH-18)?2:1; else rank≤CH?1:0")
-    out.append("Net = min(gross - strokes, par + strokes + NET_MAX_OVER_PAR)")
-    out.append("```")
-    out.append("")
+    yield "### Course IDs"
+    yield "| Day | Course | ID |"
+    yield "|-----|--------|----|"
+    for day in days:
+        c = data.courses[day]
+        yield f"| {day} | {c['name']} | `{c['id']}` |"
+    yield ""
     
-    # Write the file
-    output = "\n".join(out)
-    with open("/Users/ericevnestad/code/degen-dudes/TESTING-PLAN.md", "w") as f:
-        f.write(output)
+    yield "### Scoring Formulas"
+    yield "```"
+    yield "CH = ROUND(HI × (Slope / 113) + (Rating - Par))"
+    yield "PH = CH - min(group CH)"
+    yield "Strokes: CH≥36 → rank≤(CH-36)?3:2; CH≥18 → rank≤(CH-18)?2:1; else rank≤CH?1:0"
+    yield "Net = min(gross - strokes, par + strokes + NET_MAX_OVER_PAR)"
+    yield "```"
+    yield ""
+
+
+def plan_parts(engine):
+    """Every part of the plan, in order: [(section, *args)]."""
+    days = engine.days
+    return ([(plan_header,)]
+            + [(section_1, day) for day in days]
+            + [(section_2, day) for day in days]
+            + [(section_3, scenario, day) for scenario in SCENARIO_TEXT for day in days]
+            + [(section_3, "C"), (section_3, "D")]
+            + [(section_4, i) for i in range(len(MATCH_SCENARIOS) + 1)]
+            + [(section_5, 3), (section_5, 2), (section_6,), (sections_7_to_9,)])
+
+
+_worker = {}
+
+
+def _init_worker(data):
+    _worker["data"] = data
+    _worker["engine"] = PlanEngine(data.players, data.ch, data.holes)
+
+
+def _render_part(part):
+    section, *args = part
+    return "\n".join(section(_worker["data"], _worker["engine"], *args))
+
+
+def part_inputs(data, engine, section, *args):
+    """
+    Exactly the data a part reads, as JSON-able values; its cache key.
+    None for the header, which is never cached.
+    """
+    days, first = engine.days, engine.days[0]
+    names = [name for name, _ in data.players]
+
+    def ch_on(day):
+        return [data.ch[name][day] for name in names]
+
+    if section is section_1:
+        (day,) = args
+        return [day == first, data.courses[day], data.players, [data.tees[name][day] for name in names],
+                ch_on(day)]
+    if section is section_2 or section is section_3:
+        day = args[-1] if section is section_2 or args[0] in SCENARIO_TEXT else first
+        return [day == first, data.courses[day], names, ch_on(day), data.holes[day]]
+    if section is section_4:
+        key = MATCH_SCENARIOS[args[0]][3] if args[0] < len(MATCH_SCENARIOS) else "singles"
+        sides = data.match_groups[key]
+        return [first, sides, [data.ch[name][first] for side in sides for name in side], data.holes[first]]
+    if section is section_5:
+        return [first, names, ch_on(first), data.holes[first]]
+    if section is section_6:
+        return [names, [ch_on(day) for day in days], [data.holes[day] for day in days]]
+    if section is sections_7_to_9:
+        return [data.teams, data.groups, data.players, data.player_ids, data.courses, first,
+                data.tees[names[0]][first], ch_on(first), data.holes[first]]
+    return None
+
+
+def _render_version() -> str:
+    """Hash of the code that renders parts, so editing it invalidates the cache."""
+    digest = hashlib.sha256(Path(__file__).read_bytes())
+    for module in ("handicap.py", "matches.py"):
+        digest.update((Path(__file__).parent / "scoring" / module).read_bytes())
+    return digest.hexdigest()
+
+
+class FragmentCache:
+    """
+    Rendered parts on disk, one file per input hash:
+
+        <root>/<sha256>.md
+
+    A hit bumps the file's mtime; evict() then deletes the least recently
+    used files until the cache fits in max_bytes.
+    """
+
+    def __init__(self, root: Path, max_bytes: int = DEFAULT_CACHE_BYTES):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.version = _render_version()
+        self.hits = self.misses = 0
+
+    def key(self, data, engine, part) -> str:
+        section, *args = part
+        inputs = part_inputs(data, engine, section, *args)
+        if inputs is None:
+            return None
+        payload = json.dumps([self.version, section.__name__, args, inputs], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str):
+        path = self.root / f"{key}.md"
+        try:
+            text = path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        os.utime(path)
+        self.hits += 1
+        return text
+
+    def put(self, key: str, text: str) -> None:
+        atomic_write_text(self.root / f"{key}.md", text)
+
+    def evict(self) -> int:
+        """Delete least recently used fragments past max_bytes; returns how many."""
+        files = sorted(((p.stat(), p) for p in self.root.glob("*.md")), key=lambda f: f[0].st_mtime)
+        total = sum(st.st_size for st, _ in files)
+        evicted = 0
+        for st, path in files:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= st.st_size
+            evicted += 1
+        return evicted
+
+
+def render_plan(data, engine, workers=1, cache=None):
+    """
+    Yield the plan as text chunks, one per part, in plan order. Parts
+    found in `cache` are read back; the rest render, in a process pool
+    when workers > 1 (each worker builds its own engine), and are
+    yielded as soon as every earlier part is done, so only finished,
+    unwritten parts are ever held in memory.
+    """
+    parts = plan_parts(engine)
+    keys = [cache.key(data, engine, part) if cache else None for part in parts]
+    cached = [cache.get(key) if key else None for key in keys]
+    stale = [part for part, text in zip(parts, cached) if text is None]
+    if workers <= 1 or len(stale) <= 1:
+        rendered = ("\n".join(section(data, engine, *args)) for section, *args in stale)
+        pool = None
+    else:
+        pool = multiprocessing.Pool(min(workers, len(stale)), _init_worker, (data,))
+        rendered = pool.imap(_render_part, stale)
+    try:
+        for key, text in zip(keys, cached):
+            if text is None:
+                text = next(rendered)
+                if key:
+                    cache.put(key, text)
+            yield text
+    finally:
+        if pool is not None:
+            pool.terminate()
+
+
+# ============================================================
+# FIXTURES: the plan's numbers as arrays (scoring/fixtures.py)
+# ============================================================
+
+FIXTURE_SCENARIOS = {"A": scenario_par_plus_2, "B": scenario_mixed_realistic,
+                     "C": scenario_net_cap_stress, "D": scenario_ace_and_eagle}
+
+
+def write_plan_fixtures(data, engine, root):
+    """Write every scenario on every day, the Section 4 matches and the leaderboard; returns bytes written."""
+    layers = {"strokes": engine.strokes}
+    for label, scenario in FIXTURE_SCENARIOS.items():
+        layers[f"{label}.gross"] = engine.gross(scenario)
+        for net_max in (3, 2):
+            layers[f"{label}.net{net_max}"] = engine.net(scenario, net_max)
+
+    first = engine.days[0]
+    matches = []
+    for heading, _, format_code, key in MATCH_SCENARIOS + [("4f", None, "singles_stroke", "singles")]:
+        team_a, team_b = data.match_groups[key]
+        phs, gross, _, ph_net, a_pts, b_pts, _ = match_result(engine, format_code, team_a, team_b, first,
+                                                              scenario_mixed_realistic)
+        a_total, b_total, a_match, b_match = final_points(a_pts, b_pts)
+        matches.append({"scenario": heading.split(":")[0], "format": format_code, "day": first,
+                        "a": list(team_a), "b": list(team_b), "ph": phs.tolist(), "gross": gross.tolist(),
+                        "ph_net": ph_net.tolist(), "a_points": a_pts.tolist(), "b_points": b_pts.tolist(),
+                        "a_total": a_total, "b_total": b_total, "a_match": a_match, "b_match": b_match})
+
+    standings = [{"rank": i, "player": name, "gross": tg, "net": tn, "vs_par": diff}
+                 for i, (name, tg, tn, _, diff) in enumerate(leaderboard(engine), 1)]
+    return write_fixtures(root, engine.names, engine.days, data.holes, engine.ch, layers, matches, standings)
+
+
+# ============================================================
+# MAIN: Generate the full testing plan
+# ============================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate TESTING-PLAN.md with expected scoring values.")
+    parser.add_argument("snapshot", nargs="?", type=Path, help="backup snapshot to take the inputs from")
+    parser.add_argument("--catalog", type=Path, help="backup catalog to take the inputs from")
+    parser.add_argument("--at", help="catalog timestamp (default: its latest backup)")
+    parser.add_argument("--reference", type=Path, help="snapshot to take tables the snapshot lacks from")
+    parser.add_argument("--out", type=Path, default=REPO_ROOT / "TESTING-PLAN.md")
+    parser.add_argument("--workers", type=int,
+                        help=f"render processes (default: one per CPU from {PARALLEL_MIN_STROKES:,} stroke values up)")
+    parser.add_argument("--cache", type=Path, default=CACHE_DIR, help="rendered fragment cache directory")
+    parser.add_argument("--cache-mb", type=float, default=DEFAULT_CACHE_BYTES / 2**20)
+    parser.add_argument("--no-cache", action="store_true", help="render every part")
+    parser.add_argument("--fixtures", type=Path, help="expected-value fixture directory (default: next to --out)")
+    parser.add_argument("--no-fixtures", action="store_true", help="write the Markdown plan only")
+    args = parser.parse_args(argv)
+    try:
+        data = load_plan_data(args.snapshot, args.catalog, args.at, args.reference)
+    except (OSError, ValueError) as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 1
+
+    engine = PlanEngine(data.players, data.ch, data.holes)
+    workers = args.workers
+    if workers is None:
+        workers = (os.cpu_count() or 1) if engine.strokes.size >= PARALLEL_MIN_STROKES else 1
+
+    cache = None if args.no_cache else FragmentCache(args.cache, int(args.cache_mb * 2**20))
+
+    # Stream the parts to the file as they come
+    size = lines = 0
+    with open(args.out, "w") as f:
+        for i, chunk in enumerate(render_plan(data, engine, workers, cache)):
+            if i:
+                f.write("\n")
+            f.write(chunk)
+            size += len(chunk) + bool(i)
+            lines += chunk.count("\n") + 1
     
-    print(f"Generated TESTING-PLAN.md: {len(output):,} bytes, {len(out)} lines")
-    print(f"Covers: {len(PLAYERS)} players × 3 days × 18 holes = {len(PLAYERS)*3*18} stroke values")
+    print(f"Generated {args.out.name}: {size:,} bytes, {lines} lines")
+    if cache:
+        evicted = cache.evict()
+        print(f"Fragments: {cache.misses} rendered, {cache.hits} cached, {evicted} evicted")
+    if not args.no_fixtures:
+        fixtures = args.fixtures or args.out.with_suffix(".fixtures")
+        size = write_plan_fixtures(data, engine, fixtures)
+        print(f"Fixtures: {fixtures} ({size:,} bytes)")
+    n_players, n_days, n_holes = engine.strokes.shape
+    print(f"Covers: {n_players} players × {n_days} days × {n_holes} holes = {engine.strokes.size} stroke values")
     print(f"Scenarios: A (par+2), B (mixed), C (net cap), D (aces/eagles)")
     print(f"Formats: best_ball_validation, best_ball, low_total, singles_match, singles_stroke")
     print(f"NET_MAX_OVER_PAR: tested with both 2 and 3")
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
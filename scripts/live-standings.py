@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Degen Dudes Live Standings
+Rebuilds the leaderboard, match standings and team points offline from
+backups: the base snapshot's scores, then each delta of its chain, are
+replayed as score events, each updating only the totals and match holes
+it touches (see scripts/scoring/standings.py).
+
+Snapshots that lack holes or settings take them from --reference; holes
+still missing come from the built-in trip (with a warning).
+
+Needs NumPy (pip install -r scripts/requirements.txt).
+
+  live-standings.py                                   latest backup state
+  live-standings.py --at 2026-02-28T14:18:00-07:00 --day 2
+  live-standings.py backups/scores-2026-02-28-1418.json --reference ref.json --json
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+from backup import load_snapshot
+from backup.config import BACKUP_DIR
+from backup.delta import delta_chain
+
+try:
+    from scoring.reference import fill_builtin, fill_reference
+    from scoring.standings import Standings
+except ImportError as e:   # NumPy missing
+    Standings, STANDINGS_IMPORT_ERROR = None, e
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Degen Dudes standings replayed from backups.")
+    parser.add_argument("snapshot", nargs="?", type=Path, help="snapshot file (default: latest chain)")
+    parser.add_argument("--backup-dir", type=Path, default=BACKUP_DIR)
+    parser.add_argument("--at", help="standings as of this time (default: latest)")
+    parser.add_argument("--reference", type=Path, help="snapshot to take missing reference tables from")
+    parser.add_argument("--day", type=int, help="only this day's matches and team points")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+    if Standings is None:
+        print(f"ERROR: live-standings.py needs NumPy ({STANDINGS_IMPORT_ERROR})", file=sys.stderr)
+        return 2
+
+    try:
+        if args.snapshot:
+            bundle, chain = load_snapshot(args.snapshot), []
+        else:
+            base, chain = delta_chain(args.at, args.backup_dir)
+            bundle = load_snapshot(base)
+        if args.reference:
+            fill_reference(bundle, load_snapshot(args.reference))
+        for table in fill_builtin(bundle, ("holes",)):
+            print(f"WARNING: no {table} in the backup; using the built-in trip's", file=sys.stderr)
+        if bundle.get("scores") and not bundle.get("holes"):
+            raise ValueError("no holes in this backup; pass --reference")
+
+        started = time.perf_counter()
+        standings = Standings(bundle)
+        for delta in chain:
+            standings.apply_delta(delta)
+        elapsed = time.perf_counter() - started
+    except (OSError, ValueError) as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 1
+
+    leaderboard, matches, teams = standings.leaderboard(), standings.matches(args.day), standings.team_points(args.day)
+    if args.json:
+        print(json.dumps({"leaderboard": leaderboard, "matches": matches, "teams": teams,
+                          "events": standings.events, "seconds": round(elapsed, 6)}))
+        return 0
+
+    print("| Rank | Player | Team | Thru | Gross | Net | vs Par |")
+    print("|------|--------|------|------|-------|-----|--------|")
+    for row in leaderboard:
+        vs_par = "E" if not row["vs_par"] else f"{row['vs_par']:+d}"
+        print(f"| {row['rank'] if row['thru'] else '-'} | {row['player']} | {row['team'] or ''} | {row['thru']} "
+              f"| {row['gross']} | {row['net']} | {vs_par if row['thru'] else ''} |")
+    for m in matches:
+        print(f"  Day {m['day']} G{m['group']} M{m['match']} {m['format']:<20} "
+              f"{' & '.join(m['a'])} vs {' & '.join(m['b'])}: thru {m['thru']:>2}, "
+              f"{m['a_holes']:g}–{m['b_holes']:g} → {m['a_points']:g}–{m['b_points']:g} ({m['status']})")
+    print("  " + "   ".join(f"{team} {points:g}" for team, points in teams.items()))
+    print(f"Replayed {standings.events:,} score events from {1 + len(chain)} backups in {elapsed * 1000:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
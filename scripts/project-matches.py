@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Degen Dudes Match Projection
+Projects every match of a day from the scores so far: the holes left are
+simulated from each player's course handicap and how they have played
+against it this trip (see scripts/scoring/projection.py). Prints each
+match's win/tie/loss odds and expected points, and the expected day
+totals for each side.
+
+Snapshots that lack holes or tee assignments take them from --reference,
+or else from the built-in trip (with a warning).
+
+Needs NumPy (pip install -r scripts/requirements.txt).
+
+  project-matches.py                           latest backup state, the day in play
+  project-matches.py --day 2 --rollouts 50000
+  project-matches.py backups/scores-2026-02-28-1418.json --json
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+from backup import load_snapshot
+from backup.config import BACKUP_DIR
+from backup.delta import materialize
+
+try:
+    from scoring.reference import fill_builtin, fill_reference
+    from scoring.projection import DEFAULT_ROLLOUTS, project_day
+except ImportError as e:   # NumPy missing
+    project_day, PROJECTION_IMPORT_ERROR = None, e
+    DEFAULT_ROLLOUTS = 20_000
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Project Degen Dudes matches from partial scores.")
+    parser.add_argument("snapshot", nargs="?", type=Path, help="snapshot file (default: latest state)")
+    parser.add_argument("--backup-dir", type=Path, default=BACKUP_DIR)
+    parser.add_argument("--reference", type=Path, help="snapshot to take missing reference tables from")
+    parser.add_argument("--day", type=int, help="day to project (default: the day in play)")
+    parser.add_argument("--rollouts", type=int, default=DEFAULT_ROLLOUTS)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+    if project_day is None:
+        print(f"ERROR: project-matches.py needs NumPy ({PROJECTION_IMPORT_ERROR})", file=sys.stderr)
+        return 2
+
+    started = time.perf_counter()
+    try:
+        bundle = load_snapshot(args.snapshot) if args.snapshot else materialize(None, args.backup_dir)
+        if args.reference:
+            fill_reference(bundle, load_snapshot(args.reference))
+        for table in fill_builtin(bundle):
+            print(f"WARNING: no {table} in the backup; using the built-in trip's", file=sys.stderr)
+        projection = project_day(bundle, args.day, args.rollouts, args.seed)
+    except (OSError, ValueError) as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 1
+    elapsed = time.perf_counter() - started
+
+    if args.json:
+        print(json.dumps({**projection, "seconds": round(elapsed, 3)}))
+        return 0
+
+    print(f"Day {projection['day']} — {projection['rollouts']:,} rollouts per match")
+    for m in projection["matches"]:
+        a, b = " & ".join(m["a"]), " & ".join(m["b"])
+        print(f"  G{m['group']} M{m['match']} {m['format']:<20} {a} vs {b}")
+        print(f"      thru {m['thru']:>2}, {m['current'][0]:g}–{m['current'][1]:g}   "
+              f"{m['a_label']} {m['a_win']:6.1%}  tie {m['tie']:6.1%}  {m['b_label']} {m['b_win']:6.1%}   "
+              f"expected {m['a_expected']:.2f}–{m['b_expected']:.2f}")
+    for team, t in projection["teams"].items():
+        print(f"  {team}: {t['expected']:.2f} expected points, wins the day {t['win']:.1%}, ties {t['tie']:.1%}")
+    print(f"Projected in {elapsed:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,6 @@
+"""
+Python reference for the app's scoring (src/lib/scoring), shared by the
+testing plan generator and its fixtures, the match fuzzer, the match
+projection, the live standings and the backup audit.
+Needs NumPy (scripts/requirements.txt).
+"""
@@ -0,0 +1,116 @@
+"""
+The trip as the testing plan knows it, from Supabase (verified correct):
+roster, courses, holes, course handicaps, tees, teams and the first day's
+groups. generate-testing-plan.py builds its default plan from these.
+
+Backups made before holes and tee assignments were entered lack them;
+builtin_tables() gives those tables as app rows for the scripts that
+need them, with ids made up from the data.
+"""
+
+PLAYERS = [
+    ("Ryan", 8.9), ("Kiki", 9.3), ("Mack", 10.0), ("Bruce", 10.6),
+    ("Matthew", 11.0), ("C-Pat", 11.5), ("Eric", 13.5), ("Ben", 19.0),
+    ("Gary", 22.1), ("Chris", 30.0), ("Jauch", 36.0),
+]
+
+PLAYER_IDS = {
+    "Ryan": "06559478-aa82-4a0d-aa26-d239ae8414f4",
+    "Kiki": "2377121e-5093-4250-9459-9cec514d9ff4",
+    "Mack": "c407edd3-591f-4faf-afed-c6e156698b33",
+    "Bruce": "8ba6e2af-35d9-42bb-9750-f35fcbb9746c",
+    "Matthew": "57a4fdd1-6cac-4264-ad8d-809aef763ee1",
+    "C-Pat": "5ac3e47e-68d3-4a66-a6ae-47376bdd9faf",
+    "Eric": "989f9143-2f6b-4060-8875-20feb87ead55",
+    "Ben": "e2fc862d-3f4b-49f7-ac6f-97abecaad00e",
+    "Gary": "e0928ef5-83fe-440c-8a1c-76704f4886af",
+    "Chris": "6e49119a-2050-4e50-be46-42c2e89451b8",
+    "Jauch": "2dcc566e-b465-431b-90a1-0f9791de614e",
+}
+
+COURSES = {
+    1: {"name": "Terra Lago North", "id": "9333b881-441e-43f0-9aa8-efe8f9dcd203", "par": 72},
+    2: {"name": "PGA West Mountain", "id": "fb74b2c0-b9df-4926-8867-13d83a2cdf7f", "par": 72},
+    3: {"name": "Eagle Falls", "id": "6a96b6d2-9271-4191-ba6c-da0232a9ca46", "par": 72},
+}
+
+# Hole data: {day: [(hole_num, par, hdcp_rank), ...]}
+HOLES = {
+    1: [  # Terra Lago North
+        (1, 4, 9), (2, 4, 15), (3, 3, 17), (4, 5, 7), (5, 4, 1), (6, 4, 11),
+        (7, 3, 13), (8, 5, 5), (9, 4, 3), (10, 4, 10), (11, 4, 16), (12, 3, 18),
+        (13, 5, 8), (14, 4, 2), (15, 4, 12), (16, 3, 14), (17, 5, 6), (18, 4, 4),
+    ],
+    2: [  # PGA West Mountain
+        (1, 4, 9), (2, 5, 5), (3, 4, 13), (4, 3, 17), (5, 4, 3), (6, 4, 11),
+        (7, 5, 1), (8, 3, 15), (9, 4, 7), (10, 4, 10), (11, 4, 14), (12, 3, 18),
+        (13, 5, 6), (14, 4, 2), (15, 4, 12), (16, 3, 16), (17, 5, 4), (18, 4, 8),
+    ],
+    3: [  # Eagle Falls
+        (1, 4, 7), (2, 5, 3), (3, 3, 15), (4, 4, 11), (5, 4, 1), (6, 3, 17),
+        (7, 5, 5), (8, 4, 9), (9, 4, 13), (10, 4, 8), (11, 4, 4), (12, 3, 18),
+        (13, 5, 2), (14, 4, 10), (15, 4, 6), (16, 3, 16), (17, 5, 12), (18, 4, 14),
+    ],
+}
+
+# Course handicaps (from Supabase — verified correct)
+CH = {
+    "Ryan":    {1: 14, 2: 11, 3: 8},
+    "Kiki":    {1: 11, 2: 6,  3: 8},
+    "Mack":    {1: 12, 2: 11, 3: 9},
+    "Bruce":   {1: 16, 2: 12, 3: 10},
+    "Matthew": {1: 16, 2: 14, 3: 10},
+    "C-Pat":   {1: 17, 2: 9,  3: 11},
+    "Eric":    {1: 16, 2: 14, 3: 13},
+    "Ben":     {1: 22, 2: 20, 3: 19},
+    "Gary":    {1: 26, 2: 20, 3: 23},
+    "Chris":   {1: 35, 2: 33, 3: 32},
+    "Jauch":   {1: 42, 2: 35, 3: 38},
+}
+
+# Tee info for reference
+TEES = {
+    "Ryan":    {1: ("Black", 74.7, 139), 2: ("Black", 72.8, 135), 3: ("Hawk", 70.0, 127)},
+    "Kiki":    {1: ("Yellow", 71.9, 132), 2: ("Silver", 68.3, 122), 3: ("Hawk", 70.0, 127)},
+    "Mack":    {1: ("Yellow", 71.9, 132), 2: ("Black/White", 71.8, 132), 3: ("Hawk", 70.0, 127)},
+    "Bruce":   {1: ("Black", 74.7, 139), 2: ("Black/White", 71.8, 132), 3: ("Hawk", 70.0, 127)},
+    "Matthew": {1: ("Black", 74.7, 139), 2: ("Black", 72.8, 135), 3: ("Hawk", 70.0, 127)},
+    "C-Pat":   {1: ("Black", 74.7, 139), 2: ("Silver", 68.3, 122), 3: ("Hawk", 70.0, 127)},
+    "Eric":    {1: ("Yellow", 71.9, 132), 2: ("White", 70.8, 129), 3: ("Hawk", 70.0, 127)},
+    "Ben":     {1: ("Yellow", 71.9, 132), 2: ("White", 70.8, 129), 3: ("Hawk", 70.0, 127)},
+    "Gary":    {1: ("Yellow", 71.9, 132), 2: ("Silver", 68.3, 122), 3: ("Hawk", 70.0, 127)},
+    "Chris":   {1: ("Yellow", 71.9, 132), 2: ("White", 70.8, 129), 3: ("Hawk", 70.0, 127)},
+    "Jauch":   {1: ("Yellow", 71.9, 132), 2: ("Silver", 68.3, 122), 3: ("Hawk", 70.0, 127)},
+}
+
+TEAMS = {
+    "USA": ["Ryan", "Mack", "Matthew", "Eric", "Gary", "Jauch"],
+    "Europe": ["Kiki", "Bruce", "C-Pat", "Ben", "Chris"],
+}
+
+# Test groups on the first day: (group number, players, default format)
+GROUPS = [
+    (1, ["Ryan", "Kiki", "Mack", "Bruce"], "best_ball_validation"),
+    (2, ["Matthew", "C-Pat", "Eric", "Ben"], "best_ball_validation"),
+    (3, ["Gary", "Chris", "Jauch"], "singles_match"),
+]
+
+# Sides for the Section 4 match scenarios
+MATCH_GROUPS = {
+    "pairs": (["Ryan", "Mack"], ["Kiki", "Bruce"]),
+    "singles": (["Eric"], ["Ben"]),
+    "high_singles": (["Chris"], ["Jauch"]),   # high HC
+}
+
+
+def builtin_tables() -> dict:
+    """{table: rows} of holes, tees and player_tee_assignments for the trip above."""
+    holes = [{"id": f"hole-{day}-{n}", "course_id": COURSES[day]["id"], "hole_number": n, "par": par,
+              "handicap_rank": rank} for day, rows in HOLES.items() for n, par, rank in rows]
+    tee_ids = {(day, tee): f"tee-{day}-{tee[0]}" for days in TEES.values() for day, tee in days.items()}
+    tees = [{"id": tee_id, "course_id": COURSES[day]["id"], "name": tee[0], "rating": tee[1], "slope": tee[2]}
+            for (day, tee), tee_id in tee_ids.items()]
+    assignments = [{"id": f"pta-{name}-{day}", "player_id": PLAYER_IDS[name], "course_id": COURSES[day]["id"],
+                    "tee_id": tee_ids[(day, tee)], "course_handicap": CH[name][day]}
+                   for name, days in TEES.items() for day, tee in days.items()]
+    return {"holes": holes, "tees": tees, "player_tee_assignments": assignments}
@@ -0,0 +1,98 @@
+"""
+Expected-value fixtures: the testing plan's numbers as arrays, written
+next to TESTING-PLAN.md by generate-testing-plan.py so tests can read
+them instead of parsing Markdown.
+
+    <root>/index.json         players, days, holes per day, layer names
+    <root>/ch.npy             [player, day] course handicaps
+    <root>/day-<n>.npy        [layer, player, hole] int16, one per day
+    <root>/matches.json       Section 4: per-hole points and final points
+    <root>/leaderboard.json   Section 6
+
+Layers are "strokes", then "<scenario>.gross" and "<scenario>.net<N>"
+for each NET_MAX_OVER_PAR N. Day files are memory-mapped on load, so
+reading one day touches only that file.
+"""
+
+import io
+import json
+from pathlib import Path
+
+import numpy as np
+
+from backup.snapshot import atomic_write_bytes, atomic_write_text
+
+FIXTURE_VERSION = 1
+
+
+def _write_json(path: Path, obj) -> None:
+    atomic_write_text(path, json.dumps(obj, separators=(",", ":")))
+
+
+def _write_array(path: Path, array) -> None:
+    buf = io.BytesIO()
+    np.save(buf, array)
+    atomic_write_bytes(path, buf.getbuffer())
+
+
+def write_fixtures(root: Path, names, days, holes, ch, layers: dict, matches: list, leaderboard: list) -> int:
+    """
+    Write a fixture bundle. `holes` maps day → [(number, par, rank)],
+    `ch` is [player, day], each layer is [player, day, hole]. Returns the
+    bytes written.
+    """
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    stack = np.stack([np.asarray(layer) for layer in layers.values()]).astype(np.int16)
+    for d, day in enumerate(days):
+        _write_array(root / f"day-{day}.npy", np.ascontiguousarray(stack[:, :, d]))
+    _write_array(root / "ch.npy", np.asarray(ch, dtype=np.int16))
+    _write_json(root / "matches.json", matches)
+    _write_json(root / "leaderboard.json", leaderboard)
+    _write_json(root / "index.json", {
+        "version": FIXTURE_VERSION,
+        "players": list(names),
+        "days": list(days),
+        "holes": {str(day): [list(map(int, h)) for h in holes[day]] for day in days},
+        "layers": list(layers),
+    })
+    files = [root / f"day-{day}.npy" for day in days] + [root / name for name in
+             ("ch.npy", "matches.json", "leaderboard.json", "index.json")]
+    return sum(path.stat().st_size for path in files)
+
+
+class Fixtures:
+    """Read side of a fixture bundle; each file is loaded on first use."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        index = json.loads((self.root / "index.json").read_text(encoding="utf-8"))
+        if index["version"] != FIXTURE_VERSION:
+            raise ValueError(f"fixture version {index['version']}, expected {FIXTURE_VERSION}")
+        self.players = index["players"]
+        self.days = index["days"]
+        self.layers = index["layers"]
+        self._holes = index["holes"]
+        self._layer_index = {name: i for i, name in enumerate(self.layers)}
+
+    def holes(self, day: int) -> np.ndarray:
+        """[hole, (number, par, rank)]"""
+        return np.array(self._holes[str(day)])
+
+    def day(self, day: int) -> np.ndarray:
+        """[layer, player, hole] for one day, memory-mapped."""
+        return np.load(self.root / f"day-{day}.npy", mmap_mode="r")
+
+    def layer(self, day: int, name: str) -> np.ndarray:
+        """[player, hole] of one layer, e.g. "strokes" or "B.net3"."""
+        return self.day(day)[self._layer_index[name]]
+
+    def ch(self) -> np.ndarray:
+        """[player, day] course handicaps."""
+        return np.load(self.root / "ch.npy")
+
+    def matches(self) -> list:
+        return json.loads((self.root / "matches.json").read_text(encoding="utf-8"))
+
+    def leaderboard(self) -> list:
+        return json.loads((self.root / "leaderboard.json").read_text(encoding="utf-8"))
@@ -0,0 +1,66 @@
+"""
+Handicap rules from src/lib/scoring/handicap.ts as precomputed lookups.
+
+    strokes on a hole = CH // 18 + (rank <= CH % 18)
+
+is tabulated once for every CH from 0 to MAX_HANDICAP (any number of
+18-hole tiers; handicap.ts's if-chain stops at three, so the two agree
+up to CH 54), and stroke counts are then a table read for a single hole
+or a fancy index for whole arrays. Plus (negative) handicaps get no
+strokes, as in the app. Course handicaps are tabulated per (HI, tee) the
+same way.
+"""
+
+import math
+
+import numpy as np
+
+MAX_HANDICAP = 108   # six tiers; larger handicaps read the last row
+APP_MAX_HANDICAP = 54   # handicap.ts's three tiers: three strokes on every hole from here up
+
+_ch = np.arange(MAX_HANDICAP + 1)[:, None]
+_rank = np.arange(19)[None, :]               # column 0 is unused; ranks are 1-18
+STROKES = (_ch // 18 + (_rank <= _ch % 18)) * (_rank > 0)
+STROKES.setflags(write=False)
+_STROKE_ROWS = tuple(tuple(row) for row in STROKES.tolist())
+del _ch, _rank
+
+
+def calc_strokes_on_hole(handicap, hole_handicap_rank):
+    """calcStrokesOnHole for one handicap and hole."""
+    if 0 <= handicap <= MAX_HANDICAP:
+        return _STROKE_ROWS[handicap][hole_handicap_rank]
+    return _STROKE_ROWS[0 if handicap < 0 else MAX_HANDICAP][hole_handicap_rank]
+
+
+def stroke_row(handicap):
+    """Strokes on every hole for one handicap, indexed by hole rank (1-18)."""
+    return _STROKE_ROWS[min(max(handicap, 0), MAX_HANDICAP)]
+
+
+def calc_strokes_array(handicap, hole_handicap_rank):
+    """calcStrokesOnHole over arrays of handicaps and hole ranks."""
+    return STROKES[np.clip(handicap, 0, MAX_HANDICAP), hole_handicap_rank]
+
+
+def calc_playing_handicap(player_ch, min_group_ch):
+    """calcPlayingHandicap; works on arrays too."""
+    return player_ch - min_group_ch
+
+
+def calc_course_handicap(handicap_index, slope, rating, par=72):
+    """calcCourseHandicap: ROUND(HI × slope / 113 + (rating − par)), rounding halves up like Math.round."""
+    return math.floor(course_handicap_unrounded(handicap_index, slope, rating, par) + 0.5)
+
+
+def course_handicap_unrounded(handicap_index, slope, rating, par=72):
+    return handicap_index * (slope / 113) + (rating - par)
+
+
+def course_handicap_table(handicap_indexes, tees, par=72):
+    """
+    {(HI, tee): CH} for every pair, where a tee is (name, rating, slope)
+    as in the testing plan's TEES.
+    """
+    return {(hi, tee): calc_course_handicap(hi, tee[2], tee[1], par)
+            for hi in handicap_indexes for tee in tees}
@@ -0,0 +1,49 @@
+"""
+Array versions of the net score and match rules in src/lib/scoring
+(handicap.ts, engine.ts). Every function broadcasts, so leading axes can
+hold players, days or thousands of independent matches and a whole batch
+scores in one call.
+"""
+
+import numpy as np
+
+
+def calc_net_array(gross, strokes, par, net_max_over_par):
+    """calcNetScore over arrays."""
+    return np.minimum(gross - strokes, par + strokes + net_max_over_par)
+
+
+def match_points(format_code, a_nets, b_nets):
+    """
+    Hole points (team A, team B) for a format, as calcMatchResult in
+    engine.ts awards them. a_nets/b_nets are PH-net arrays [..., player, hole];
+    leading axes are independent matches, so a whole batch scores at once.
+    """
+    shape = np.broadcast_shapes(a_nets.shape[:-2], b_nets.shape[:-2]) + a_nets.shape[-1:]
+    if format_code in ("best_ball_validation", "best_ball"):
+        best_a, best_b = a_nets.min(axis=-2), b_nets.min(axis=-2)
+        tied = best_a == best_b
+        if format_code == "best_ball_validation":
+            worst_a, worst_b = a_nets.max(axis=-2), b_nets.max(axis=-2)
+            a_pts = (best_a < best_b) | (tied & (worst_a < worst_b))
+            b_pts = (best_b < best_a) | (tied & (worst_b < worst_a))
+        else:
+            a_pts, b_pts = best_a < best_b, best_b < best_a
+    elif format_code == "low_total":
+        low_a, low_b = a_nets.min(axis=-2), b_nets.min(axis=-2)
+        total_a, total_b = a_nets.sum(axis=-2), b_nets.sum(axis=-2)
+        a_pts = (low_a < low_b).astype(int) + (total_a < total_b)
+        b_pts = (low_b < low_a).astype(int) + (total_b < total_a)
+    elif format_code == "singles_match":
+        net_a, net_b = a_nets[..., 0, :], b_nets[..., 0, :]
+        a_pts = (net_a < net_b) + 0.5 * (net_a == net_b)
+        b_pts = (net_b < net_a) + 0.5 * (net_a == net_b)
+    elif format_code == "singles_stroke":
+        # Decided on the 18-hole total; the point sits on the last hole
+        total_a, total_b = a_nets[..., 0, :].sum(axis=-1), b_nets[..., 0, :].sum(axis=-1)
+        a_pts, b_pts = np.zeros(shape), np.zeros(shape)
+        a_pts[..., -1] = (total_a < total_b) + 0.5 * (total_a == total_b)
+        b_pts[..., -1] = (total_b < total_a) + 0.5 * (total_a == total_b)
+    else:
+        raise ValueError(f"unknown format {format_code!r}")
+    return np.broadcast_to(a_pts, shape).astype(float), np.broadcast_to(b_pts, shape).astype(float)
@@ -0,0 +1,173 @@
+"""
+Monte Carlo projection of a day's matches from partial scorecards.
+
+Holes a player has scored are kept; every other hole is simulated. On a
+simulated hole a player's gross is par + their CH strokes there + a
+residual (how far over their handicap they played a hole) drawn from
+their own residuals this trip, blended with the whole field's so a player
+with few holes behind them is not judged on those alone:
+
+    P(r) = (player's count of r + PRIOR_HOLES × field P(r)) / (player's holes + PRIOR_HOLES)
+
+Players are simulated once per group and shared by every match they play
+in, and each rollout is scored like calcMatchResult (scoring.matches), so
+a match's win/tie/loss odds and expected points are means over rollouts,
+and summing rollouts across matches gives the day's totals — side A
+against side B, as the summary page adds them up.
+"""
+
+import numpy as np
+
+from .handicap import calc_strokes_array
+from .matches import calc_net_array, match_points
+from .reference import net_max_over_par, settings
+
+DEFAULT_ROLLOUTS = 20_000
+PRIOR_HOLES = 18                 # field residuals count as this many holes of a player's own
+RESIDUALS = np.arange(-3, 11)    # residual support; outliers are clipped into it
+PAIRS_FORMATS = ("best_ball_validation", "best_ball", "low_total")
+
+
+def default_day(bundle: dict) -> int:
+    """Latest day with matches and at least one score, else the first day with matches."""
+    group_day = {g["id"]: g["day_number"] for g in bundle.get("groups", [])}
+    days = sorted({group_day[m["group_id"]] for m in bundle.get("matches", []) if m["group_id"] in group_day})
+    if not days:
+        raise ValueError("no matches in this backup")
+    course_day = {c["id"]: c["day_number"] for c in bundle.get("courses", [])}
+    scored = {course_day.get(s["course_id"]) for s in bundle.get("scores", [])}
+    return max((d for d in days if d in scored), default=days[0])
+
+
+def point_value(match: dict, day: int) -> float:
+    """matches.point_value, or the rule updateMatchPoints applies."""
+    if match.get("point_value") is not None:
+        return match["point_value"]
+    return 2 if match["format"] in PAIRS_FORMATS or day == 3 else 1
+
+
+def residual_model(bundle: dict, course_handicaps: dict):
+    """
+    {player id: CDF over RESIDUALS} for players with history, and the
+    field's CDF for everyone else.
+    """
+    holes = {(h["course_id"], h["hole_number"]): h for h in bundle.get("holes", [])}
+    counts, field = {}, np.ones(len(RESIDUALS))   # add-one smoothing for the field
+    for s in bundle.get("scores", []):
+        hole = holes.get((s["course_id"], s["hole_number"]))
+        if hole is None or s.get("gross_score") is None:
+            continue
+        strokes = s.get("ch_strokes")
+        if strokes is None:
+            strokes = int(calc_strokes_array(course_handicaps.get((s["player_id"], s["course_id"]), 0),
+                                             hole["handicap_rank"]))
+        r = np.clip(s["gross_score"] - hole["par"] - strokes, RESIDUALS[0], RESIDUALS[-1]) - RESIDUALS[0]
+        counts.setdefault(s["player_id"], np.zeros(len(RESIDUALS)))[r] += 1
+        field[r] += 1
+    field /= field.sum()
+    cdfs = {p: np.cumsum((c + PRIOR_HOLES * field) / (c.sum() + PRIOR_HOLES)) for p, c in counts.items()}
+    return cdfs, np.cumsum(field)
+
+
+def project_day(bundle: dict, day: int = None, rollouts: int = DEFAULT_ROLLOUTS, seed: int = None) -> dict:
+    """
+    Simulate the rest of `day` in `bundle` (a snapshot with holes, tee
+    assignments and groups). Returns {"day", "rollouts", "matches": [...],
+    "teams": {label: {"expected", "win", "tie"}}} with side A's label first.
+    """
+    day = day or default_day(bundle)
+    rng = np.random.default_rng(seed)
+    course = next((c for c in bundle.get("courses", []) if c["day_number"] == day), None)
+    if course is None:
+        raise ValueError(f"no course for day {day}")
+    holes = sorted((h for h in bundle.get("holes", []) if h["course_id"] == course["id"]),
+                   key=lambda h: h["hole_number"])
+    if not holes:
+        raise ValueError(f"no holes for {course['name']}; pass reference tables")
+    par = np.array([h["par"] for h in holes])
+    rank = np.array([h["handicap_rank"] for h in holes])
+    hole_index = {h["hole_number"]: i for i, h in enumerate(holes)}
+    net_max = net_max_over_par(bundle)
+
+    players = {p["id"]: p for p in bundle.get("players", [])}
+    course_handicaps = {(a["player_id"], a["course_id"]): a["course_handicap"]
+                        for a in bundle.get("player_tee_assignments", [])}
+    cdfs, field_cdf = residual_model(bundle, course_handicaps)
+    gross_known = {}
+    for s in bundle.get("scores", []):
+        if s["course_id"] == course["id"] and s["hole_number"] in hole_index:
+            gross_known[(s["player_id"], hole_index[s["hole_number"]])] = s["gross_score"]
+
+    groups = {g["id"]: g for g in bundle.get("groups", []) if g["day_number"] == day}
+    sides = {}
+    for mp in bundle.get("match_players", []):
+        sides.setdefault(mp["match_id"], {"a": [], "b": []})[mp["side"]].append(mp["player_id"])
+    phs = {(gp["group_id"], gp["player_id"]): gp.get("playing_handicap") or 0
+           for gp in bundle.get("group_players", [])}
+
+    results, day_a, day_b = [], 0.0, 0.0
+    for group_id, group in sorted(groups.items(), key=lambda g: g[1]["group_number"]):
+        matches = sorted((m for m in bundle.get("matches", []) if m["group_id"] == group_id
+                          and sides.get(m["id"], {}).get("a") and sides[m["id"]].get("b")),
+                         key=lambda m: m["match_number"])
+        roster = list(dict.fromkeys(p for m in matches for side in "ab" for p in sides[m["id"]][side]))
+        if not roster:
+            continue
+
+        # One simulated card per player, shared by all their matches in the group
+        gross = np.empty((rollouts, len(roster), len(holes)), dtype=np.int64)
+        known = np.zeros((len(roster), len(holes)), dtype=bool)
+        for i, player_id in enumerate(roster):
+            ch = course_handicaps.get((player_id, course["id"]))
+            if ch is None:
+                ch = round(players.get(player_id, {}).get("handicap_index") or 0)
+            draws = np.searchsorted(cdfs.get(player_id, field_cdf), rng.random((rollouts, len(holes))))
+            residual = RESIDUALS[np.minimum(draws, len(RESIDUALS) - 1)]
+            gross[:, i] = np.maximum(par + calc_strokes_array(ch, rank) + residual, 1)
+            for h in range(len(holes)):
+                if (player_id, h) in gross_known:
+                    gross[:, i, h] = gross_known[(player_id, h)]
+                    known[i, h] = True
+
+        for match in matches:
+            a_ids, b_ids = sides[match["id"]]["a"], sides[match["id"]]["b"]
+            idx = [roster.index(p) for p in a_ids + b_ids]
+            ph = np.array([phs.get((group_id, p), 0) for p in a_ids + b_ids])
+            nets = calc_net_array(gross[:, idx], calc_strokes_array(ph[:, None], rank), par, net_max)
+            a_pts, b_pts = match_points(match["format"], nets[:, :len(a_ids)], nets[:, len(a_ids):])
+            a_total, b_total = a_pts.sum(axis=1), b_pts.sum(axis=1)
+            value = point_value(match, day)
+            a_share = (a_total > b_total) + 0.5 * (a_total == b_total)
+
+            played = known[idx].all(axis=0)
+            current = (0.0, 0.0) if match["format"] == "singles_stroke" else (
+                float(a_pts[0, played].sum()), float(b_pts[0, played].sum()))
+            results.append({
+                "match_id": match["id"],
+                "group": group["group_number"],
+                "match": match["match_number"],
+                "format": match["format"],
+                "a": [players.get(p, {}).get("name", p) for p in a_ids],
+                "b": [players.get(p, {}).get("name", p) for p in b_ids],
+                "a_label": match.get("team_a_label") or "A",
+                "b_label": match.get("team_b_label") or "B",
+                "thru": int(played.sum()),
+                "current": current,
+                "a_win": float((a_total > b_total).mean()),
+                "tie": float((a_total == b_total).mean()),
+                "b_win": float((b_total > a_total).mean()),
+                "a_expected": float(value * a_share.mean()),
+                "b_expected": float(value * (1 - a_share).mean()),
+            })
+            day_a += value * a_share
+            day_b += value * (1 - a_share)
+
+    labels = settings(bundle)
+    day_a, day_b = np.broadcast_to(day_a, rollouts), np.broadcast_to(day_b, rollouts)
+    teams = {
+        labels.get("team_a_label") or "USA": {
+            "expected": float(day_a.mean()), "win": float((day_a > day_b).mean()), "tie": float((day_a == day_b).mean())},
+        labels.get("team_b_label") or "Europe": {
+            "expected": float(day_b.mean()), "win": float((day_b > day_a).mean()), "tie": float((day_a == day_b).mean())},
+    }
+    return {"day": day, "rollouts": rollouts, "matches": results, "teams": teams}
@@ -0,0 +1,49 @@
+"""
+The reference tables scoring reads next to `scores`, and the app settings
+it depends on, as they come out of a backup bundle.
+
+Backups made before holes, tee assignments or settings existed lack them;
+fill_reference() copies them in from another bundle (a later backup, or a
+hand-written reference file), and fill_builtin() from the built-in trip.
+"""
+
+import re
+
+from .builtin import builtin_tables
+
+REFERENCE_TABLES = ("settings", "players", "courses", "holes", "player_tee_assignments", "groups",
+                    "group_players", "matches", "match_players")
+DEFAULT_NET_MAX_OVER_PAR = 3   # what saveScore uses when the setting is absent
+
+
+def settings(bundle: dict) -> dict:
+    """{key: value} of the settings table."""
+    return {row["key"]: row["value"] for row in bundle.get("settings", [])}
+
+
+def net_max_over_par(bundle: dict) -> int:
+    """The setting as parseInt reads it, or the app's default."""
+    for row in bundle.get("settings", []):
+        if row.get("key") == "net_max_over_par":
+            match = re.match(r"\s*\"?([+-]?\d+)", str(row.get("value")))
+            if match:
+                return int(match.group(1))
+    return DEFAULT_NET_MAX_OVER_PAR
+
+
+def fill_reference(bundle: dict, reference: dict) -> dict:
+    """Copy the reference tables `bundle` lacks (or has empty) from `reference`, in place."""
+    for table in REFERENCE_TABLES:
+        if not bundle.get(table) and table in reference:
+            bundle[table] = reference[table]
+    return bundle
+
+
+def fill_builtin(bundle: dict, tables=REFERENCE_TABLES) -> list:
+    """Copy the `tables` `bundle` still lacks from the built-in trip, in place; returns their names."""
+    filled = []
+    for table, rows in builtin_tables().items():
+        if table in tables and not bundle.get(table):
+            bundle[table] = rows
+            filled.append(table)
+    return filled
@@ -0,0 +1,295 @@
+"""
+Live standings kept up to date from score rows replayed as events, offline:
+a snapshot's scores, then a backup's delta stream (backup/delta.py).
+
+Each score event (a `scores` row upserted or deleted) updates, without
+looking at any other score:
+
+  * its player's running gross, net and par, per day and in total, as the
+    leaderboard page adds them up: net_score (gross if it is missing) over
+    the holes scored, against the par of those holes only;
+  * that hole in every match the player plays that day, rescored as
+    updateMatchPoints does: PH-net from gross and each player's group
+    playing handicap, a hole counting once every player in the match has
+    scored it. singles_stroke keeps each side's running ph_score total and
+    is decided once every hole is in.
+
+leaderboard() sorts players by net vs par when asked; matches() and
+team_points() read the match states, each match scaled to its point value
+(a win takes all of it, a tie with holes played splits it).
+"""
+
+from backup.delta import apply_delta
+from .handicap import calc_strokes_on_hole
+from .projection import point_value
+from .reference import REFERENCE_TABLES, net_max_over_par, settings
+
+
+def hole_points(format_code: str, a_nets: list, b_nets: list):
+    """(team A, team B) points for one fully scored hole, as updateMatchPoints awards them."""
+    if format_code in ("best_ball_validation", "best_ball"):
+        best_a, best_b = min(a_nets), min(b_nets)
+        if best_a != best_b:
+            return (1, 0) if best_a < best_b else (0, 1)
+        if format_code == "best_ball_validation":
+            worst_a, worst_b = max(a_nets), max(b_nets)
+            if worst_a != worst_b:
+                return (1, 0) if worst_a < worst_b else (0, 1)
+        return 0, 0
+    if format_code == "low_total":
+        low_a, low_b, total_a, total_b = min(a_nets), min(b_nets), sum(a_nets), sum(b_nets)
+        return (low_a < low_b) + (total_a < total_b), (low_b < low_a) + (total_b < total_a)
+    if format_code == "singles_match":
+        net_a, net_b = a_nets[0], b_nets[0]
+        return (1, 0) if net_a < net_b else (0, 1) if net_b < net_a else (0.5, 0.5)
+    return 0, 0   # singles_stroke: decided on totals
+
+
+class PlayerTotals:
+    """One player's running leaderboard line."""
+
+    __slots__ = ("id", "name", "team", "gross", "net", "par", "thru", "rounds")
+
+    def __init__(self, player: dict):
+        self.id = player["id"]
+        self.name = player.get("name", player["id"])
+        self.team = player.get("team")
+        self.gross = self.net = self.par = self.thru = 0
+        self.rounds = {}   # day → [gross, net, par, thru]
+
+    def add(self, day, gross: int, net: int, par: int, sign: int) -> None:
+        self.gross += sign * gross
+        self.net += sign * net
+        self.par += sign * par
+        self.thru += sign
+        day_totals = self.rounds.setdefault(day, [0, 0, 0, 0])
+        day_totals[0] += sign * gross
+        day_totals[1] += sign * net
+        day_totals[2] += sign * par
+        day_totals[3] += sign
+
+
+class MatchState:
+    """Per-hole results of one match and their running sums."""
+
+    __slots__ = ("id", "group", "number", "day", "course", "format", "value", "a", "b", "ph", "holes",
+                 "results", "a_raw", "b_raw", "completed", "stroke_a", "stroke_b")
+
+    def __init__(self, match: dict, group: dict, course: str, a: list, b: list, ph: list, holes: dict):
+        self.id = match["id"]
+        self.group = group["group_number"]
+        self.number = match["match_number"]
+        self.day = group["day_number"]
+        self.course = course
+        self.format = match["format"]
+        self.value = point_value(match, self.day)
+        self.a, self.b, self.ph = a, b, ph
+        self.holes = holes        # hole number → (par, rank)
+        self.results = {}         # hole number → (A points, B points, A ph_score, B ph_score)
+        self.a_raw = self.b_raw = 0
+        self.completed = 0
+        self.stroke_a = self.stroke_b = 0
+
+    def rescore(self, hole_number: int, cards: dict, net_max: int) -> None:
+        """Recompute one hole from the current cards and fold the change into the sums."""
+        hole = self.holes.get(hole_number)
+        if hole is None:
+            return
+        par, rank = hole
+        rows = [cards.get((p, self.course, hole_number)) for p in self.a + self.b]
+        new = None
+        if all(row is not None for row in rows):
+            nets = []
+            for row, ph in zip(rows, self.ph):
+                strokes = calc_strokes_on_hole(ph, rank)
+                nets.append(min(row["gross_score"] - strokes, par + strokes + net_max))
+            a_pts, b_pts = hole_points(self.format, nets[:len(self.a)], nets[len(self.a):])
+            stroke = [row["ph_score"] if row.get("ph_score") is not None else row["gross_score"] for row in rows]
+            new = (a_pts, b_pts, stroke[0], stroke[len(self.a)])
+        old = self.results.pop(hole_number, None)
+        if old is not None:
+            self.a_raw -= old[0]
+            self.b_raw -= old[1]
+            self.stroke_a -= old[2]
+            self.stroke_b -= old[3]
+            self.completed -= 1
+        if new is not None:
+            self.results[hole_number] = new
+            self.a_raw += new[0]
+            self.b_raw += new[1]
+            self.stroke_a += new[2]
+            self.stroke_b += new[3]
+            self.completed += 1
+
+    def points(self):
+        """(A raw, B raw, A match points, B match points, status) as updateMatchPoints stores them."""
+        a, b = self.a_raw, self.b_raw
+        if self.format == "singles_stroke":
+            a, b = 0, 0
+            if self.completed == len(self.holes):
+                a, b = ((1, 0) if self.stroke_a < self.stroke_b else (0, 1) if self.stroke_b < self.stroke_a
+                        else (0.5, 0.5))
+        if a > b:
+            scaled = (self.value, 0)
+        elif b > a:
+            scaled = (0, self.value)
+        elif self.completed:
+            scaled = (self.value * 0.5, self.value * 0.5)
+        else:
+            scaled = (0, 0)
+        status = ("not_started" if not self.completed else
+                  "complete" if self.completed == len(self.holes) else "in_progress")
+        return a, b, scaled[0], scaled[1], status
+
+
+class Standings:
+    """
+    Leaderboard and match standings of a bundle's reference tables, fed
+    score events with upsert()/delete() or whole backup deltas with
+    apply_delta(). The bundle's own scores are replayed on construction.
+    """
+
+    def __init__(self, bundle: dict):
+        self._tables = {table: list(bundle.get(table, [])) for table in REFERENCE_TABLES}
+        self._scores = {}   # score id → row
+        self._cards = {}    # (player, course, hole number) → row
+        self.events = 0
+        self._build()
+        for row in bundle.get("scores", []):
+            self.upsert(row)
+
+    def _build(self) -> None:
+        """Index the reference tables and replay the current scores onto fresh totals."""
+        tables = self._tables
+        self.net_max = net_max_over_par(tables)
+        self.labels = settings(tables)
+        self._course_day = {c["id"]: c["day_number"] for c in tables["courses"]}
+        day_course = {c["day_number"]: c["id"] for c in tables["courses"]}
+        self._holes = {(h["course_id"], h["hole_number"]): (h["par"], h["handicap_rank"]) for h in tables["holes"]}
+        self.players = {p["id"]: PlayerTotals(p) for p in
+                        sorted(tables["players"], key=lambda p: p.get("display_order") or 0)}
+
+        groups = {g["id"]: g for g in tables["groups"]}
+        phs = {}
+        for gp in tables["group_players"]:
+            phs.setdefault((gp["group_id"], gp["player_id"]), gp.get("playing_handicap") or 0)
+        sides = {}
+        for mp in tables["match_players"]:
+            sides.setdefault(mp["match_id"], {"a": [], "b": []})[mp["side"]].append(mp["player_id"])
+        course_holes = {}
+        for (course, number), hole in self._holes.items():
+            course_holes.setdefault(course, {})[number] = hole
+
+        self._matches = []
+        self._by_card = {}   # (player, course) → [MatchState]
+        for match in tables["matches"]:
+            group = groups.get(match["group_id"])
+            side = sides.get(match["id"], {})
+            course = day_course.get(group["day_number"]) if group else None
+            if course is None or not side.get("a") or not side.get("b"):
+                continue
+            ph = [phs.get((group["id"], p), 0) for p in side["a"] + side["b"]]
+            state = MatchState(match, group, course, side["a"], side["b"], ph, course_holes.get(course, {}))
+            self._matches.append(state)
+            for player in dict.fromkeys(side["a"] + side["b"]):
+                self._by_card.setdefault((player, course), []).append(state)
+        self._matches.sort(key=lambda m: (m.day, m.group, m.number))
+
+        rows, self._scores, self._cards = list(self._scores.values()), {}, {}
+        for row in rows:
+            self._scores[row["id"]] = row
+            self._apply(row, 1)
+
+    def _apply(self, row: dict, sign: int) -> None:
+        player, course, number = row["player_id"], row["course_id"], row["hole_number"]
+        totals = self.players.get(player)
+        if totals is not None:
+            gross = row["gross_score"]
+            net = row["net_score"] if row.get("net_score") is not None else gross
+            par = self._holes.get((course, number), (0, 0))[0]
+            totals.add(self._course_day.get(course), gross, net, par, sign)
+        key = (player, course, number)
+        if sign > 0:
+            self._cards[key] = row
+        elif self._cards.get(key) is row:
+            del self._cards[key]
+        for state in self._by_card.get((player, course), ()):
+            state.rescore(number, self._cards, self.net_max)
+
+    def upsert(self, row: dict) -> None:
+        """A score entered or changed."""
+        old = self._scores.get(row["id"])
+        if old is not None:
+            self._apply(old, -1)
+        self._scores[row["id"]] = row
+        self._apply(row, 1)
+        self.events += 1
+
+    def delete(self, score_id: str) -> None:
+        """A score removed (undo, or a reset)."""
+        old = self._scores.pop(score_id, None)
+        if old is not None:
+            self._apply(old, -1)
+        self.events += 1
+
+    def apply_delta(self, delta: dict) -> None:
+        """
+        One backup delta: its score changes as events. A change to any
+        reference table (a new group or match, a setting) re-indexes and
+        replays the current scores instead.
+        """
+        changes = delta["tables"]
+        reference = {table: change for table, change in changes.items() if table in REFERENCE_TABLES}
+        if reference:
+            apply_delta(self._tables, {"tables": reference, "backup_timestamp": delta["backup_timestamp"]})
+            self._build()
+        scores = changes.get("scores")
+        if scores is None:
+            return
+        if "replace" in scores:
+            for score_id in list(self._scores):
+                self.delete(score_id)
+            for row in scores["replace"]:
+                self.upsert(row)
+            return
+        for score_id in scores.get("delete", []):
+            self.delete(score_id)
+        for row in scores.get("upsert", []):
+            self.upsert(row)
+
+    def leaderboard(self) -> list:
+        """
+        Players with a score, best net vs par first (ties in roster order),
+        then those without: [{rank, player, team, gross, net, par, vs_par, thru, rounds}].
+        """
+        ranked = sorted((p for p in self.players.values() if p.thru), key=lambda p: p.net - p.par)
+        unranked = [p for p in self.players.values() if not p.thru]
+        return [{"rank": i if p.thru else None, "player": p.name, "team": p.team, "gross": p.gross,
+                 "net": p.net, "par": p.par, "vs_par": p.net - p.par, "thru": p.thru,
+                 "rounds": {day: dict(zip(("gross", "net", "par", "thru"), r)) for day, r in sorted(p.rounds.items())
+                            if r[3]}}
+                for i, p in enumerate(ranked + unranked, 1)]
+
+    def matches(self, day: int = None) -> list:
+        """Every match (of `day`) with its raw hole points, match points and status."""
+        names = {p.id: p.name for p in self.players.values()}
+        out = []
+        for m in self._matches:
+            if day is not None and m.day != day:
+                continue
+            a_raw, b_raw, a_points, b_points, status = m.points()
+            out.append({"match_id": m.id, "day": m.day, "group": m.group, "match": m.number, "format": m.format,
+                        "a": [names.get(p, p) for p in m.a], "b": [names.get(p, p) for p in m.b],
+                        "thru": m.completed, "a_holes": a_raw, "b_holes": b_raw,
+                        "a_points": a_points, "b_points": b_points, "status": status})
+        return out
+
+    def team_points(self, day: int = None) -> dict:
+        """{side A label: points, side B label: points}, as the summary page adds matches up."""
+        a = b = 0
+        for m in self._matches:
+            if day is None or m.day == day:
+                _, _, a_points, b_points, _ = m.points()
+                a += a_points
+                b += b_points
+        return {self.labels.get("team_a_label") or "USA": a, self.labels.get("team_b_label") or "Europe": b}
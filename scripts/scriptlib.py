@@ -0,0 +1,32 @@
+"""
+Helpers shared by the hyphen-named scripts in this directory (and their
+tests): importing one of them as a module, and timing a call for the
+benchmarks.
+"""
+
+import importlib.util
+import statistics
+import time
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+
+
+def load_script(filename: str):
+    """Import a hyphen-named script from scripts/ as a module."""
+    path = SCRIPTS_DIR / filename
+    name = path.stem.replace("-", "_")
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def median_ms(fn, repeat: int) -> float:
+    """Median wall time of `fn()` over `repeat` calls, in milliseconds."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
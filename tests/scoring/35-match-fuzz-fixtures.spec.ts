@@ -0,0 +1,85 @@
+/**
+ * 35-match-fuzz-fixtures.spec.ts
+ * Match format edge cases found by the differential fuzzer
+ *
+ * Replays tests/scoring/fixtures/match-fuzz.json through calcMatchResult
+ * (no browser needed). The cases are random cards the fuzzer kept because
+ * they hit an edge case — validation tiebreaks, low/total ties and splits,
+ * halved holes, stroke-play ties, tied matches, the net cap — with the
+ * results the Python reference expects. Cases tagged `mismatch` are cards
+ * where the reference and its calcMatchResult port disagreed.
+ *
+ * Regenerate with: python3 scripts/fuzz-match-formats.py
+ */
+
+import { test, expect } from '@playwright/test'
+import * as fs from 'fs'
+import * as path from 'path'
+import { calcMatchResult, type PlayerMatchData, type GroupFormat } from '@/lib/scoring/engine'
+
+interface FuzzPlayer {
+  name: string
+  ph: number
+  gross: number[]
+}
+
+interface FuzzCase {
+  format: GroupFormat
+  day: number
+  netMaxOverPar: number
+  tags: string[]
+  teamA: FuzzPlayer[]
+  teamB: FuzzPlayer[]
+  expected: {
+    teamAHolePoints: number[]
+    teamBHolePoints: number[]
+    teamATotalPoints: number
+    teamBTotalPoints: number
+    winner: 'A' | 'B' | 'tie'
+  }
+}
+
+const FIXTURE = JSON.parse(
+  fs.readFileSync(path.join(__dirname, 'fixtures', 'match-fuzz.json'), 'utf8')
+) as { holes: Record<string, Array<[number, number, number]>>; cases: FuzzCase[] }
+
+function holesFor(day: number) {
+  return FIXTURE.holes[String(day)].map(([hole_number, par, handicap_rank]) => ({
+    hole_number, par, handicap_rank,
+  }))
+}
+
+function makePlayer(player: FuzzPlayer, day: number): PlayerMatchData {
+  return {
+    playerId: player.name.toLowerCase(),
+    name: player.name,
+    playingHandicap: player.ph,
+    scores: holesFor(day).map((h, i) => ({
+      holeNumber: h.hole_number,
+      par: h.par,
+      handicapRank: h.handicap_rank,
+      gross: player.gross[i],
+    })),
+  }
+}
+
+test.describe('35 · Match Format Fuzz Fixtures', () => {
+  FIXTURE.cases.forEach((c, i) => {
+    const players = [...c.teamA, ...c.teamB].map(p => p.name).join(', ')
+    test(`${i}: ${c.format} day ${c.day} (${c.tags.join(', ') || 'plain'}) — ${players}`, () => {
+      const result = calcMatchResult(
+        c.format,
+        c.teamA.map(p => makePlayer(p, c.day)),
+        c.teamB.map(p => makePlayer(p, c.day)),
+        'Team A', 'Team B',
+        holesFor(c.day), c.netMaxOverPar
+      )
+
+      expect(result.holeResults.map(h => h.teamAPoints)).toEqual(c.expected.teamAHolePoints)
+      expect(result.holeResults.map(h => h.teamBPoints)).toEqual(c.expected.teamBHolePoints)
+      expect(result.teamATotalPoints).toBe(c.expected.teamATotalPoints)
+      expect(result.teamBTotalPoints).toBe(c.expected.teamBTotalPoints)
+      expect(result.winner).toBe(c.expected.winner)
+    })
+  })
+})
@@ -0,0 +1,40 @@
+"""Shared setup for the Python tooling tests under scripts/."""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[2] / "scripts"
+BACKUPS_DIR = SCRIPTS_DIR.parent / "backups"
+FIXTURE = BACKUPS_DIR / "scores-2026-02-22-1718.json"
+
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+from backup.fake_postgrest import FakePostgrest  # noqa: E402
+from scriptlib import load_script  # noqa: E402,F401
+
+
+def by_id(rows):
+    return sorted(rows, key=lambda r: r["id"])
+
+
+@pytest.fixture(scope="session")
+def backup_script():
+    return load_script("backup-scores.py")
+
+
+@pytest.fixture()
+def server_tables(backup_script):
+    """FIXTURE's rows for every table a backup reads (empty where it has none)."""
+    fixture = json.loads(FIXTURE.read_text())
+    return {t: fixture.get(t, []) for t in backup_script.TABLES}
+
+
+@pytest.fixture()
+def server(server_tables):
+    """A FakePostgrest serving `server_tables`."""
+    with FakePostgrest(server_tables) as server:
+        yield server
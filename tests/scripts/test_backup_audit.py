@@ -0,0 +1,124 @@
+"""Batch audit of the derived score columns against the scalar formulas."""
+
+import copy
+import json
+import shutil
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from backup.audit import audit_history, audit_scores, build_reference  # noqa: E402
+
+from conftest import BACKUPS_DIR, load_script  # noqa: E402
+
+SNAPSHOTS = sorted(BACKUPS_DIR.glob("scores-*.json"))
+plan = load_script("generate-testing-plan.py")
+
+
+def reference_tables() -> dict:
+    """Holes and tee assignments from the testing plan (the snapshots predate them)."""
+    holes = [{"course_id": plan.COURSES[day]["id"], "hole_number": n, "par": par, "handicap_rank": rank}
+             for day, rows in plan.HOLES.items() for n, par, rank in rows]
+    assignments = [{"player_id": plan.PLAYER_IDS[name], "course_id": plan.COURSES[day]["id"],
+                    "course_handicap": ch} for name, days in plan.CH.items() for day, ch in days.items()]
+    return {"holes": holes, "player_tee_assignments": assignments,
+            "settings": [{"key": "net_max_over_par", "value": "3"}]}
+
+
+def test_recomputes_every_row_and_flags_bad_ones():
+    bundle = json.loads(SNAPSHOTS[-1].read_text())
+    bundle.update(reference_tables())
+    scores = copy.deepcopy(bundle["scores"])
+    ref = build_reference(bundle)
+
+    # Make the stored values right according to the scalar functions...
+    day = {c["id"]: c["day_number"] for c in bundle["courses"]}
+    holes = {(h["course_id"], h["hole_number"]): h for h in bundle["holes"]}
+    ch = {(a["player_id"], a["course_id"]): a["course_handicap"] for a in bundle["player_tee_assignments"]}
+    group_day = {g["id"]: g["day_number"] for g in bundle["groups"]}
+    ph = {(gp["player_id"], group_day[gp["group_id"]]): gp["playing_handicap"] for gp in bundle["group_players"]}
+    for row in scores:
+        hole = holes[(row["course_id"], row["hole_number"])]
+        row["ch_strokes"] = plan.calc_strokes_on_hole(ch[(row["player_id"], row["course_id"])], hole["handicap_rank"])
+        row["ph_strokes"] = plan.calc_strokes_on_hole(
+            ph.get((row["player_id"], day[row["course_id"]]), 0), hole["handicap_rank"])
+        row["net_score"] = plan.calc_net_score(row["gross_score"], row["ch_strokes"], hole["par"], 3)
+        row["ph_score"] = plan.calc_net_score(row["gross_score"], row["ph_strokes"], hole["par"], 3)
+    result = audit_scores(scores, ref)
+    assert result["checked"] == len(scores) and result["mismatches"] == []
+
+    # ...then break a few. Only day 1 still has groups, so PH is only checked there.
+    grouped = [row for row in scores if (row["player_id"], day[row["course_id"]]) in ph]
+    ungrouped = [row for row in scores if (row["player_id"], day[row["course_id"]]) not in ph]
+    assert result["ph_unchecked"] == len(ungrouped) > 0
+    grouped[0]["net_score"] += 1
+    grouped[1]["ph_strokes"] = None
+    grouped[2]["hole_number"] = 19
+    ungrouped[0]["ph_score"] += 1
+    result = audit_scores(scores, ref)
+    flagged = {row["id"]: columns for row, columns in result["mismatches"]}
+    assert flagged[grouped[0]["id"]] == {"net_score": (grouped[0]["net_score"], grouped[0]["net_score"] - 1)}
+    assert list(flagged[grouped[1]["id"]]) == ["ph_strokes"]
+    assert len(flagged) == 2
+    assert result["unverifiable"] == [grouped[2]]
+
+
+def test_strokes_stop_at_the_apps_three_tiers():
+    bundle = json.loads(SNAPSHOTS[-1].read_text())
+    bundle.update(reference_tables())
+    row = dict(bundle["scores"][0], gross_score=9)
+    for a in bundle["player_tee_assignments"]:
+        if (a["player_id"], a["course_id"]) == (row["player_id"], row["course_id"]):
+            a["course_handicap"] = 60
+    # calcStrokesOnHole gives CH 60 three strokes on every hole, rank 1-6 included
+    par = next(h["par"] for h in bundle["holes"]
+               if (h["course_id"], h["hole_number"]) == (row["course_id"], row["hole_number"]))
+    row.update(ch_strokes=3, net_score=min(9 - 3, par + 3 + 3))
+    result = audit_scores([row], build_reference(bundle))
+    assert result["checked"] == 1
+    assert all("ch_strokes" not in columns and "net_score" not in columns for _, columns in result["mismatches"])
+
+
+def test_history_fills_missing_reference_tables():
+    bundles = [json.loads(p.read_text()) for p in SNAPSHOTS]
+    results = [r for _, r in audit_history(bundles, reference_tables())]
+    assert [r["checked"] for r in results] == [len(b["scores"]) for b in bundles]
+    # Without holes nothing can be verified, and nothing is flagged.
+    assert all(not r["mismatches"] and len(r["unverifiable"]) == len(b["scores"])
+               for b, (_, r) in zip(bundles, audit_history(bundles)))
+
+
+def test_cli_audits_delta_states_and_fails_when_nothing_was_checked(tmp_path, capsys):
+    audit = load_script("backup-audit.py")
+    base = json.loads(SNAPSHOTS[-1].read_text())
+    shutil.copy(SNAPSHOTS[-1], tmp_path)
+    bad = dict(base["scores"][0], net_score=base["scores"][0]["net_score"] + 5)
+    (tmp_path / "delta-2026-02-22-172100.json").write_text(json.dumps(
+        {"backup_timestamp": "2026-02-22T17:21:00-07:00", "base": SNAPSHOTS[-1].name, "seq": 1,
+         "tables": {"scores": {"upsert": [bad], "delete": []}}}))
+
+    reference = tmp_path / "reference.json"
+    reference.write_text(json.dumps(reference_tables()))
+    assert audit.main(["--backup-dir", str(tmp_path), "--reference", str(reference), "--json"]) == 1
+    captured = capsys.readouterr()
+    assert "WARNING" not in captured.err
+    results = [json.loads(line) for line in captured.out.splitlines()]
+    assert [r["backup"] for r in results] == [SNAPSHOTS[-1].name, "delta-2026-02-22-172100.json"]
+    assert results[1]["checked"] == len(base["scores"])
+    assert [m["row"]["id"] for m in results[1]["mismatches"]] == [bad["id"]]
+
+    # The snapshots carry no holes or tee assignments; the built-in trip's stand in
+    assert audit.main(["--backup-dir", str(tmp_path), "--json"]) == 1
+    captured = capsys.readouterr()
+    assert captured.err.count("using the built-in trip's") == 2
+    assert [json.loads(line) for line in captured.out.splitlines()] == results
+
+    # Scores on other courses can't be checked at all: a failure
+    for path in tmp_path.glob("*-2026-*.json"):
+        text = path.read_text()
+        for day, course in plan.COURSES.items():
+            text = text.replace(course["id"], f"course-elsewhere-{day}")
+        path.write_text(text)
+    assert audit.main(["--backup-dir", str(tmp_path)]) == 1
+    assert "no score could be checked in 2 backups" in capsys.readouterr().err
@@ -0,0 +1,41 @@
+"""Local PostgREST stand-in profiles and the backup benchmark harness."""
+
+import pytest
+
+from backup import RestClient, RestError, fetch_table
+from backup.fake_postgrest import API_KEY, FakePostgrest, fixture_tables
+
+from conftest import BACKUPS_DIR, load_script
+
+FIXTURE = BACKUPS_DIR / "scores-2026-02-22-1718.json"
+
+
+class InlineLauncher:
+    """Stands in for the benchmark's launcher pool: runs in this process."""
+
+    def apply(self, fn, args):
+        return fn(*args)
+
+
+def test_fixture_scaling_and_injected_errors():
+    tables = fixture_tables(FIXTURE, ["players", "scores"], scale=10)
+    assert len(tables["players"]) == 11
+    assert len(tables["scores"]) == 5940
+    assert len({r["id"] for r in tables["scores"]}) == 5940
+
+    with FakePostgrest(tables, error_rate=1.0) as server, RestClient(server.url, API_KEY, retries=0) as client:
+        with pytest.raises(RestError) as e:
+            fetch_table(client, "players")
+        assert e.value.status == 503
+        server.error_rate = 0.0
+        assert len(fetch_table(client, "scores", page_size=1000)) == 5940
+
+
+def test_benchmark_runs_backup_script_end_to_end():
+    bench = load_script("bench-backup.py")
+    run = bench.run_backup(InlineLauncher(), "local", [])
+    assert run["ok"], run["stderr"]
+    assert run["requests"] >= len(bench.TABLES)
+    assert run["bytes_sent"] > 200_000
+    assert run["bytes_written"] > run["bytes_sent"]   # indent=2 snapshot vs compact responses
+    assert run["peak_rss_mb"] > 0
@@ -0,0 +1,64 @@
+"""SQLite point-in-time catalog over the checked-in backups."""
+
+import json
+import shutil
+import time
+
+from backup.catalog import Catalog
+
+from conftest import BACKUPS_DIR, load_script
+
+SNAPSHOTS = sorted(BACKUPS_DIR.glob("scores-*.json"))
+
+
+def test_point_in_time_matches_each_snapshot(tmp_path):
+    with Catalog(tmp_path / "catalog.sqlite") as catalog:
+        ingested, skipped, _ = catalog.ingest_dir(BACKUPS_DIR)
+        assert (ingested, skipped) == (len(SNAPSHOTS), 0)
+
+        for path in SNAPSHOTS:
+            bundle = json.loads(path.read_text())
+            for table in ("players", "scores", "matches"):
+                got = sorted(catalog.rows_at(table, bundle["backup_timestamp"]), key=lambda r: r["id"])
+                assert got == sorted(bundle[table], key=lambda r: r["id"]), (path.name, table)
+
+
+def test_score_history_and_fast_point_queries(tmp_path):
+    with Catalog(tmp_path / "catalog.sqlite") as catalog:
+        catalog.ingest_dir(BACKUPS_DIR)
+
+        versions = catalog.score_history("Eric", day=1, hole=5)
+        assert [row["gross_score"] for _, _, row in versions] == [6, 6, 6, 4, 4]
+        assert versions[-1][1] is None
+        assert all(prev[1] == nxt[0] for prev, nxt in zip(versions, versions[1:]))
+
+        assert catalog.score_at("Eric", 1, 5, "2026-02-22T09:00:00-07:00")["gross_score"] == 6
+        assert catalog.score_at("Eric", 1, 5, "2026-02-22T12:00:00-07:00")["entered_by"] == "test-scenario-d"
+        assert catalog.score_at("Eric", 1, 5, "2026-02-21T18:00:00-07:00") is None
+
+        started = time.perf_counter()
+        for _ in range(100):
+            catalog.score_at("Eric", 2, 5, "2026-02-22T14:18:00-07:00")
+        assert (time.perf_counter() - started) / 100 < 0.01
+
+
+def test_ingest_is_incremental(tmp_path):
+    backup_dir = tmp_path / "backups"
+    backup_dir.mkdir()
+    for path in SNAPSHOTS[:5]:
+        shutil.copy(path, backup_dir)
+    with Catalog(tmp_path / "catalog.sqlite") as catalog:
+        assert catalog.ingest_dir(backup_dir)[0] == 5
+        for path in SNAPSHOTS[5:]:
+            shutil.copy(path, backup_dir)
+        # Already-ingested files are never reopened.
+        (backup_dir / SNAPSHOTS[0].name).write_text("not json")
+        assert catalog.ingest_dir(backup_dir)[0] == len(SNAPSHOTS) - 5
+        assert catalog.ingest_dir(backup_dir)[0] == 0
+
+
+def test_queries_on_an_empty_catalog_fail_cleanly(tmp_path, capsys):
+    cli = load_script("backup-catalog.py")
+    for command in ("score", "history"):
+        assert cli.main(["--backup-dir", str(tmp_path), command, "Eric", "1", "5"]) == 1
+        assert "is empty; run ingest first" in capsys.readouterr().err
@@ -0,0 +1,68 @@
+"""Retries with backoff, and full backups that resume from checkpoints."""
+
+from datetime import datetime, timedelta
+
+from backup import RestClient, fetch_table
+from backup.checkpoint import checkpointed_tables, open_staging
+from backup.delta import FILE_TZ
+from backup.fake_postgrest import API_KEY
+
+NOW = datetime(2026, 2, 27, 8, 0, tzinfo=FILE_TZ)
+
+
+def clean_run(script, server, backup_dir, monkeypatch):
+    monkeypatch.setattr(script, "BACKUP_DIR", backup_dir)
+    backup_dir.mkdir()
+    with RestClient(server.url, API_KEY) as client:
+        assert script.backup_full(client, NOW, page_size=100) == 0
+    return (backup_dir / "scores-2026-02-27-0800.json").read_bytes()
+
+
+def test_transient_errors_are_retried(server):
+    server.fail_at = {"scores": 2, "players": 1}
+    with RestClient(server.url, API_KEY, retries=2, backoff=0.01) as client:
+        assert len(fetch_table(client, "scores", page_size=100)) == 594
+        assert len(fetch_table(client, "players")) == 11
+    assert server.errors == 2
+
+
+def test_failed_backup_resumes_without_refetching(tmp_path, monkeypatch, server, backup_script):
+    script = backup_script
+    expected = clean_run(script, server, tmp_path / "clean", monkeypatch)
+    clean_bytes = server.bytes_sent
+
+    backup_dir = tmp_path / "flaky"
+    monkeypatch.setattr(script, "BACKUP_DIR", backup_dir)
+    backup_dir.mkdir()
+    server.bytes_sent = 0
+    server.fail_at = {"scores": 4}   # dies after three pages of scores
+    with RestClient(server.url, API_KEY, retries=0) as client:
+        assert script.backup_full(client, NOW, page_size=100) == 1
+
+    staging = backup_dir / script.STAGING_DIR
+    progress = checkpointed_tables(staging)
+    assert all(progress[t]["done"] for t in script.TABLES if t != "scores")
+    assert not progress["scores"]["done"] and progress["scores"]["last"]
+    # A page half-written when the run died is cut off on resume.
+    with open(staging / "scores.part", "a") as part:
+        part.write(',\n    {"id": "torn')
+
+    server.requests.clear()
+    with RestClient(server.url, API_KEY, retries=0) as client:
+        assert script.backup_full(client, NOW, page_size=100) == 0
+    assert [p for _, p in server.requests if "/scores?" not in p] == []
+    assert all("id=gt." in p for _, p in server.requests)
+
+    assert (backup_dir / "scores-2026-02-27-0800.json").read_bytes() == expected
+    assert not staging.exists()
+    assert server.bytes_sent < clean_bytes * 1.05
+
+
+def test_stale_staging_is_discarded(tmp_path):
+    staging = open_staging(tmp_path / "staging", NOW)
+    (staging / "scores.part").write_text("")
+    assert (staging / "scores.part").exists()
+    assert open_staging(staging, NOW + timedelta(hours=1)) == staging
+    assert (staging / "scores.part").exists()
+    open_staging(staging, NOW + timedelta(hours=7))
+    assert not (staging / "scores.part").exists()
@@ -0,0 +1,39 @@
+"""Compact .ddz snapshot format and the format-agnostic load_snapshot()."""
+
+import json
+
+import pytest
+
+from backup import dump_snapshot, load_snapshot
+from backup.compact import decode_compact, encode_compact
+
+from conftest import BACKUPS_DIR
+
+SNAPSHOTS = sorted(BACKUPS_DIR.glob("scores-*.json"))
+
+
+@pytest.mark.parametrize("codec", ["lzma", "zlib"])
+@pytest.mark.parametrize("path", SNAPSHOTS, ids=lambda p: p.stem)
+def test_round_trip_matches_json(tmp_path, path, codec):
+    expected = json.loads(path.read_text())
+    out = dump_snapshot(expected, tmp_path / path.with_suffix(".ddz").name, codec)
+    assert load_snapshot(out) == expected
+    assert load_snapshot(path) == expected
+    assert out.stat().st_size < path.stat().st_size / 3
+
+
+def test_irregular_tables_survive():
+    bundle = {
+        "backup_timestamp": "2026-02-28T09:00:00-07:00",
+        "settings": [{"key": "pin", "value": "2626"}, {"key": "x", "value": "y", "extra": None}],
+        "scores": [{"id": "b15febab-4a3b-4528-88be-e96c819f3955", "player_id": None, "gross": 4.0}],
+        "groups": [],
+        "empty_rows": [{}],
+    }
+    assert decode_compact(encode_compact(bundle)) == bundle
+
+
+def test_unknown_codec_is_a_value_error():
+    blob = encode_compact({"backup_timestamp": None})
+    with pytest.raises(ValueError, match="unknown .ddz codec"):
+        decode_compact(blob[:4] + b"?" + blob[5:])
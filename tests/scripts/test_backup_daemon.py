@@ -0,0 +1,74 @@
+"""Daemon mode: change probes, adaptive interval, one warm client."""
+
+from datetime import datetime
+
+import pytest
+
+from backup import RestClient
+from backup.daemon import Schedule, probe, run_daemon
+from backup.fake_postgrest import API_KEY
+
+
+@pytest.fixture()
+def server_tables(server_tables):
+    # Keyed on `key`, with no id column: probes must count it by its own key.
+    server_tables["settings"] = [{"key": "net_max_over_par", "value": "3",
+                                  "updated_at": "2026-02-20T00:00:00+00:00"}]
+    return server_tables
+
+
+def test_probe_sees_edits_inserts_and_deletes(server, backup_script):
+    tables, watermarks = backup_script.TABLES, backup_script.WATERMARK_COLUMNS
+    with RestClient(server.url, API_KEY) as client:
+        before = probe(client, tables, watermarks)
+        assert before["scores"][0] == 594
+        assert before["settings"][0] == 1
+        assert probe(client, tables, watermarks) == before
+        # Probes never download rows.
+        assert all(method == "HEAD" or "limit=1" in path for method, path in server.requests)
+        assert ("HEAD", "/rest/v1/settings?select=key") in server.requests
+
+        server.tables["scores"][0]["updated_at"] = "2026-02-28T21:00:00+00:00"
+        edited = probe(client, tables, watermarks)
+        assert edited["scores"] == [594, "2026-02-28T21:00:00+00:00"]
+
+        server.tables["match_players"].pop()
+        assert probe(client, tables, watermarks)["match_players"][0] == 11
+
+
+def test_schedule_tightens_on_activity_and_backs_off_when_idle():
+    schedule = Schedule(min_interval=120, max_interval=1800)
+    assert [schedule.next(False) for _ in range(5)] == [240, 480, 960, 1800, 1800]
+    assert schedule.next(True) == 120
+
+
+def test_daemon_backs_up_only_on_change(tmp_path, monkeypatch, server, backup_script):
+    monkeypatch.setattr(backup_script, "BACKUP_DIR", tmp_path)
+    args = backup_script.parse_args(["--daemon"])
+    assert args.incremental
+    runs = []
+
+    def backup():
+        runs.append(backup_script.run_once(client, args))
+        if len(runs) == 1:
+            # Someone enters a score right after the first backup.
+            row = server.tables["scores"][0]
+            row.update(gross_score=row["gross_score"] + 1,
+                       updated_at=datetime(2026, 2, 28, 21).isoformat() + "+00:00")
+        return runs[-1]
+
+    with RestClient(server.url, API_KEY, pool_size=4) as client:
+        taken = run_daemon(client, backup, backup_script.TABLES, backup_script.WATERMARK_COLUMNS,
+                           Schedule(min_interval=0.01, max_interval=0.02), cycles=4)
+    assert taken == 2 and runs == [0, 0]
+    assert len(list(tmp_path.glob("scores-*.json"))) == 1
+    assert len(list(tmp_path.glob("delta-*.json"))) == 1
+    assert len(server.peers) <= 4   # every cycle reused the same keep-alive connections
+
+
+def test_daemon_backs_up_when_quiet_too_long(server, backup_script):
+    ticks = iter(range(0, 10_000, 100))
+    with RestClient(server.url, API_KEY) as client:
+        taken = run_daemon(client, lambda: 0, backup_script.TABLES, backup_script.WATERMARK_COLUMNS,
+                           Schedule(0.0, 0.0), max_quiet=150, cycles=5, clock=lambda: next(ticks))
+    assert taken == 3   # cycle 1 (first look), then every other cycle once 150s have passed
@@ -0,0 +1,83 @@
+"""Row-level diffs between backups, pairwise and along a chain."""
+
+import copy
+import json
+import shutil
+import time
+
+from backup import dump_snapshot
+from backup.delta import backup_states, load_backup
+from backup.diff import diff_bundles, diff_chain, diff_states
+
+from conftest import BACKUPS_DIR, load_script
+
+SNAPSHOTS = sorted(BACKUPS_DIR.glob("scores-*.json"))
+
+
+def test_added_removed_and_column_changes():
+    old = json.loads(SNAPSHOTS[-1].read_text())
+    new = copy.deepcopy(old)
+    changed, removed = new["scores"][0], new["scores"].pop(1)
+    changed["gross_score"] += 1
+    new["players"].append({"id": "new-player", "name": "Guest"})
+
+    diff = diff_bundles(old, new)
+    assert set(diff) == {"scores", "players"}
+    assert diff["players"]["added"] == [{"id": "new-player", "name": "Guest"}]
+    assert diff["scores"]["removed"] == [removed]
+    [(row, columns)] = diff["scores"]["changed"]
+    assert row is changed
+    assert columns == {"gross_score": (changed["gross_score"] - 1, changed["gross_score"])}
+    assert diff_bundles(old, copy.deepcopy(old)) == {}
+    assert set(diff_bundles(old, new, tables=["players"])) == {"players"}
+
+
+def test_chain_matches_pairwise_diffs(tmp_path):
+    for path in SNAPSHOTS:
+        shutil.copy(path, tmp_path)
+    # Compact snapshots take part in the chain like plain ones.
+    last = tmp_path / SNAPSHOTS[-1].name
+    dump_snapshot(json.loads(last.read_text()), last.with_suffix(".ddz"))
+    last.unlink()
+
+    paths = [path for path, _ in backup_states(tmp_path)]
+    assert [p.stem for p in paths] == [p.stem for p in SNAPSHOTS]
+
+    started = time.perf_counter()
+    chain = list(diff_chain(paths))
+    assert time.perf_counter() - started < 1
+
+    assert len(chain) == len(SNAPSHOTS) - 1
+    for older, newer, diff in chain:
+        expected = diff_bundles(json.loads(older.read_text()), json.loads(
+            (BACKUPS_DIR / f"{newer.stem}.json").read_text()))
+        assert diff == expected, newer.name
+    assert any(diff for _, _, diff in chain)
+
+
+def test_chain_walks_delta_states(tmp_path, capsys):
+    base = json.loads(SNAPSHOTS[-1].read_text())
+    shutil.copy(SNAPSHOTS[-1], tmp_path)
+    edited = dict(base["scores"][0], gross_score=base["scores"][0]["gross_score"] + 1)
+    removed = base["scores"][1]
+    deltas = [{"scores": {"upsert": [edited], "delete": []}},
+              {"scores": {"upsert": [], "delete": [removed["id"]]}}]
+    for seq, tables in enumerate(deltas, 1):
+        (tmp_path / f"delta-2026-02-22-17{20 + seq}00.json").write_text(json.dumps(
+            {"backup_timestamp": f"2026-02-22T17:{20 + seq}:00-07:00", "base": SNAPSHOTS[-1].name, "seq": seq,
+             "tables": tables}))
+
+    chain = list(diff_states(backup_states(tmp_path)))
+    assert [(older.name, newer.name) for older, newer, _ in chain][-2:] == [
+        (SNAPSHOTS[-1].name, "delta-2026-02-22-172100.json"),
+        ("delta-2026-02-22-172100.json", "delta-2026-02-22-172200.json")]
+    (_, _, first), (_, _, second) = chain[-2:]
+    assert [row for row, _ in first["scores"]["changed"]] == [edited]
+    assert second == {"scores": {"added": [], "removed": [removed], "changed": []}}
+    # A delta file given by name stands for its materialized state.
+    assert list(diff_chain([SNAPSHOTS[-1], tmp_path / "delta-2026-02-22-172200.json"]))[0][2] == diff_bundles(
+        base, load_backup(tmp_path / "delta-2026-02-22-172200.json"))
+
+    assert load_script("backup-diff.py").main(["--chain", "--backup-dir", str(tmp_path), "--json"]) == 0
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [line["to"] for line in lines] == ["delta-2026-02-22-172100.json", "delta-2026-02-22-172200.json"]
@@ -0,0 +1,93 @@
+"""Per-request timing spans and the metrics files a backup run writes."""
+
+import json
+
+import pytest
+
+from backup import RestClient
+from backup.fake_postgrest import API_KEY
+from backup.metrics import RunMetrics, table_of
+
+
+def test_run_writes_spans_and_textfile(tmp_path, monkeypatch, server, backup_script):
+    monkeypatch.setattr(backup_script, "BACKUP_DIR", tmp_path)
+    args = backup_script.parse_args(["--page-size", "200", "--metrics-detail"])
+    with RestClient(server.url, API_KEY, pool_size=2) as client:
+        assert backup_script.run_once(client, args) == 0
+        assert backup_script.run_once(client, args) == 0
+        assert client.metrics is None
+
+    spans = [json.loads(line) for line in (tmp_path / "metrics.jsonl").read_text().splitlines()]
+    runs = [s for s in spans if s["span"] == "run"]
+    assert [(r["kind"], r["result"]) for r in runs] == [("full", 0), ("full", 0)]
+    first = spans[:spans.index(runs[0]) + 1]
+    requests = [s for s in first if s["span"] == "request"]
+    assert len(requests) == len(server.requests) // 2
+    assert {s["table"] for s in requests} == set(backup_script.TABLES)
+    # Two pooled connections: only the requests that opened one pay to connect
+    assert sum(s["connect_s"] > 0 for s in requests) <= 2
+    assert all(s["ttfb_s"] > 0 and s["download_s"] >= 0 for s in requests)
+    assert sum(s["rows"] for s in first if s["span"] == "decode" and s["table"] == "scores") == 594
+    scores = next(s for s in first if s["span"] == "table" and s["table"] == "scores")
+    assert (scores["rows"], scores["requests"]) == (594, 3)
+    write = next(s for s in first if s["span"] == "write")
+    assert write["bytes"] == next(tmp_path.glob("scores-*.json")).stat().st_size
+    assert [s["span"] for s in first[-3:]] == ["write", "prune", "run"]
+
+    prom = (tmp_path / "backup.prom").read_text()
+    assert 'degen_backup_table_rows{table="scores"} 594' in prom
+    assert 'degen_backup_table_requests{table="scores"} 3' in prom
+    assert 'degen_backup_last_run_success{kind="full"} 1' in prom
+    assert "# TYPE degen_backup_table_phase_seconds gauge" in prom
+    assert all(f'degen_backup_table_phase_seconds{{table="scores",phase="{p}"}}' in prom
+               for p in ("connect", "ttfb", "download", "decode"))
+    assert not list(tmp_path.glob(".backup.prom.*"))
+
+
+def test_failed_run_is_recorded(tmp_path, monkeypatch, server, backup_script):
+    monkeypatch.setattr(backup_script, "BACKUP_DIR", tmp_path)
+    server.fail_at = {"scores": 1}
+    textfile = tmp_path / "textfile" / "degen.prom"
+    textfile.parent.mkdir()
+    args = backup_script.parse_args(["--metrics-textfile", str(textfile)])
+    with RestClient(server.url, API_KEY, retries=0) as client:
+        assert backup_script.run_once(client, args) == 1
+    assert 'degen_backup_last_run_success{kind="full"} 0' in textfile.read_text()
+    spans = [json.loads(line) for line in (tmp_path / "metrics.jsonl").read_text().splitlines()]
+    assert any(s["span"] == "request" and s["status"] == 503 for s in spans)
+    assert spans[-1]["result"] == 1
+
+
+def test_log_keeps_per_table_spans_by_default_and_rotates(tmp_path):
+    metrics = RunMetrics("incremental")
+    metrics.request("GET", "/rest/v1/scores?select=*", 200, 0.0, 0.02, 0.01, 50)
+    metrics.decode("scores", 0.005, 10)
+    metrics.tables_fetched({"scores": 0.03})
+    log = tmp_path / "metrics.jsonl"
+    metrics.write_jsonl(log, 0)
+    assert [json.loads(line)["span"] for line in log.read_text().splitlines()] == ["table", "run"]
+    metrics.write_jsonl(log, 1)   # a failed run keeps its request spans
+    assert [json.loads(line)["span"] for line in log.read_text().splitlines()][2:] == [
+        "request", "decode", "table", "run"]
+
+    size = log.stat().st_size
+    metrics.write_jsonl(log, 0, max_bytes=size)
+    assert (tmp_path / "metrics.jsonl.1").stat().st_size == size
+    assert len(log.read_text().splitlines()) == 2
+
+
+def test_span_totals_add_up():
+    metrics = RunMetrics("full")
+    assert table_of("/rest/v1/scores?select=*&limit=500&offset=0") == "scores"
+    metrics.request("GET", "/rest/v1/scores?select=*", 200, 0.01, 0.02, 0.03, 100)
+    metrics.request("GET", "/rest/v1/scores?select=*", 200, 0.0, 0.02, 0.01, 50)
+    metrics.decode("scores", 0.005, 10)
+    with metrics.span("prune"):
+        pass
+    with metrics.span("prune"):
+        pass
+    totals = metrics.tables["scores"]
+    assert totals["requests"] == 2 and totals["bytes"] == 150 and totals["rows"] == 10
+    assert totals["ttfb"] == pytest.approx(0.04)
+    assert len([s for s in metrics.spans if s["span"] == "prune"]) == 2
+    assert "degen_backup_step_seconds{step=\"prune\"}" in metrics.textfile(0)
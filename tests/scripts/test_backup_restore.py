@@ -0,0 +1,63 @@
+"""Bulk restore of a snapshot into a local stand-in REST server."""
+
+import copy
+import json
+
+from backup import RestClient
+from backup.fake_postgrest import API_KEY, FakePostgrest
+from backup.restore import restore_bundle, restore_order
+
+from conftest import FIXTURE, by_id
+
+
+def test_restore_order_puts_parents_first():
+    tables = ["scores", "match_players", "matches", "group_players", "groups", "courses", "players"]
+    order = restore_order(tables)
+    assert sorted(order) == sorted(tables)
+    for child, parents in [("group_players", ["groups", "players"]),
+                           ("matches", ["groups"]),
+                           ("match_players", ["matches", "players"]),
+                           ("scores", ["players", "courses"])]:
+        assert all(order.index(p) < order.index(child) for p in parents), child
+
+
+def test_restore_into_empty_database(backup_script):
+    bundle = json.loads(FIXTURE.read_text())
+    tables = {t: [] for t in bundle if t != "backup_timestamp"}
+    with FakePostgrest(tables) as server, RestClient(server.url, API_KEY) as client:
+        results = restore_bundle(client, bundle, batch_size=100, workers=4)
+
+        for table, rows in tables.items():
+            assert by_id(rows) == by_id(bundle[table]), table
+        assert results["scores"]["batches"] == 6
+        assert max(n for t, n in server.posts) <= 100
+        # Parents were written before any child row.
+        first_post = {}
+        for i, (table, _) in enumerate(server.posts):
+            first_post.setdefault(table, i)
+        assert first_post["players"] < first_post["group_players"] < first_post["match_players"]
+        assert first_post["courses"] < first_post["scores"]
+
+
+def test_dry_run_diffs_and_restore_sends_only_changes():
+    bundle = json.loads(FIXTURE.read_text())
+    server_tables = {t: copy.deepcopy(rows) for t, rows in bundle.items() if t != "backup_timestamp"}
+    # Damage: one score changed, two lost, one extra row added after the backup.
+    server_tables["scores"][0]["gross_score"] = 99
+    lost = server_tables["scores"][1:3]
+    del server_tables["scores"][1:3]
+    server_tables["scores"].append(dict(bundle["scores"][5], id="extra-row"))
+
+    with FakePostgrest(server_tables) as server, RestClient(server.url, API_KEY) as client:
+        dry = restore_bundle(client, bundle, dry_run=True)
+        assert server.posts == []
+        assert [r["id"] for r in dry["scores"]["update"]] == [bundle["scores"][0]["id"]]
+        assert by_id(dry["scores"]["insert"]) == by_id(lost)
+        assert dry["scores"]["extra"] == ["extra-row"]
+        assert dry["players"]["unchanged"] == len(bundle["players"])
+
+        restore_bundle(client, bundle)
+        assert server.posts == [("scores", 3)]
+        restored = {r["id"]: r for r in server.tables["scores"]}
+        assert restored[bundle["scores"][0]["id"]]["gross_score"] == bundle["scores"][0]["gross_score"]
+        assert "extra-row" in restored
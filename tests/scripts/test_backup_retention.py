@@ -0,0 +1,78 @@
+"""Grandfather-father-son retention that folds dropped snapshots into deltas."""
+
+import json
+import shutil
+from datetime import datetime, timedelta
+
+from backup.delta import DELTA_GLOB, FILE_TZ, file_time, materialize
+from backup.retention import RetentionPolicy, apply_retention, choose_survivors
+from backup.tables import primary_key
+
+from conftest import BACKUPS_DIR
+
+SNAPSHOTS = sorted(BACKUPS_DIR.glob("scores-*.json"))
+POLICY = RetentionPolicy(keep_all=timedelta(hours=6), hourly=timedelta(days=2))
+
+
+def rows_by_key(bundle: dict) -> dict:
+    return {
+        table: sorted(rows, key=lambda row: str(row[primary_key(table)]))
+        for table, rows in bundle.items() if table != "backup_timestamp"
+    }
+
+
+def test_survivor_tiers():
+    now = datetime(2026, 3, 10, 12, 0, tzinfo=FILE_TZ)
+    times = {f"s{i}": now - timedelta(minutes=20 * i) for i in range(0, 72 * 3)}
+    keep = choose_survivors(times, now, POLICY)
+    recent = [n for n, t in times.items() if now - t <= POLICY.keep_all]
+    assert set(recent) <= keep
+    hourly = [n for n in keep if POLICY.keep_all < now - times[n] <= POLICY.hourly]
+    assert len(hourly) == len({(times[n].date(), times[n].hour) for n in hourly})
+    daily = [n for n in keep if now - times[n] > POLICY.hourly]
+    assert len(daily) <= len({times[n].date() for n in daily}) + 1   # + the oldest
+    oldest = min(times, key=times.get)
+    assert oldest in keep and len(keep) < len(times)
+    assert "s100" in choose_survivors(times, now, POLICY, pinned=("s100",))
+
+
+def test_folded_history_still_materializes(tmp_path):
+    for path in SNAPSHOTS:
+        shutil.copy(path, tmp_path)
+    originals = {p.name: json.loads(p.read_text()) for p in SNAPSHOTS}
+
+    # A delta chained to a snapshot that will be dropped, to be rebased.
+    base = "scores-2026-02-22-0518.json"
+    row = dict(originals[base]["scores"][0], gross_score=9)
+    delta = {"backup_timestamp": "2026-02-22T06:00:00-07:00", "base": base, "seq": 1,
+             "tables": {"scores": {"upsert": [row], "delete": []}}}
+    (tmp_path / "delta-2026-02-22-060000.json").write_text(json.dumps(delta))
+    expected_delta = json.loads(json.dumps(originals[base]))
+    expected_delta["scores"][0] = row
+
+    now = datetime(2026, 2, 24, 12, 0, tzinfo=FILE_TZ)
+    folded, freed = apply_retention(tmp_path, now, POLICY)
+    left = sorted(p.name for p in tmp_path.glob("scores-*.json"))
+    assert left == ["scores-2026-02-21-1717.json", "scores-2026-02-22-0218.json",
+                    "scores-2026-02-22-1418.json", "scores-2026-02-22-1718.json"]
+    assert folded == len(SNAPSHOTS) - len(left) and freed > 0
+
+    # Every dropped point in time comes back from the survivors' chains.
+    for name, bundle in originals.items():
+        rebuilt = materialize(bundle["backup_timestamp"], tmp_path)
+        assert rows_by_key(rebuilt) == rows_by_key(bundle), name
+    rebuilt = materialize(delta["backup_timestamp"], tmp_path)
+    assert rows_by_key(rebuilt) == rows_by_key(expected_delta)
+
+    # Chains are numbered in time order; unchanged snapshots left no delta.
+    chains = {}
+    for path in tmp_path.glob(DELTA_GLOB):
+        d = json.loads(path.read_text())
+        chains.setdefault(d["base"], []).append((file_time(path), d["seq"]))
+    for entries in chains.values():
+        assert [seq for _, seq in sorted(entries)] == list(range(1, len(entries) + 1))
+    folds = [p for p in tmp_path.glob(DELTA_GLOB) if "folded" in json.loads(p.read_text())]
+    assert len(folds) <= folded
+
+    # Nothing left to thin on a second pass.
+    assert apply_retention(tmp_path, now, POLICY) == (0, 0)
@@ -0,0 +1,47 @@
+"""Streaming snapshot writer in scripts/backup."""
+
+import json
+
+from backup import SnapshotWriter, TableSpool
+
+from conftest import BACKUPS_DIR
+
+
+def test_streamed_snapshot_is_byte_identical_to_json_dumps(tmp_path):
+    source = BACKUPS_DIR / "scores-2026-02-22-1718.json"
+    bundle = json.loads(source.read_text())
+    tables = [k for k in bundle if k != "backup_timestamp"]
+
+    staging = tmp_path / "staging"
+    staging.mkdir()
+    out = tmp_path / "snapshot.json"
+    with SnapshotWriter(out, bundle["backup_timestamp"]) as writer:
+        for table in tables:
+            spool = TableSpool(staging, table)
+            rows = bundle[table]
+            for i in range(0, len(rows), 50):
+                spool.add(rows[i:i + 50])
+            writer.add_table(spool)
+
+    assert out.read_text() == json.dumps(bundle, indent=2, default=str)
+    assert out.read_text() == source.read_text()
+
+
+def test_empty_tables_and_in_memory_rows(tmp_path):
+    bundle = {"backup_timestamp": "2026-02-27T08:00:00-07:00", "groups": [], "players": [{"id": "p1"}]}
+    out = tmp_path / "snapshot.json"
+    with SnapshotWriter(out, bundle["backup_timestamp"]) as writer:
+        writer.add_rows("groups", [])
+        writer.add_rows("players", bundle["players"])
+    assert out.read_text() == json.dumps(bundle, indent=2, default=str)
+
+
+def test_failed_write_leaves_no_partial_file(tmp_path):
+    out = tmp_path / "snapshot.json"
+    try:
+        with SnapshotWriter(out, "ts") as writer:
+            writer.add_rows("players", [{"id": "p1"}])
+            raise RuntimeError("connection dropped")
+    except RuntimeError:
+        pass
+    assert list(tmp_path.iterdir()) == []
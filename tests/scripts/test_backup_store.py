@@ -0,0 +1,55 @@
+"""Content-addressed backup store: dedup, exact export, reference-counted GC."""
+
+import json
+
+from backup import BlobStore
+
+from conftest import BACKUPS_DIR
+
+SNAPSHOTS = sorted(BACKUPS_DIR.glob("scores-*.json"))
+
+
+def ingest(store, path):
+    bundle = json.loads(path.read_text())
+    entries = [(t, store.put_rows(rows), len(rows)) for t, rows in bundle.items() if t != "backup_timestamp"]
+    return store.write_manifest(path.name, bundle["backup_timestamp"], entries)
+
+
+def test_identical_runs_share_blobs_and_export_byte_for_byte(tmp_path):
+    store = BlobStore(tmp_path / "store")
+    for path in SNAPSHOTS:
+        ingest(store, path)
+
+    blob_bytes = sum(p.stat().st_size for p in store.objects.glob("*/*.json"))
+    raw_bytes = sum(p.stat().st_size for p in SNAPSHOTS)
+    duplicate_runs = ["scores-2026-02-21-1718.json", "scores-2026-02-22-0218.json",
+                      "scores-2026-02-22-1418.json"]
+    assert blob_bytes < raw_bytes - sum((BACKUPS_DIR / n).stat().st_size for n in duplicate_runs)
+
+    # 2318 and 0218 are byte-identical runs: same blobs, tiny manifests.
+    a = store.read_manifest("scores-2026-02-21-2318.json")
+    b = store.read_manifest("scores-2026-02-22-0218.json")
+    assert a["tables"] == b["tables"]
+    assert (store.manifests_dir / "scores-2026-02-22-0218.json").stat().st_size < 1500
+
+    for path in SNAPSHOTS:
+        out = store.export(path.name, tmp_path / path.name)
+        assert out.read_bytes() == path.read_bytes()
+        assert store.load(path.name) == json.loads(path.read_text())
+
+
+def test_gc_drops_only_unreferenced_blobs(tmp_path):
+    store = BlobStore(tmp_path / "store")
+    for path in SNAPSHOTS:
+        ingest(store, path)
+
+    removed, _, _ = store.gc(keep=3)
+    assert removed == len(SNAPSHOTS) - 3
+    survivors = [p.name for p in store.manifests()]
+    assert survivors == [p.name for p in SNAPSHOTS[-3:]]
+
+    live = store.refcounts()
+    on_disk = {p.stem for p in store.objects.glob("*/*.json")}
+    assert on_disk == set(live)
+    for name in survivors:
+        assert store.load(name) == json.loads((BACKUPS_DIR / name).read_text())
@@ -0,0 +1,100 @@
+"""Table registry: schema coverage, projections, key order and day-scoped backups."""
+
+import json
+import re
+from datetime import datetime
+
+from backup import RestClient, load_snapshot
+from backup.delta import FILE_TZ
+from backup.fake_postgrest import API_KEY, FakePostgrest
+from backup.tables import REGISTRY, SPECS, day_tables
+
+from conftest import BACKUPS_DIR, SCRIPTS_DIR
+
+FIXTURE = BACKUPS_DIR / "scores-2026-02-22-1718.json"
+MIGRATIONS = SCRIPTS_DIR.parent / "supabase" / "migrations"
+NOW = datetime(2026, 2, 27, 8, 0, tzinfo=FILE_TZ)
+SETTINGS = [{"key": "five_player_team", "value": "USA", "updated_at": "2026-02-20T18:00:00+00:00"}]
+
+
+def schema_columns() -> dict:
+    """{table: [columns]} from the migrations, in definition order."""
+    sql = "\n".join(p.read_text() for p in sorted(MIGRATIONS.glob("*.sql")))
+    tables = {}
+    for name, body in re.findall(r"create table (\w+) \((.*?)\n\);", sql, re.S | re.I):
+        tables[name.lower()] = [
+            m.group(1).lower() for m in re.finditer(
+                r"^\s*(\w+)\s+(?:uuid|text|int|integer|decimal|timestamptz)\b", body, re.M | re.I)
+        ]
+    for name, column in re.findall(r"alter table (\w+) add column (\w+)", sql, re.I):
+        tables[name.lower()].append(column.lower())
+    return tables
+
+
+def test_registry_matches_the_schema():
+    schema = schema_columns()
+    assert set(SPECS) == set(schema)
+    for spec in REGISTRY:
+        assert list(spec.columns) == schema[spec.name], spec.name
+        assert spec.key in spec.columns
+    # Parents always come first.
+    seen = set()
+    for spec in REGISTRY:
+        assert set(spec.parents) <= seen, spec.name
+        seen.add(spec.name)
+    # Projections put columns in the order the checked-in snapshots have them.
+    fixture = json.loads(FIXTURE.read_text())
+    for table, rows in fixture.items():
+        if table != "backup_timestamp":
+            assert list(rows[0]) == list(SPECS[table].columns)
+
+
+def serve(backup_script):
+    fixture = json.loads(FIXTURE.read_text())
+    tables = {t: fixture.get(t, []) for t in backup_script.TABLES}
+    tables["settings"] = SETTINGS
+    return FakePostgrest(tables)
+
+
+def test_full_backup_covers_every_table(tmp_path, monkeypatch, backup_script):
+    monkeypatch.setattr(backup_script, "BACKUP_DIR", tmp_path)
+    with serve(backup_script) as server, RestClient(server.url, API_KEY) as client:
+        assert backup_script.backup_full(client, NOW, page_size=200) == 0
+    bundle = load_snapshot(tmp_path / "scores-2026-02-27-0800.json")
+    assert list(bundle)[1:] == backup_script.TABLES
+    assert bundle["settings"] == SETTINGS
+    assert all("select=" in path and "select=*" not in path for _, path in server.requests)
+    assert any("order=key.asc" in path for _, path in server.requests)
+
+
+def test_day_backup_moves_only_that_day(tmp_path, monkeypatch, backup_script):
+    monkeypatch.setattr(backup_script, "BACKUP_DIR", tmp_path)
+    with serve(backup_script) as server, RestClient(server.url, API_KEY) as client:
+        assert backup_script.backup_day(client, NOW, 1, page_size=200) == 0
+        day_bytes = server.bytes_sent
+        backup_script.backup_full(client, NOW, page_size=200)
+        full_bytes = server.bytes_sent - day_bytes
+
+    bundle = load_snapshot(tmp_path / "day1-2026-02-27-0800.json")
+    fixture = json.loads(FIXTURE.read_text())
+    [course] = [c for c in fixture["courses"] if c["day_number"] == 1]
+    assert list(bundle)[1:] == day_tables(backup_script.TABLES)
+    assert bundle["courses"] == [course]
+    assert len(bundle["scores"]) == 198
+    assert all(s["course_id"] == course["id"] for s in bundle["scores"])
+    assert len(bundle["groups"]) == 3 and len(bundle["matches"]) == 4
+    assert sorted(p["id"] for p in bundle["players"]) == sorted(p["id"] for p in fixture["players"])
+    assert day_bytes < full_bytes / 2
+    # A day file is not a full snapshot: it never becomes a chain base.
+    assert sorted(p.name for p in tmp_path.glob("scores-*")) == ["scores-2026-02-27-0800.json"]
+
+
+def test_day_backup_reports_lookup_failures(tmp_path, monkeypatch, capsys, backup_script):
+    monkeypatch.setattr(backup_script, "BACKUP_DIR", tmp_path)
+    with serve(backup_script) as server, RestClient(server.url, API_KEY, retries=0) as client:
+        assert backup_script.backup_day(client, NOW, 4, page_size=200) == 1
+        assert "ERROR looking up day 4: no course for day 4" in capsys.readouterr().err
+        server.fail_at = {"groups": 1}
+        assert backup_script.backup_day(client, NOW, 1, page_size=200) == 1
+        assert "ERROR looking up day 1: HTTP 503" in capsys.readouterr().err
+    assert not list(tmp_path.glob("day*"))
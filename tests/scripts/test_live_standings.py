@@ -0,0 +1,117 @@
+"""Standings kept from score events, against recomputing them from scratch."""
+
+import json
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from backup.delta import materialize  # noqa: E402
+from scoring.handicap import calc_strokes_array  # noqa: E402
+from scoring.matches import calc_net_array, match_points  # noqa: E402
+from scoring.standings import Standings  # noqa: E402
+
+from conftest import BACKUPS_DIR, load_script  # noqa: E402
+
+SNAPSHOT = BACKUPS_DIR / "scores-2026-02-22-1718.json"
+plan = load_script("generate-testing-plan.py")
+cli = load_script("live-standings.py")
+
+
+def with_holes() -> dict:
+    bundle = json.loads(SNAPSHOT.read_text())
+    bundle["holes"] = [{"id": f"hole-{day}-{n}", "course_id": plan.COURSES[day]["id"], "hole_number": n,
+                        "par": par, "handicap_rank": rank} for day, rows in plan.HOLES.items() for n, par, rank in rows]
+    return bundle
+
+
+def views(standings: Standings):
+    return standings.leaderboard(), standings.matches(), standings.team_points()
+
+
+def test_full_snapshot_matches_a_from_scratch_count():
+    bundle = with_holes()
+    standings = Standings(bundle)
+    par = {(h["course_id"], h["hole_number"]): h["par"] for h in bundle["holes"]}
+    board = standings.leaderboard()
+    for row in board:
+        player = next(p for p in bundle["players"] if p["name"] == row["player"])
+        scores = [s for s in bundle["scores"] if s["player_id"] == player["id"]]
+        assert row["gross"] == sum(s["gross_score"] for s in scores)
+        assert row["net"] == sum(s["net_score"] for s in scores)
+        assert row["par"] == sum(par[(s["course_id"], s["hole_number"])] for s in scores)
+    assert [row["vs_par"] for row in board] == sorted(row["vs_par"] for row in board)
+
+    holes = plan.HOLES[1]
+    rank, pars = np.array([h[2] for h in holes]), np.array([h[1] for h in holes])
+    gross = {(s["player_id"], s["hole_number"]): s["gross_score"] for s in bundle["scores"]
+             if s["course_id"] == plan.COURSES[1]["id"]}
+    ids = {p["name"]: p["id"] for p in bundle["players"]}
+    ph = {gp["player_id"]: gp["playing_handicap"] for gp in bundle["group_players"]}
+    for m in standings.matches():
+        cards = np.array([[gross[(ids[n], h[0])] for h in holes] for n in m["a"] + m["b"]])
+        phs = np.array([ph[ids[n]] for n in m["a"] + m["b"]])
+        nets = calc_net_array(cards, calc_strokes_array(phs[:, None], rank), pars, 3)
+        a_pts, b_pts = match_points(m["format"], nets[:len(m["a"])], nets[len(m["a"]):])
+        assert (m["a_holes"], m["b_holes"], m["status"]) == (a_pts.sum(), b_pts.sum(), "complete")
+    assert sum(standings.team_points().values()) == 6
+
+
+def test_events_in_any_order_agree_with_a_rebuild():
+    bundle = with_holes()
+    scores, rng = bundle.pop("scores"), random.Random(7)
+    standings = Standings(bundle)
+    live = {}
+    rng.shuffle(scores)
+    for i, row in enumerate(scores):
+        standings.upsert(row)
+        live[row["id"]] = row
+        if rng.random() < 0.1:   # a correction
+            fixed = dict(row, gross_score=row["gross_score"] + 1, net_score=None, ph_score=None)
+            standings.upsert(fixed)
+            live[row["id"]] = fixed
+        if rng.random() < 0.05:   # an undo
+            standings.delete(row["id"])
+            del live[row["id"]]
+        if i % 97 == 0 or i == len(scores) - 1:
+            assert views(standings) == views(Standings({**bundle, "scores": list(live.values())}))
+    assert any(m["status"] == "in_progress" for m in standings.matches())
+
+
+def test_cli_replays_a_delta_chain(tmp_path, capsys):
+    bundle = with_holes()
+    reference = tmp_path / "reference.json"
+    reference.write_text(json.dumps({"holes": bundle.pop("holes")}))
+    backups = tmp_path / "backups"
+    backups.mkdir()
+    scores = bundle["scores"]
+    base_rows, later = scores[:300], scores[300:]
+    (backups / SNAPSHOT.name).write_text(json.dumps({**bundle, "scores": base_rows}))
+    deltas = [
+        {"scores": {"upsert": later[:200]}},
+        {"scores": {"upsert": later[200:] + [dict(base_rows[0], gross_score=9, net_score=8)],
+                    "delete": [base_rows[1]["id"]]},
+         "settings": {"replace": [{"key": "net_max_over_par", "value": "2"},
+                                  {"key": "team_a_label", "value": "Ryder"}]}},
+    ]
+    for seq, tables in enumerate(deltas, 1):
+        (backups / f"delta-2026-02-22-17{20 + seq}00.json").write_text(json.dumps(
+            {"backup_timestamp": f"2026-02-22T17:{20 + seq}:00-07:00", "base": SNAPSHOT.name, "seq": seq,
+             "tables": tables}))
+
+    assert cli.main(["--backup-dir", str(backups), "--reference", str(reference), "--json"]) == 0
+    out = json.loads(capsys.readouterr().out)
+    expected = materialize(None, backups)
+    expected["holes"] = json.loads(reference.read_text())["holes"]
+    leaderboard, matches, teams = views(Standings(expected))
+    assert out["leaderboard"] == json.loads(json.dumps(leaderboard))
+    assert out["matches"] == matches and out["teams"] == teams
+    assert list(teams) == ["Ryder", "Europe"]
+    assert out["events"] == len(scores) + 2
+
+    # Without --reference the holes come from the built-in trip
+    assert cli.main(["--backup-dir", str(backups), "--json"]) == 0
+    captured = capsys.readouterr()
+    assert captured.err == "WARNING: no holes in the backup; using the built-in trip's\n"
+    assert json.loads(captured.out)["leaderboard"] == out["leaderboard"]
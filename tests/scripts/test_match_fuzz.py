@@ -0,0 +1,36 @@
+"""The match-format fuzzer: batches agree with the calcMatchResult port."""
+
+import json
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from conftest import load_script  # noqa: E402
+
+fuzz = load_script("fuzz-match-formats.py")
+
+
+@pytest.mark.parametrize("format_code", list(fuzz.FORMATS))
+def test_batch_agrees_with_port(format_code):
+    result = fuzz.run_batch((format_code, 5_000, 42, 2))
+    assert result["failures"] == []
+    assert result["checked"] >= sum(len(cases) for cases in result["kept"].values())
+    assert result["counts"]["match_tie"] > 0
+    case = next(iter(result["kept"].values()))[0]
+    assert fuzz.check_case(case) is None
+
+    # A wrong expectation is caught
+    case["expected"]["teamAHolePoints"][-1] += 1
+    assert fuzz.check_case(case) is not None
+
+
+def test_writes_fixture(tmp_path):
+    out = tmp_path / "match-fuzz.json"
+    assert fuzz.main(["--cards", "20000", "--workers", "1", "--out", str(out)]) == 0
+    fixture = json.loads(out.read_text())
+    formats = {case["format"] for case in fixture["cases"]}
+    assert formats == set(fuzz.FORMATS)
+    assert any("validation_decides" in case["tags"] for case in fixture["cases"])
+    assert any(case["expected"]["winner"] == "tie" for case in fixture["cases"])
+    assert set(fixture["holes"]) == {"1", "2", "3"}
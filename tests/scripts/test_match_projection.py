@@ -0,0 +1,86 @@
+"""Monte Carlo match projection from partial scorecards."""
+
+import json
+import time
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from scoring.handicap import calc_strokes_array  # noqa: E402
+from scoring.matches import calc_net_array, match_points  # noqa: E402
+from scoring.projection import project_day  # noqa: E402
+
+from conftest import BACKUPS_DIR, load_script  # noqa: E402
+
+SNAPSHOT = sorted(BACKUPS_DIR.glob("scores-*.json"))[-1]
+plan = load_script("generate-testing-plan.py")
+projection = load_script("project-matches.py")
+
+
+def day_one(holes_played: int) -> dict:
+    """The newest snapshot with the testing plan's holes and CHs, day 1 cut off after `holes_played`."""
+    bundle = json.loads(SNAPSHOT.read_text())
+    bundle["holes"] = [{"course_id": plan.COURSES[day]["id"], "hole_number": n, "par": par, "handicap_rank": rank}
+                       for day, rows in plan.HOLES.items() for n, par, rank in rows]
+    bundle["player_tee_assignments"] = [
+        {"player_id": plan.PLAYER_IDS[name], "course_id": plan.COURSES[day]["id"], "course_handicap": ch}
+        for name, days in plan.CH.items() for day, ch in days.items()]
+    course = plan.COURSES[1]["id"]
+    bundle["scores"] = [s for s in bundle["scores"]
+                        if s["course_id"] != course or s["hole_number"] <= holes_played]
+    return bundle
+
+
+def test_partial_round_odds():
+    started = time.perf_counter()
+    result = project_day(day_one(9), rollouts=20_000, seed=3)
+    assert time.perf_counter() - started < 1
+    assert result["day"] == 1 and len(result["matches"]) == 4
+    for m in result["matches"]:
+        assert m["thru"] == 9
+        assert m["a_win"] + m["tie"] + m["b_win"] == pytest.approx(1)
+        assert m["a_expected"] + m["b_expected"] == pytest.approx(2 if m["format"] == "best_ball_validation" else 1)
+    assert sum(t["expected"] for t in result["teams"].values()) == pytest.approx(6)
+    assert list(result["teams"]) == ["USA", "Europe"]
+
+    # Same seed, same projection
+    assert project_day(day_one(9), rollouts=20_000, seed=3) == result
+
+
+def test_finished_round_is_settled():
+    bundle = day_one(18)
+    result = project_day(bundle, rollouts=500, seed=1)
+    holes = plan.HOLES[1]
+    par, rank = np.array([h[1] for h in holes]), np.array([h[2] for h in holes])
+    gross = {(s["player_id"], s["hole_number"]): s["gross_score"] for s in bundle["scores"]
+             if s["course_id"] == plan.COURSES[1]["id"]}
+    ph = {gp["player_id"]: gp["playing_handicap"] for gp in bundle["group_players"]}
+    names = {p["name"]: p["id"] for p in bundle["players"]}
+
+    for m in result["matches"]:
+        cards = [[gross[(names[n], h[0])] for h in holes] for n in m["a"] + m["b"]]
+        phs = np.array([ph[names[n]] for n in m["a"] + m["b"]])
+        nets = calc_net_array(np.array(cards), calc_strokes_array(phs[:, None], rank), par, 3)
+        a_pts, b_pts = match_points(m["format"], nets[:len(m["a"])], nets[len(m["a"]):])
+        a, b = a_pts.sum(), b_pts.sum()
+        assert m["thru"] == 18 and m["current"] == (a, b)
+        assert (m["a_win"], m["tie"], m["b_win"]) == (float(a > b), float(a == b), float(b > a))
+
+
+def test_cli_json(capsys, tmp_path):
+    snapshot = tmp_path / "partial.json"
+    snapshot.write_text(json.dumps(day_one(12)))
+    assert projection.main([str(snapshot), "--rollouts", "2000", "--seed", "5", "--json"]) == 0
+    out = json.loads(capsys.readouterr().out)
+    assert out["day"] == 1 and {m["thru"] for m in out["matches"]} == {12}
+
+
+def test_cli_takes_missing_holes_from_the_builtin_trip(capsys):
+    # The repo's backups predate holes and tee assignments
+    assert projection.main([str(SNAPSHOT), "--rollouts", "500", "--seed", "5", "--json"]) == 0
+    captured = capsys.readouterr()
+    assert captured.err == ("WARNING: no holes in the backup; using the built-in trip's\n"
+                            "WARNING: no player_tee_assignments in the backup; using the built-in trip's\n")
+    expected = project_day(day_one(18), rollouts=500, seed=5)["matches"]
+    assert json.loads(captured.out)["matches"] == json.loads(json.dumps(expected))
@@ -0,0 +1,33 @@
+"""The scoring reference benchmark: cases, JSON results and regression flags."""
+
+import json
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from conftest import load_script  # noqa: E402
+
+bench = load_script("bench-scoring.py")
+
+
+def test_every_case_runs_and_writes_json(tmp_path):
+    out = tmp_path / "bench.json"
+    assert bench.main(["--players", "11", "--days", "3", "--repeat", "1", "--json", str(out)]) == 0
+    results = json.loads(out.read_text())["results"]
+    assert [r["case"] for r in results] == ["strokes", "net", "engine", "net table", *bench.FORMATS]
+    assert all(r["per_s"] > 0 and r["peak_kb"] > 0 for r in results)
+    assert results[0]["count"] == 11 * 3 * 18
+    # Singles fill the roster with one-a-side matches, pairs with two-a-side
+    by_case = {r["case"]: r for r in results}
+    assert by_case["singles_match"]["count"] == 5 * 3
+    assert by_case["best_ball"]["count"] == 2 * 3
+
+    # Against itself nothing is flagged; against a faster, leaner run everything is
+    assert bench.main(["--players", "11", "--days", "3", "--repeat", "1", "--baseline", str(out),
+                       "--threshold", "10"]) == 0
+    faster = [{**r, "per_s": r["per_s"] * 100, "peak_kb": r["peak_kb"] / 100} for r in results]
+    flagged = bench.compare(results, faster)
+    assert {(r["case"], metric) for r, metric, _ in flagged} == \
+        {(r["case"], metric) for r in results for metric in ("throughput", "memory")}
+    assert bench.compare(results, [{**r, "case": "other"} for r in faster]) == []
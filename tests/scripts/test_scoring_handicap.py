@@ -0,0 +1,38 @@
+"""Handicap lookup tables against handicap.ts and the testing plan's data."""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from scoring.handicap import (MAX_HANDICAP, calc_strokes_array, calc_strokes_on_hole,  # noqa: E402
+                              course_handicap_table, stroke_row)
+
+from conftest import load_script  # noqa: E402
+
+plan = load_script("generate-testing-plan.py")
+bench = load_script("bench-handicap.py")
+
+
+def test_strokes_follow_the_tier_rule():
+    handicaps, ranks = np.meshgrid(np.arange(-4, MAX_HANDICAP + 5), np.arange(1, 19), indexing="ij")
+    strokes = calc_strokes_array(handicaps, ranks)
+    assert strokes.tolist() == [[calc_strokes_on_hole(int(h), int(r)) for h, r in zip(hs, rs)]
+                                for hs, rs in zip(handicaps, ranks)]
+    assert strokes.tolist()[4:59] == [[bench.if_chain_strokes(h, r) for r in range(1, 19)] for h in range(55)]
+    assert (strokes[:4] == 0).all()                               # plus handicaps get nothing
+    assert (strokes.sum(axis=1)[4:-4] == np.arange(MAX_HANDICAP + 1)).all()
+    assert calc_strokes_on_hole(60, 6) == 4 and calc_strokes_on_hole(60, 7) == 3   # a fourth tier
+    assert list(stroke_row(20)[1:]) == [calc_strokes_on_hole(20, r) for r in range(1, 19)]
+
+
+def test_course_handicap_table_reproduces_plan():
+    for day in plan.COURSES:
+        table = course_handicap_table({hi for _, hi in plan.PLAYERS}, {plan.TEES[n][day] for n, _ in plan.PLAYERS},
+                                      plan.COURSES[day]["par"])
+        for name, hi in plan.PLAYERS:
+            assert table[(hi, plan.TEES[name][day])] == plan.CH[name][day]
+
+
+def test_benchmark_runs(capsys):
+    assert bench.main(["--scores", "2000"]) == 0
+    assert "strokes, per card" in capsys.readouterr().out
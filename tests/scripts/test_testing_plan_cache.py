@@ -0,0 +1,51 @@
+"""Incremental regeneration of the testing plan from cached fragments."""
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from conftest import load_script  # noqa: E402
+
+plan = load_script("generate-testing-plan.py")
+
+
+def render(data, cache=None) -> str:
+    engine = plan.PlanEngine(data.players, data.ch, data.holes)
+    return "\n".join(plan.render_plan(data, engine, cache=cache))
+
+
+def body(text: str) -> list:
+    return [line for line in text.split("\n") if not line.startswith("## Generated:")]
+
+
+def test_ch_fix_rerenders_only_the_parts_that_read_it(tmp_path):
+    parts = len(plan.plan_parts(plan.PlanEngine(plan.PLAYERS, plan.CH, plan.HOLES)))
+    cache = plan.FragmentCache(tmp_path)
+    assert body(render(plan.BUILTIN, cache)) == body(render(plan.BUILTIN))
+    assert (cache.misses, cache.hits) == (parts - 1, 0)   # the header is never cached
+
+    cache = plan.FragmentCache(tmp_path)
+    render(plan.BUILTIN, cache)
+    assert (cache.misses, cache.hits) == (0, parts - 1)
+
+    # One player's CH corrected on day 2: that day's CH and stroke tables,
+    # scenarios A/B, plus the all-days breakdown, and nothing else
+    ch = {name: dict(days) for name, days in plan.BUILTIN.ch.items()}
+    ch["Chris"][2] += 1
+    fixed = plan.BUILTIN._replace(ch=ch)
+    cache = plan.FragmentCache(tmp_path)
+    text = render(fixed, cache)
+    assert body(text) == body(render(fixed))
+    assert cache.misses == 5
+    # Section 1 shows the stored CH, and flags that the tee gives another
+    assert "| Chris | 30.0 | White | 70.8 | 129 | ROUND(33.0478) = 33 ⚠️ ≠ stored | **34** |" in text
+
+
+def test_eviction_keeps_cache_under_its_bound(tmp_path):
+    cache = plan.FragmentCache(tmp_path, max_bytes=20_000)
+    render(plan.BUILTIN, cache)
+    sizes = [p.stat().st_size for p in tmp_path.glob("*.md")]
+    assert cache.evict() > 0
+    assert sum(p.stat().st_size for p in tmp_path.glob("*.md")) <= 20_000
+    assert len(list(tmp_path.glob("*.md"))) < len(sizes)
+    assert not list(tmp_path.glob(".*.tmp"))
@@ -0,0 +1,46 @@
+"""The testing plan's array engine against the scalar scoring functions."""
+
+import time
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from conftest import load_script  # noqa: E402
+
+plan = load_script("generate-testing-plan.py")
+SCENARIOS = [plan.scenario_par_plus_2, plan.scenario_mixed_realistic,
+             plan.scenario_net_cap_stress, plan.scenario_ace_and_eagle]
+
+
+def test_engine_matches_scalar_formulas():
+    engine = plan.PlanEngine(plan.PLAYERS, plan.CH, plan.HOLES)
+    for scenario in SCENARIOS:
+        gross, net = engine.gross(scenario), engine.net(scenario, net_max=2)
+        for i, (name, _) in enumerate(plan.PLAYERS):
+            for d, day in enumerate(engine.days):
+                ch = plan.CH[name][day]
+                for h, (h_num, par, rank) in enumerate(plan.HOLES[day]):
+                    strokes = plan.calc_strokes_on_hole(ch, rank)
+                    assert engine.strokes[i, d, h] == strokes
+                    assert net[i, d, h] == plan.calc_net_score(gross[i, d, h], strokes, par, 2)
+    mixed = engine.gross(plan.scenario_mixed_realistic)
+    assert mixed[engine.index["Jauch"], 0, 2] == 10       # par 3 → 10, tests the cap
+    assert mixed[engine.index["Kiki"], 0, 4] == plan.HOLES[1][4][1] - 1   # birdie on 5
+
+
+def test_large_event_is_array_bound():
+    rng = np.random.default_rng(7)
+    days = range(1, 22)   # three weeks
+    players = [(f"P{i:03d}", 0.0) for i in range(100)]
+    holes = {day: [(n, int(p), int(r)) for n, p, r in zip(
+        range(1, 19), rng.choice([3, 4, 5], 18), rng.permutation(18) + 1)] for day in days}
+    ch = {name: {day: int(rng.integers(-2, 50)) for day in days} for name, _ in players}
+
+    started = time.perf_counter()
+    engine = plan.PlanEngine(players, ch, holes)
+    for scenario in SCENARIOS:
+        engine.net(scenario, 3)
+    assert time.perf_counter() - started < 0.5
+    assert engine.strokes.shape == (100, 21, 18)
+    assert (engine.strokes.sum(axis=2) == np.clip(engine.ch, 0, 54)).all()
@@ -0,0 +1,68 @@
+"""Expected-value fixtures written alongside the testing plan."""
+
+import time
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from scoring.fixtures import Fixtures  # noqa: E402
+
+from conftest import load_script  # noqa: E402
+
+plan = load_script("generate-testing-plan.py")
+
+
+def test_fixtures_hold_the_plan_values(tmp_path):
+    out = tmp_path / "plan.md"
+    assert plan.main(["--out", str(out), "--no-cache"]) == 0
+    fixtures = Fixtures(tmp_path / "plan.fixtures")
+    engine = plan.PlanEngine(plan.PLAYERS, plan.CH, plan.HOLES)
+    assert fixtures.players == engine.names
+    assert fixtures.days == engine.days
+    assert (fixtures.ch() == engine.ch).all()
+
+    for d, day in enumerate(engine.days):
+        assert fixtures.holes(day).tolist() == [list(h) for h in plan.HOLES[day]]
+        assert (fixtures.layer(day, "strokes") == engine.strokes[:, d]).all()
+        assert (fixtures.layer(day, "B.gross") == engine.gross(plan.scenario_mixed_realistic)[:, d]).all()
+        assert (fixtures.layer(day, "C.net2") == engine.net(plan.scenario_net_cap_stress, 2)[:, d]).all()
+
+    # Final points agree with the Markdown, and 4f is decided on totals
+    text = out.read_text()
+    matches = fixtures.matches()
+    assert [m["scenario"] for m in matches] == ["4a", "4b", "4c", "4d", "4e", "4f"]
+    for m in matches[:5]:
+        assert f"**Final Score:** Team A: {m['a_total']} — Team B: {m['b_total']}" in text
+        assert sum(m["a_points"]) == m["a_total"]
+    stroke = matches[5]
+    net_a, net_b = sum(stroke["ph_net"][0]), sum(stroke["ph_net"][1])
+    assert stroke["a_match"] == (1 if net_a < net_b else 0 if net_a > net_b else 0.5)
+
+    board = fixtures.leaderboard()
+    assert [row["player"] for row in board] == [row[0] for row in plan.leaderboard(engine)]
+    assert f"| 1 | {board[0]['player']} | {board[0]['gross']} | {board[0]['net']} |" in text
+
+
+def test_one_day_loads_without_the_rest(tmp_path):
+    rng = np.random.default_rng(5)
+    names = [f"P{i:03d}" for i in range(400)]
+    days = range(1, 11)
+    holes = {day: [(n, 4, r) for n, r in zip(range(1, 19), rng.permutation(18) + 1)] for day in days}
+    ch = {name: {day: int(rng.integers(0, 40)) for day in days} for name in names}
+    data = plan.BUILTIN._replace(players=[(name, 10.0) for name in names], holes=holes, ch=ch,
+                                 courses={day: {"name": f"C{day}", "id": f"c{day}", "par": 72} for day in days},
+                                 match_groups={"pairs": (names[0:2], names[2:4]), "singles": ([names[4]], [names[5]]),
+                                               "high_singles": ([names[6]], [names[7]])})
+    engine = plan.PlanEngine(data.players, data.ch, data.holes)
+    plan.write_plan_fixtures(data, engine, tmp_path)
+    assert all(p.stat().st_mode & 0o777 == 0o644 for p in tmp_path.iterdir())
+    assert not list(tmp_path.glob(".*.tmp"))
+
+    fixtures = Fixtures(tmp_path)
+    fixtures.layer(7, "A.net3")   # warm the page cache
+    started = time.perf_counter()
+    for _ in range(100):
+        net = fixtures.layer(7, "A.net3")
+    assert (time.perf_counter() - started) / 100 < 0.002
+    assert (net == engine.net(plan.scenario_par_plus_2, 3)[:, 6]).all()
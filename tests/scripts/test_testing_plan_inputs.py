@@ -0,0 +1,133 @@
+"""The testing plan built from backup tables instead of its constants."""
+
+import json
+import time
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from backup.catalog import Catalog  # noqa: E402
+from scoring.handicap import calc_course_handicap  # noqa: E402
+
+from conftest import BACKUPS_DIR, load_script  # noqa: E402
+
+plan = load_script("generate-testing-plan.py")
+
+
+def bundle_from(data) -> dict:
+    """App tables holding exactly `data`, the way a backup stores them."""
+    team_of = {name: team for team, names in data.teams.items() for name in names}
+    tee_ids = {(day, tee): f"tee-{day}-{tee[0]}" for days in data.tees.values() for day, tee in days.items()}
+    group_ids = {number: f"group-{number}" for number, _, _ in data.groups}
+    bundle = {
+        "backup_timestamp": "2026-02-23T12:00:00+00:00",
+        "players": [{"id": data.player_ids[name], "name": name, "handicap_index": hi, "team": team_of.get(name),
+                     "display_order": i + 1} for i, (name, hi) in enumerate(data.players)],
+        "courses": [{"id": c["id"], "name": c["name"], "day_number": day, "par_total": c["par"]}
+                    for day, c in data.courses.items()],
+        "tees": [{"id": tee_id, "course_id": data.courses[day]["id"], "name": tee[0], "rating": tee[1],
+                  "slope": tee[2]} for (day, tee), tee_id in tee_ids.items()],
+        "holes": [{"id": f"hole-{day}-{n}", "course_id": data.courses[day]["id"], "hole_number": n, "par": par,
+                   "handicap_rank": rank} for day, rows in data.holes.items() for n, par, rank in rows],
+        "player_tee_assignments": [
+            {"id": f"pta-{name}-{day}", "player_id": data.player_ids[name], "course_id": data.courses[day]["id"],
+             "tee_id": tee_ids[(day, tee)], "course_handicap": data.ch[name][day]}
+            for name, days in data.tees.items() for day, tee in days.items()],
+        "groups": [{"id": group_ids[number], "day_number": min(data.courses), "group_number": number,
+                    "format": format_code} for number, _, format_code in data.groups],
+        "group_players": [{"id": f"gp-{number}-{name}", "group_id": group_ids[number],
+                           "player_id": data.player_ids[name], "playing_handicap": 0}
+                          for number, names, _ in reversed(data.groups) for name in reversed(names)],
+        "matches": [], "match_players": [],
+    }
+    # One match per Section 4 side pairing, in group order
+    for number, key in zip(group_ids, ("pairs", "singles", "high_singles")):
+        match_id = f"match-{key}"
+        bundle["matches"].append({"id": match_id, "group_id": group_ids[number], "match_number": 1,
+                                  "format": "singles_match"})
+        for side, names in zip("ab", data.match_groups[key]):
+            bundle["match_players"] += [{"id": f"mp-{key}-{name}", "match_id": match_id,
+                                         "player_id": data.player_ids[name], "side": side} for name in names]
+    return bundle
+
+
+def test_snapshot_and_catalog_reproduce_builtin(capsys, tmp_path):
+    backups = tmp_path / "backups"
+    backups.mkdir()
+    snapshot = backups / "scores-2026-02-23-1200.json"
+    snapshot.write_text(json.dumps(bundle_from(plan.BUILTIN)))
+    assert plan.load_plan_data(snapshot) == plan.BUILTIN
+
+    with Catalog(tmp_path / "catalog.sqlite") as catalog:
+        catalog.ingest_dir(backups)
+    assert plan.load_plan_data(catalog=tmp_path / "catalog.sqlite") == plan.BUILTIN
+
+    # Missing tables come from a reference snapshot, else from the built-in trip
+    partial = tmp_path / "partial.json"
+    partial.write_text(json.dumps({**bundle_from(plan.BUILTIN), "holes": []}))
+    assert plan.load_plan_data(partial, reference=snapshot) == plan.BUILTIN
+    assert "WARNING" not in capsys.readouterr().err
+    assert plan.load_plan_data(partial) == plan.BUILTIN
+    assert capsys.readouterr().err == "WARNING: no holes in the backup; using the built-in trip's\n"
+
+    # …which only helps on the built-in trip's courses
+    other = bundle_from(plan.BUILTIN)
+    other["courses"][0]["id"] = "course-elsewhere"
+    other["holes"] = []
+    partial.write_text(json.dumps(other))
+    with pytest.raises(ValueError, match="holes for day 1"):
+        plan.load_plan_data(partial)
+
+
+def test_repo_backups_use_the_builtin_trip(capsys, tmp_path):
+    # The backups predate holes, tees and tee assignments
+    snapshot = sorted(BACKUPS_DIR.glob("scores-*.json"))[-1]
+    out = tmp_path / "plan.md"
+    assert plan.main([str(snapshot), "--out", str(out), "--no-cache", "--no-fixtures"]) == 0
+    assert capsys.readouterr().err.count("using the built-in trip's") == 3
+    assert "| Ryan | 8.9 | Black | 74.7 | 139 | ROUND(13.6478) | **14** |" in out.read_text()
+
+
+def test_days_with_different_hole_counts_are_rejected(tmp_path):
+    bundle = bundle_from(plan.BUILTIN)
+    bundle["holes"] = [h for h in bundle["holes"] if h["id"] != "hole-2-18"]
+    snapshot = tmp_path / "ragged.json"
+    snapshot.write_text(json.dumps(bundle))
+    with pytest.raises(ValueError, match="same number of holes every day: day 1 has 18, day 2 has 17"):
+        plan.load_plan_data(snapshot)
+    assert plan.main([str(snapshot), "--out", str(tmp_path / "plan.md")]) == 1
+
+
+def test_large_roster_and_many_rounds(tmp_path):
+    rng = np.random.default_rng(11)
+    days = range(1, 8)
+    names = [f"P{i:03d}" for i in range(240)]
+    tees = [("Black", 74.7, 139), ("White", 70.8, 129), ("Silver", 68.3, 122)]
+    player_tees = {name: {day: tees[int(rng.integers(3))] for day in days} for name in names}
+    his = {name: round(float(rng.uniform(0, 40)), 1) for name in names}
+    data = plan.PlanData(
+        players=[(name, his[name]) for name in names],
+        player_ids={name: f"id-{name}" for name in names},
+        courses={day: {"name": f"Course {day}", "id": f"course-{day}", "par": 72} for day in days},
+        holes={day: [(n, int(p), int(r)) for n, p, r in zip(
+            range(1, 19), rng.choice([3, 4, 5], 18), rng.permutation(18) + 1)] for day in days},
+        ch={name: {day: calc_course_handicap(his[name], t[2], t[1]) for day, t in player_tees[name].items()}
+            for name in names},
+        tees=player_tees,
+        teams={"USA": names[::2], "Europe": names[1::2]},
+        groups=[(i // 4 + 1, names[i:i + 4], "best_ball") for i in range(0, 12, 4)],
+        match_groups={"pairs": (names[0:2], names[2:4]), "singles": ([names[4]], [names[5]]),
+                      "high_singles": ([names[6]], [names[7]])},
+    )
+    snapshot = tmp_path / "big.json"
+    snapshot.write_text(json.dumps(bundle_from(data)))
+    out = tmp_path / "plan.md"
+
+    started = time.perf_counter()
+    assert plan.main([str(snapshot), "--out", str(out), "--no-cache"]) == 0
+    assert time.perf_counter() - started < 5
+    text = out.read_text()
+    assert "### Day 7: Course 7 (Par 72)" in text
+    assert all(f"| {name} | `id-{name}` |" in text for name in names)
+    assert "scores for all 7 days" in text
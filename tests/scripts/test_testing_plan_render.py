@@ -0,0 +1,36 @@
+"""Section-by-section rendering of the testing plan, in process and in a pool."""
+
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from conftest import SCRIPTS_DIR, load_script  # noqa: E402
+
+plan = load_script("generate-testing-plan.py")
+
+
+def without_timestamp(text: str) -> list:
+    return [line for line in text.split("\n") if not line.startswith("## Generated:")]
+
+
+def test_parts_stream_in_plan_order():
+    engine = plan.PlanEngine(plan.PLAYERS, plan.CH, plan.HOLES)
+    chunks = list(plan.render_plan(plan.BUILTIN, engine))
+    assert len(chunks) == len(plan.plan_parts(engine))
+    text = "\n".join(chunks)
+    headings = [line for line in text.split("\n") if line.startswith("## Section")]
+    assert [h.split(":")[0] for h in headings] == [f"## Section {i}" for i in range(1, 10)]
+    assert text.index("### 4a:") < text.index("### 4e:") < text.index("### 4f:")
+    assert text.endswith("```\n")
+
+
+def test_pool_output_matches_in_process(tmp_path):
+    assert plan.main(["--out", str(tmp_path / "serial.md"), "--workers", "1", "--no-cache"]) == 0
+    # A pool needs the script importable by name, so run it as a script
+    subprocess.run([sys.executable, str(SCRIPTS_DIR / "generate-testing-plan.py"),
+                    "--out", str(tmp_path / "pool.md"), "--workers", "3", "--no-cache"], check=True, capture_output=True)
+    assert without_timestamp((tmp_path / "pool.md").read_text()) == \
+        without_timestamp((tmp_path / "serial.md").read_text())